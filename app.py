@@ -1,12 +1,20 @@
 from fastapi import FastAPI, HTTPException, Request, Form
 from fastapi.middleware.cors import CORSMiddleware 
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
+try:
+    # orjson is optional; without it responses use the stdlib encoder
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    orjson = None
+    DefaultJSONResponse = JSONResponse
 import sys, os
 import json
+import hashlib
 import logging
 import datetime as dt
+from email.utils import formatdate
 from fastapi.responses import FileResponse
-import tempfile
 import os
 from fastapi import UploadFile, File
 
@@ -16,11 +24,17 @@ logger = logging.getLogger(__name__)
 
 sys.path.append(os.path.dirname(__file__) + "/ncaabFiles/")
 from ncaabGamelines import *
-from ncaabGetData import get_team_stats, get_player_stats
+from ncaabGetData import get_team_stats, get_player_stats, team_stats_cache
 from ncaabTeam import NcaabTeam
-from ncaabEvents import ncaab_events_manager
+from ncaabData import ncaabdb, get_league_summaries, refresh_season
+from ncaabStore import get_season_store
+from ncaabEvents import ncaab_events_manager, shutdown_parse_pool
+from ncaabHttp import get_http_client, get_async_http_client
+from ncaabScheduler import refresh_scheduler, SCHEDULER_ENABLED
+from ncaabBackfill import backfill_runner
+from ncaabImport import IMPORT_BATCH_SIZE, import_gamelines_stream, import_progress
 
-app = FastAPI()
+app = FastAPI(default_response_class=DefaultJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -72,17 +86,144 @@ NCAAB_TEAMS = sorted(list(set(NCAAB_TEAMS)))
 # Years for dropdown
 YEARS = [str(year) for year in range(2020, 2026)]  # Extended to 2025
 
+# Pollers may keep gameline responses but must revalidate; unchanged data is a 304
+GAMELINES_CACHE_CONTROL = 'no-cache'
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    """True when the client's If-None-Match already names this ETag"""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+def versioned_gamelines_response(request: Request, variant: str, build):
+    """
+    JSON response for data derived only from the gamelines table, with a
+    strong ETag from GamelineManager's data version. ``build(manager)``
+    runs only when the client's copy is stale and may return a dict or
+    pre-rendered JSON bytes.
+    """
+    manager = get_gameline_manager()
+    # Read before building: a write in between only costs the client one extra 200
+    version, updated_at = manager.data_version()
+    etag = f'"{variant}-{version}-{int((updated_at or 0) * 1000)}"'
+    headers = {'ETag': etag, 'Cache-Control': GAMELINES_CACHE_CONTROL}
+    if updated_at:
+        headers['Last-Modified'] = formatdate(updated_at, usegmt=True)
+
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    body = build(manager)
+    if isinstance(body, bytes):
+        return Response(content=body, media_type="application/json", headers=headers)
+    return DefaultJSONResponse(content=body, headers=headers)
+
+def json_array(rows) -> bytes:
+    """Join pre-rendered JSON object strings (read_gamelines_json) into an array"""
+    return b'[' + ','.join(rows).encode('utf-8') + b']'
+
+@app.on_event("startup")
+def schedule_initial_refresh():
+    """Defer the first gameline refresh until after the worker is up"""
+    if SCHEDULER_ENABLED:
+        # NCAAB_STARTUP_REFRESH=0 only skips the immediate refresh; pruning and
+        # the regular odds cadence still run
+        if not STARTUP_REFRESH:
+            startup_refresh_complete.set()
+        refresh_scheduler.start(refresh_on_start=STARTUP_REFRESH)
+    else:
+        start_background_refresh()
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    """Stop the refresh scheduler and hand its lease to another worker"""
+    refresh_scheduler.stop(timeout=5)
+
+@app.on_event("shutdown")
+def stop_backfill():
+    """Return in-flight backfill jobs to the queue for the next run"""
+    backfill_runner.stop(timeout=5)
+
+@app.on_event("shutdown")
+def stop_schedule_parse_pool():
+    """Stop the schedule parsing processes"""
+    shutdown_parse_pool()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Release pooled upstream connections"""
+    await get_async_http_client().aclose()
+    get_http_client().close()
+
+@app.get("/ncaab/http/stats")
+def http_client_stats():
+    """Upstream request and connection counts per host (connection reuse)"""
+    return {"hosts": get_http_client().stats()}
+
+@app.get("/ncaab/cache/stats")
+def cache_stats():
+    """Hit/miss/eviction counters for the in-memory caches"""
+    return {"caches": [team_stats_cache.stats()]}
+
+@app.get("/ncaab/scheduler/status")
+def scheduler_status():
+    """Leader, cadence and last-run/next-run/duration metrics for scheduled jobs"""
+    return refresh_scheduler.status()
+
+@app.post("/ncaab/backfill")
+def start_backfill(teams: str = None, years: str = None, force: bool = False):
+    """
+    Queue team x year season scrapes (default: NCAAB_TEAMS x YEARS) and
+    start the rate-limited backfill workers. Comma separated teams/years.
+    """
+    try:
+        team_list = [team.strip() for team in teams.split(',') if team.strip()] if teams else NCAAB_TEAMS
+        year_list = [int(year) for year in years.split(',') if year.strip()] if years else [int(year) for year in YEARS]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="years must be comma separated integers")
+
+    try:
+        queued = backfill_runner.enqueue(team_list, year_list, force=force)
+        started = backfill_runner.start()
+        return {"enqueued": queued, "started": started, "status": backfill_runner.status()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/ncaab/backfill/status")
+def backfill_status():
+    """Backfill queue counts, throughput and ETA"""
+    return backfill_runner.status()
+
+@app.post("/ncaab/backfill/stop")
+def stop_backfill_endpoint():
+    """Stop the backfill workers; queued jobs resume on the next start"""
+    backfill_runner.stop(timeout=5)
+    return backfill_runner.status()
+
+@app.get("/ncaab/health/live")
+def health_live():
+    """Liveness probe - the worker is accepting requests"""
+    return {"status": "ok"}
+
+@app.get("/ncaab/health/ready")
+def health_ready():
+    """Readiness probe - flips once the first gameline refresh has landed"""
+    ready = startup_refresh_complete.is_set()
+    body = {"ready": ready, **startup_refresh_state}
+    return JSONResponse(content=body, status_code=200 if ready else 503)
+
 @app.get("/ncaab/gamelines")
-def get_lines():
+def get_lines(request: Request):
     """Main gamelines endpoint"""
     try:
-        manager = GamelineManager()
-        db_gamelines = manager.read_gamelines()
+        def build(manager):
+            # Rows arrive as JSON text from SQLite; no per-row dicts
+            db_gamelines = manager.read_gamelines_json()
+            return b'{"Gamelines":{"manual":' + json_array(db_gamelines) + b'}}'
         
-        if db_gamelines:
-            return {"Gamelines": {"manual": db_gamelines}}
-        else:
-            return {"Gamelines": {"manual": []}}
+        return versioned_gamelines_response(request, "gamelines", build)
         
     except Exception as e:
         print(f"Error in /ncaab/gamelines: {e}")
@@ -91,47 +232,134 @@ def get_lines():
 # ADD THESE NEW ENDPOINTS AFTER YOUR EXISTING ROUTES:
 
 @app.get("/ncaab/debug/db")
-def debug_database():
+def debug_database(request: Request):
     """Debug endpoint to check database status"""
     try:
-        manager = GamelineManager()
-        gamelines = manager.read_gamelines()
-        
-        # Check database file info
-        db_info = {
-            "db_file": manager.db_file,
-            "db_exists": os.path.exists(manager.db_file),
-            "total_gamelines": len(gamelines),
-            "sources": {}
-        }
-        
-        # Count by source
-        for gameline in gamelines:
-            source = gameline['source']
-            if source not in db_info['sources']:
-                db_info['sources'][source] = 0
-            db_info['sources'][source] += 1
+        def build(manager):
+            gamelines = manager.read_gamelines()
+            
+            # Check database file info
+            db_info = {
+                "db_file": manager.db_file,
+                "db_exists": os.path.exists(manager.db_file),
+                "total_gamelines": len(gamelines),
+                "sources": {}
+            }
             
-        return db_info
+            # Count by source
+            for gameline in gamelines:
+                source = gameline['source']
+                if source not in db_info['sources']:
+                    db_info['sources'][source] = 0
+                db_info['sources'][source] += 1
+                
+            return db_info
+        
+        return versioned_gamelines_response(request, "debug-db", build)
     except Exception as e:
         return {"error": str(e)}
 
 
 @app.get("/ncaab/gamelines/all")
-def get_all_gamelines_detailed():
+def get_all_gamelines_detailed(request: Request):
     """Get all gamelines with detailed info"""
     try:
-        manager = GamelineManager()
-        gamelines = manager.read_gamelines()
+        def build(manager):
+            gamelines = manager.read_gamelines_json()
+            # Sorted so a given data version always serializes the same bytes
+            sources = manager.read_sources()
+            
+            return (
+                b'{"total_gamelines":' + str(len(gamelines)).encode() +
+                b',"gamelines":' + json_array(gamelines) +
+                b',"sources":' + json.dumps(sources).encode('utf-8') + b'}'
+            )
         
-        return {
-            "total_gamelines": len(gamelines),
-            "gamelines": gamelines,
-            "sources": list(set(g['source'] for g in gamelines))
-        }
+        return versioned_gamelines_response(request, "gamelines-all", build)
     except Exception as e:
         return {"error": str(e)}
 
+@app.get("/ncaab/gamelines/query")
+def query_gamelines(request: Request, start: str = None, end: str = None, team: str = None,
+                    source: str = None, has_odds: bool = None, fields: str = None,
+                    limit: int = QUERY_DEFAULT_LIMIT, cursor: str = None):
+    """
+    Filtered, paginated gamelines: game_day range (YYYY-MM-DD, inclusive),
+    team (home or away), source and has_odds, projected to a comma-separated
+    list of fields. Follow next_cursor for the next page.
+    """
+    try:
+        for value in (start, end):
+            if value:
+                dt.date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be YYYY-MM-DD dates")
+    
+    field_list = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    filters = dict(start=start, end=end, team=team, source=source, has_odds=has_odds,
+                   fields=field_list, limit=limit, cursor=cursor)
+    # Same filters -> same ETag family, whatever order the parameters came in
+    variant = 'query-' + hashlib.sha1(repr(sorted(filters.items())).encode('utf-8')).hexdigest()[:16]
+    
+    try:
+        return versioned_gamelines_response(request, variant, lambda manager: manager.query(**filters))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/ncaab/gamelines/movement")
+def gameline_movement(request: Request, game_day: str, home: str, away: str, source: str = None):
+    """Line movement for one game (YYYY-MM-DD, home team, away team), per source"""
+    try:
+        dt.date.fromisoformat(game_day)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="game_day must be a YYYY-MM-DD date")
+    
+    variant = 'movement-' + hashlib.sha1(repr((game_day, home, away, source)).encode('utf-8')).hexdigest()[:16]
+    return versioned_gamelines_response(
+        request, variant, lambda manager: manager.line_movement(game_day, home, away, source)
+    )
+
+@app.get("/ncaab/gamelines/consensus")
+def gameline_consensus(request: Request, start: str = None, end: str = None, team: str = None):
+    """
+    Best available line per side, median consensus lines, best-line hold and
+    the highest-priority source's lines ('primary') for every game offered by
+    one or more sportsbooks, optionally filtered by game_day range
+    (YYYY-MM-DD, inclusive) and team.
+    """
+    try:
+        for value in (start, end):
+            if value:
+                dt.date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be YYYY-MM-DD dates")
+    
+    def build(manager):
+        # Maintained as each source writes; this is a plain read of stored JSON
+        games = manager.read_consensus_json(start=start, end=end, team=team)
+        return b'{"count":' + str(len(games)).encode() + b',"games":' + json_array(games) + b'}'
+    
+    variant = 'consensus-' + hashlib.sha1(repr((start, end, team)).encode('utf-8')).hexdigest()[:16]
+    return versioned_gamelines_response(request, variant, build)
+
+@app.get("/ncaab/gamelines/sources")
+def get_gameline_sources():
+    """Per-sportsbook configuration and fetch metrics from the last refreshes"""
+    return {
+        "sources": {
+            source_id: {
+                "name": config['name'],
+                "type": config['type'],
+                "enabled": config['enabled'],
+                "available": config['function'] is not None,
+                "priority": config['priority'],
+                "deadline": config.get('deadline', SOURCE_DEADLINE_SECONDS),
+                "stats": source_stats.get(source_id)
+            }
+            for source_id, config in SPORTSBOOKS.items()
+        }
+    }
+
 @app.get("/ncaab/gamelines/manual", response_class=HTMLResponse)
 def manual_input_form():
     """Serve HTML form for manual NCAAB gameline input with upcoming events"""
@@ -603,48 +831,41 @@ async def bulk_gamelines_dump(request: Request):
         
         logger.info(f"Parsed {len(gamelines)} gamelines for processing")
         
-        manager = GamelineManager()
-        success_count = 0
-        errors = []
+        manager = get_gameline_manager()
         
-        for i, gameline in enumerate(gamelines):
-            try:
-                # Validate required fields
-                if not gameline.get('home_team') or not gameline.get('away_team'):
-                    errors.append(f"Gameline {i}: Missing home_team or away_team")
-                    continue
-                
-                game_data = {
-                    'home': gameline.get('home_team'),
-                    'away': gameline.get('away_team'),
-                    'game_day': gameline.get('game_day', str(today)),
-                    'start_time': gameline.get('start_time'),
-                    'home_ml': gameline.get('home_ml'),
-                    'away_ml': gameline.get('away_ml'),
-                    'home_spread': gameline.get('home_spread'),
-                    'away_spread': gameline.get('away_spread'),
-                    'home_spread_odds': gameline.get('home_spread_odds'),
-                    'away_spread_odds': gameline.get('away_spread_odds'),
-                    'over_under': gameline.get('over_under'),
-                    'over_odds': gameline.get('over_odds'),
-                    'under_odds': gameline.get('under_odds')
-                }
-                
-                source = gameline.get('source', 'manual_dump')
-                manager.update_gameline(source, game_data)
-                success_count += 1
-                logger.info(f"Successfully processed gameline {i}: {game_data['home']} vs {game_data['away']}")
-                
-            except Exception as e:
-                error_msg = f"Gameline {i}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
-                continue
+        game_rows = [
+            {
+                'home': gameline.get('home_team'),
+                'away': gameline.get('away_team'),
+                'game_day': gameline.get('game_day', str(dt.date.today())),
+                'start_time': gameline.get('start_time'),
+                'home_ml': gameline.get('home_ml'),
+                'away_ml': gameline.get('away_ml'),
+                'home_spread': gameline.get('home_spread'),
+                'away_spread': gameline.get('away_spread'),
+                'home_spread_odds': gameline.get('home_spread_odds'),
+                'away_spread_odds': gameline.get('away_spread_odds'),
+                'over_under': gameline.get('over_under'),
+                'over_odds': gameline.get('over_odds'),
+                'under_odds': gameline.get('under_odds'),
+                'source': gameline.get('source', 'manual_dump')
+            } if isinstance(gameline, dict) else {}
+            for gameline in gamelines
+        ]
+        
+        # Whole slate goes in one transaction; invalid rows are reported, not fatal
+        upsert_result = manager.upsert_many(None, game_rows)
+        success_count = upsert_result['written']
+        errors = [f"Gameline {error['index']}: {error['error']}" for error in upsert_result['errors']]
         
         result = {
             "status": "success",
             "message": f"Successfully added {success_count} gamelines to database",
             "gamelines_added": success_count,
+            "inserted": upsert_result['inserted'],
+            "changed": upsert_result['changed'],
+            "unchanged": upsert_result['unchanged'],
+            "duplicates": upsert_result['duplicates'],
             "total_processed": len(gamelines),
             "errors": errors
         }
@@ -695,7 +916,7 @@ async def submit_quick_gameline(
             'under_odds': under_odds
         }
 
-        manager = GamelineManager()
+        manager = get_gameline_manager()
         manager.update_gameline(source, game_data)
         
         return {
@@ -766,7 +987,7 @@ async def submit_manual_gameline(
             'under_odds': under_odds
         }
 
-        manager = GamelineManager()
+        manager = get_gameline_manager()
         manager.update_gameline(source, game_data)
         
         return {
@@ -863,9 +1084,8 @@ def team_select_form():
     """
     return HTMLResponse(content=html_content)
 
-@app.get("/ncaab/team-stats")
-def get_team_stats_via_form(team: str, year: str):
-    """Get team stats via form parameters"""
+def _team_stats_payload(team: str, year: str):
+    """Team stats, scraping first if they aren't available yet"""
     try:
         print(f"Fetching stats for {team} in {year}")
         results = get_team_stats(team, year)
@@ -885,10 +1105,47 @@ def get_team_stats_via_form(team: str, year: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ncaab/team-stats")
+def get_team_stats_via_form(team: str, year: str):
+    """Get team stats via form parameters"""
+    # Returned as a response so the gamelog skips jsonable_encoder
+    return DefaultJSONResponse(content=_team_stats_payload(team, year))
+
+@app.get("/ncaab/summaries")
+def get_league_summaries_endpoint(request: Request, year: int, teams: str = None, format: str = None):
+    """
+    Season summaries for many teams from the local store in one pass.
+    teams is comma separated (default: every team in NCAAB_TEAMS);
+    format=ndjson (or Accept: application/x-ndjson) streams one team per line.
+    """
+    try:
+        requested = [team.strip() for team in teams.split(',') if team.strip()] if teams else NCAAB_TEAMS
+        result = get_league_summaries(year, requested)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    ndjson = format == 'ndjson' or 'application/x-ndjson' in request.headers.get('accept', '')
+    if not ndjson:
+        return DefaultJSONResponse(content={
+            "year": year,
+            "requested": len(requested),
+            "found": len(result['summaries']),
+            "summaries": result['summaries'],
+            "missing": result['missing']
+        })
+
+    def lines():
+        for team, summary in result['summaries'].items():
+            yield json.dumps({"team": team, "summary": summary}) + "\n"
+        # Last line lists the teams to scrape
+        yield json.dumps({"missing": result['missing']}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @app.get("/ncaab/{team}/{year}")
 def get_team_stats_endpoint(team: str, year: str):
-    results = get_team_stats_via_form(team, year)
-    return {'Team_Stats':results}
+    results = _team_stats_payload(team, year)
+    return DefaultJSONResponse(content={'Team_Stats':results})
 
 @app.get("/ncaab/player-stats")
 def get_player_stats_endpoint(player: str, season: str = None):
@@ -903,18 +1160,13 @@ def get_player_stats_endpoint(player: str, season: str = None):
 
 @app.get("/ncaab/team/recent/{team}/{year}/{games}")
 def get_recent_games(team: str, year: str, games: int):
-    """Get recent games data using NcaabTeam class"""
+    """Get the last N games and rolling form (any N >= 1) using NcaabTeam class"""
     try:
-        ncaab_team = NcaabTeam()
+        if games < 1:
+            raise HTTPException(status_code=400, detail="Games must be at least 1")
         
-        if games == 2:
-            success = ncaab_team.last2(team, year)
-        elif games == 4:
-            success = ncaab_team.last4(team, year)
-        elif games == 8:
-            success = ncaab_team.last8(team, year)
-        else:
-            raise HTTPException(status_code=400, detail="Games must be 2, 4, or 8")
+        ncaab_team = NcaabTeam()
+        success = ncaab_team.last_n(team, year, games)
         
         if not success:
             raise HTTPException(status_code=404, detail="Could not retrieve recent games")
@@ -923,11 +1175,14 @@ def get_recent_games(team: str, year: str, games: int):
         recent_data = {
             'scores': ncaab_team.tm if hasattr(ncaab_team, 'tm') else [],
             'opponents': ncaab_team.opp if hasattr(ncaab_team, 'opp') else [],
-            'dates': ncaab_team.date if hasattr(ncaab_team, 'date') else []
+            'dates': ncaab_team.date if hasattr(ncaab_team, 'date') else [],
+            'form': ncaab_team.form
         }
         
         return recent_data
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -946,6 +1201,14 @@ def scrape_team_data(team: str, year: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/ncaab/refresh/{team}/{year}")
+def refresh_team_data(team: str, year: int, force: bool = False):
+    """Incrementally refresh a team-season: conditional fetch, upsert new/changed games only"""
+    try:
+        return refresh_season(team, year, force=force)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Add manual events routes
 @app.get("/ncaab/events/manual", response_class=HTMLResponse)
 def manual_events_form():
@@ -1262,7 +1525,7 @@ def player_select_form():
 def export_ncaab_gamelines():
     """Export all NCAAB gamelines to a JSON file"""
     try:
-        manager = GamelineManager()
+        manager = get_gameline_manager()
         
         # Export gamelines using the manager method
         export_filepath = manager.export_gamelines()
@@ -1282,44 +1545,83 @@ def export_ncaab_gamelines():
         logger.error(f"Error exporting NCAAB gamelines: {e}")
         raise HTTPException(status_code=500, detail=f"Error exporting gamelines: {str(e)}")
 
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+@app.get("/ncaab/gamelines/export/stream")
+def stream_ncaab_gamelines(format: str = 'ndjson', source: str = None, start: str = None,
+                           end: str = None, gzip: bool = False):
+    """
+    Stream gamelines straight from the table as NDJSON or CSV (optionally
+    gzip'd), filtered by source and game_day range (YYYY-MM-DD, inclusive).
+    Nothing is written to exports/.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    try:
+        for value in (start, end):
+            if value:
+                dt.date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be YYYY-MM-DD dates")
+    
+    manager = get_gameline_manager()
+    chunks = manager.stream_export(format, source=source, start=start, end=end, compress=gzip)
+    
+    filename = f"ncaab_gamelines_{dt.datetime.now().strftime('%Y%m%d_%H%M')}.{format}" + ('.gz' if gzip else '')
+    return StreamingResponse(
+        chunks,
+        media_type='application/gzip' if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+IMPORT_SUFFIXES = ('.json', '.ndjson', '.jsonl', '.json.gz', '.ndjson.gz', '.jsonl.gz')
+
 @app.post("/ncaab/gamelines/import")
-async def import_ncaab_gamelines(file: UploadFile = File(...)):
-    """Import NCAAB gamelines from a JSON file"""
+def import_ncaab_gamelines(file: UploadFile = File(...), batch_size: int = IMPORT_BATCH_SIZE):
+    """
+    Import NCAAB gamelines from a JSON export, a JSON array or NDJSON (optionally gzipped).
+    
+    The upload is parsed incrementally straight from the spooled upload and
+    written in batch_size transactions, so large archives import in bounded
+    memory. Progress is visible at /ncaab/gamelines/import/status while it runs.
+    """
+    filename = file.filename or ''
+    if not filename.lower().endswith(IMPORT_SUFFIXES):
+        raise HTTPException(status_code=400, detail="Only JSON or NDJSON files are supported")
+    if not 1 <= batch_size <= 10000:
+        raise HTTPException(status_code=400, detail="batch_size must be between 1 and 10000")
+    
     try:
-        # Validate file type
-        if not file.filename.endswith('.json'):
-            raise HTTPException(status_code=400, detail="Only JSON files are supported")
+        manager = get_gameline_manager()
+        result = import_gamelines_stream(file.file, manager, filename=filename, batch_size=batch_size)
         
-        # Create a temporary file to save the upload
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        try:
-            manager = GamelineManager()
-            success = manager.import_gamelines(temp_file_path)
-            
-            if success:
-                return {
-                    "status": "success",
-                    "message": "Gamelines imported successfully",
-                    "filename": file.filename
-                }
-            else:
-                raise HTTPException(status_code=400, detail="Failed to import gamelines - invalid file format")
-                
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
-    except HTTPException:
-        raise
+        return {
+            "status": "success",
+            "message": f"Imported {result['written']} gamelines ({result['rejected']} rejected)",
+            "filename": filename,
+            "import_id": result['id'],
+            "read": result['read'],
+            "written": result['written'],
+            "inserted": result['inserted'],
+            "changed": result['changed'],
+            "unchanged": result['unchanged'],
+            "duplicates": result['duplicates'],
+            "rejected": result['rejected'],
+            "batches": result['batches'],
+            "seconds": round(result['finished_at'] - result['started_at'], 2),
+            "errors": result['errors']
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Failed to import gamelines - {e}")
     except Exception as e:
         logger.error(f"Error importing NCAAB gamelines: {e}")
         raise HTTPException(status_code=500, detail=f"Error importing gamelines: {str(e)}")
 
+@app.get("/ncaab/gamelines/import/status")
+def import_ncaab_gamelines_status():
+    """Progress of running and recent gameline imports, newest first"""
+    return {"imports": list(reversed(list(import_progress.values())))}
+
 @app.get("/ncaab/gamelines/export/form", response_class=HTMLResponse)
 def export_ncaab_gamelines_form():
     """Serve HTML form for exporting and importing NCAAB gamelines"""
@@ -1393,7 +1695,7 @@ def export_ncaab_gamelines_form():
                     <p><strong>Note:</strong> Imported gamelines will be added to the database (duplicates will be updated)</p>
                 </div>
                 <form id="importForm" enctype="multipart/form-data">
-                    <input type="file" id="importFile" name="file" accept=".json" required style="margin-bottom: 15px;">
+                    <input type="file" id="importFile" name="file" accept=".json,.ndjson,.jsonl,.gz" required style="margin-bottom: 15px;">
                     <button type="submit" class="import-btn">Import Gamelines</button>
                 </form>
             </div>
@@ -1559,20 +1861,18 @@ def download_ncaab_export_file(filename: str):
 def db_check():
     """Check database status"""
     try:
-        from ncaabGamelines import GamelineManager
-        manager = GamelineManager()
+        manager = get_gameline_manager()
         gamelines = manager.read_gamelines()
         
-        # Check if ncaabDb directory exists and has files
-        db_files = []
-        if os.path.exists('ncaabDb'):
-            db_files = os.listdir('ncaabDb')
+        # Team-seasons held in the consolidated season store
+        seasons = get_season_store().list_seasons()
         
         return {
             "db_gamelines": gamelines, 
             "count": len(gamelines),
-            "ncaabDb_files": db_files,
-            "ncaabDb_count": len(db_files)
+            "ncaabDb_files": [f"{season['team']}-{season['year']}" for season in seasons],
+            "ncaabDb_count": len(seasons),
+            "season_store": seasons
         }
     except Exception as e:
         return {"error": str(e)}
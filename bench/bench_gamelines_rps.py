@@ -0,0 +1,52 @@
+"""
+user-002: requests/sec on /ncaab/gamelines, and the per-request cost of a
+fresh SQLite connection (the old pattern) against the pooled one.
+Usage: python bench/bench_gamelines_rps.py [rows] [requests]
+"""
+import sqlite3
+import sys
+import time
+
+from common import setup, timed
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    setup()
+
+    import app
+    from fastapi.testclient import TestClient
+    from ncaabGamelines import GAMELINES_SCHEMA, get_gameline_manager
+
+    manager = get_gameline_manager()
+    for i in range(rows):
+        manager.update_gameline('draftkings', {
+            'home': f'Home {i}', 'away': f'Away {i}', 'game_day': '2030-01-01', 'home_ml': -150, 'away_ml': 130
+        })
+
+    # A point read, so connection setup rather than row decoding dominates
+    select = "SELECT * FROM gamelines WHERE home_team = 'Home 7'"
+
+    def fresh_connection():
+        conn = sqlite3.connect(manager.db_file)
+        conn.execute(GAMELINES_SCHEMA)
+        conn.execute(select).fetchall()
+        conn.close()
+
+    def pooled_connection():
+        manager.pool.get_connection().execute(select).fetchall()
+
+    print(f'fresh connection per read: {timed(fresh_connection, 200) * 1000:.2f} ms')
+    print(f'pooled connection read:    {timed(pooled_connection, 200) * 1000:.2f} ms')
+
+    with TestClient(app.app) as client:
+        for _ in range(20):
+            client.get('/ncaab/gamelines')
+        started = time.perf_counter()
+        for _ in range(requests):
+            client.get('/ncaab/gamelines')
+        elapsed = time.perf_counter() - started
+    print(f'/ncaab/gamelines ({rows} rows): {requests / elapsed:.0f} req/s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+user-021: gameline query plans and timings on a synthetic table before and
+after GAMELINE_MIGRATIONS, plus the migration time itself.
+Usage: python bench/bench_indexes.py [rows]   (default 1,000,000; ~1GB of disk)
+"""
+import datetime as dt
+import random
+import sqlite3
+import sys
+import time
+
+from common import best_of, setup
+
+QUERIES = [
+    ('full read', 'SELECT * FROM gamelines ORDER BY game_day, start_time', ()),
+    ('first 100', 'SELECT * FROM gamelines ORDER BY game_day, start_time LIMIT 100', ()),
+    ('one source', 'SELECT * FROM gamelines WHERE source = ? ORDER BY game_day, start_time', ('fanduel',)),
+    ('one week', 'SELECT * FROM gamelines WHERE game_day BETWEEN ? AND ? ORDER BY game_day, start_time',
+     ('2016-01-01', '2016-01-07')),
+    ('one team', 'SELECT * FROM gamelines WHERE home_team = ? OR away_team = ? ORDER BY game_day, start_time',
+     ('Team 42', 'Team 42')),
+]
+
+def populate(conn, rows, schema):
+    conn.execute(schema)
+    random.seed(0)
+    first_day = dt.date(2015, 11, 1)
+    sources = ['espn_bets', 'draftkings', 'fanduel', 'manual']
+    conn.executemany(
+        'INSERT INTO gamelines (source, game_day, start_time, home_team, away_team, home_ml, away_ml, '
+        'home_spread, away_spread, home_spread_odds, away_spread_odds, over_under, over_odds, under_odds) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (
+            (sources[i % 4], str(first_day + dt.timedelta(days=i // 600)),
+             f'{random.randint(1, 10)}:{random.choice([0, 30]):02d} PM',
+             f'Team {random.randint(0, 360)}', f'Opp {i}-{random.randint(0, 360)}',
+             '-150', '+130', '-3.5', '+3.5', '-110', '-110', '145.5', '-110', '-110')
+            for i in range(rows)
+        )
+    )
+    conn.commit()
+
+def run(conn, label):
+    for name, sql, args in QUERIES:
+        count = len(conn.execute(sql, args).fetchall())
+        elapsed = best_of(lambda: conn.execute(sql, args).fetchall())
+        plan = ' | '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, args))
+        print(f'{label:6} {name:10} {count:8} rows {elapsed * 1000:9.1f} ms  {plan}')
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    setup()
+    import ncaabGamelines
+    from ncaabDatabase import SQLITE_PRAGMAS, run_migrations
+
+    conn = sqlite3.connect('indexes.db')
+    for pragma, value in SQLITE_PRAGMAS.items():
+        conn.execute(f'PRAGMA {pragma}={value}')
+    populate(conn, rows, ncaabGamelines.GAMELINES_SCHEMA)
+
+    run(conn, 'before')
+    started = time.perf_counter()
+    run_migrations(conn, ncaabGamelines.GAMELINE_MIGRATIONS, 'indexes.db')
+    print(f'migration: {time.perf_counter() - started:.1f}s')
+    conn.execute('ANALYZE')
+    run(conn, 'after')
+
+if __name__ == '__main__':
+    main()
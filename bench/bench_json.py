@@ -0,0 +1,61 @@
+"""
+user-018: latency and peak allocations for a 5k-row gameline payload,
+for dicts + jsonable_encoder, dicts + orjson and SQLite-rendered JSON.
+Usage: python bench/bench_json.py [rows]
+"""
+import datetime as dt
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from common import setup, timed
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    setup()
+    import app
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.testclient import TestClient
+
+    manager = app.get_gameline_manager()
+    day = str(dt.date.today() + dt.timedelta(days=1))
+    random.seed(1)
+    manager.upsert_many('manual', [{
+        'home_team': f'Home {i}', 'away_team': f'Away {i}', 'game_day': day, 'start_time': '19:00',
+        'home_ml': random.randint(-400, -101), 'away_ml': random.randint(100, 350),
+        'home_spread': -random.randint(1, 30) / 2, 'away_spread': random.randint(1, 30) / 2,
+        'home_spread_odds': -110, 'away_spread_odds': -110,
+        'over_under': random.randint(250, 330) / 2, 'over_odds': -110, 'under_odds': -110
+    } for i in range(rows)])
+
+    def stdlib():
+        return JSONResponse(content=jsonable_encoder({'Gamelines': {'manual': manager.read_gamelines()}})).body
+
+    def with_orjson():
+        return ORJSONResponse(content={'Gamelines': {'manual': manager.read_gamelines()}}).body
+
+    def sqlite_json():
+        return b'{"Gamelines":{"manual":' + app.json_array(manager.read_gamelines_json()) + b'}}'
+
+    assert json.loads(stdlib()) == json.loads(with_orjson()) == json.loads(sqlite_json())
+    print(f'{rows} rows, {len(sqlite_json()) / 1e6:.1f} MB body')
+    for name, render in [('dicts + jsonable_encoder + json', stdlib), ('dicts + orjson', with_orjson),
+                         ('SQLite json_object + join', sqlite_json)]:
+        latency = timed(render, 20)
+        tracemalloc.start()
+        render()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'{name:32} {latency * 1000:7.1f} ms  peak alloc {peak / 1e6:5.1f} MB')
+
+    with TestClient(app.app) as client:
+        started = time.perf_counter()
+        for _ in range(20):
+            client.get('/ncaab/gamelines')
+        print(f"/ncaab/gamelines end to end     {(time.perf_counter() - started) / 20 * 1000:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
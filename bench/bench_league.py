@@ -0,0 +1,58 @@
+"""
+user-011: migrate synthetic per-team SQLite files into the season store and
+compare a league-wide aggregate against opening every legacy file.
+Usage: python bench/bench_league.py [teams]
+"""
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from common import setup, timed
+
+YEARS = (2023, 2024, 2025)
+
+def write_legacy_dbs(teams, columns):
+    os.makedirs('ncaabDb')
+    random.seed(0)
+    for team in range(teams):
+        for year in YEARS:
+            conn = sqlite3.connect(f'ncaabDb/team{team}-{year}-stats.db')
+            conn.execute(f"CREATE TABLE Stats({', '.join(column + ' TEXT' for column in columns)})")
+            rows = [
+                (f'{year}-01-{game:02d}', f'opp{game}', 'W' if random.random() < .5 else 'L') +
+                tuple('.45' if 'Pct' in column else str(random.randint(1, 90)) for column in columns[3:])
+                for game in range(1, 31)
+            ]
+            # Re-scrapes appended duplicate games to the legacy files
+            conn.executemany(f"INSERT INTO Stats VALUES({','.join('?' * len(columns))})", rows + rows[:3])
+            conn.commit()
+            conn.close()
+
+def legacy_aggregates(year):
+    averages = {}
+    for filename in os.listdir('ncaabDb'):
+        if filename.endswith(f'-{year}-stats.db'):
+            conn = sqlite3.connect(os.path.join('ncaabDb', filename))
+            rows = conn.execute('SELECT Tm FROM Stats').fetchall()
+            conn.close()
+            averages[filename] = sum(int(points) for points, in rows) / len(rows)
+    return averages
+
+def main():
+    teams = int(sys.argv[1]) if len(sys.argv) > 1 else 360
+    setup()
+    import ncaabStore
+
+    write_legacy_dbs(teams, ncaabStore.LEGACY_STATS_COLUMNS)
+    started = time.perf_counter()
+    summary = ncaabStore.migrate_legacy_dbs()
+    print(f"migrated {len(summary['migrated'])} files, {summary['games']} games in {time.perf_counter() - started:.2f}s")
+
+    store = ncaabStore.get_season_store()
+    for name, aggregate in [('legacy, one file per team', legacy_aggregates), ('season store GROUP BY', store.league_aggregates)]:
+        print(f'{name:28} {timed(lambda: aggregate(2024)) * 1000:7.1f} ms for {len(aggregate(2024))} teams')
+
+if __name__ == '__main__':
+    main()
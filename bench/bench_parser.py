@@ -0,0 +1,80 @@
+"""
+user-010: parse cost per Sports Reference season page, for the old
+html.parser code paths and the shared lxml parser (and its bs4 fallback).
+The page is a synthetic ~500KB season page with a 35-game sgl-basic table.
+Usage: python bench/bench_parser.py
+"""
+import random
+
+from common import setup, timed
+
+STATS = [
+    'date_game', 'game_location', 'opp_id', 'game_result', 'pts', 'opp_pts', 'fg', 'fga', 'fg_pct',
+    'fg3', 'fg3a', 'fg3_pct', 'ft', 'fta', 'ft_pct', 'orb', 'trb', 'ast', 'stl', 'blk', 'tov', 'pf', 'x',
+    'opp_fg', 'opp_fga', 'opp_fg_pct', 'opp_fg3', 'opp_fg3a', 'opp_fg3_pct', 'opp_ft', 'opp_fta',
+    'opp_ft_pct', 'opp_orb', 'opp_trb', 'opp_ast', 'opp_stl', 'opp_blk', 'opp_tov', 'opp_pf'
+]
+
+def _cell(stat, game):
+    if stat == 'date_game':
+        return f'<a href="/x">2024-{1 + game // 28:02d}-{1 + game % 28:02d}</a>'
+    if stat == 'game_location':
+        return '@' if game % 2 else ''
+    if stat == 'opp_id':
+        return f'<a href="/cbb/schools/t{game}/">Team {game}</a>'
+    if stat == 'game_result':
+        return 'W' if game % 3 else 'L (OT)'
+    if stat.endswith('pct'):
+        return f'.{random.randint(300, 600)}'
+    if stat == 'x':
+        return ''
+    return str(random.randint(2, 90))
+
+def gamelog_page(games=35):
+    random.seed(1)
+    rows = []
+    for game in range(games):
+        if game == 20:
+            rows.append('<tr class="thead"><th>G</th><th>Date</th></tr>')
+        cells = ''.join(f'<td class="right" data-stat="{stat}">{_cell(stat, game)}</td>' for stat in STATS)
+        rows.append(f'<tr><th scope="row" class="right" data-stat="g">{game + 1}</th>{cells}</tr>')
+    filler = [f'<div class="filler"><p>{"lorem ipsum " * 20}</p><a href="/l{i}">link</a></div>' for i in range(1500)]
+    return (
+        f'<html><head><title>x</title></head><body>{"".join(filler[:750])}'
+        f'<table class="stats_table" id="sgl-basic"><thead><tr><th>G</th></tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table>'
+        f'<!-- <table id="sgl-opp"><tbody><tr><td>1</td></tr></tbody></table> -->'
+        f'{"".join(filler[750:])}</body></html>'
+    ).encode()
+
+def main():
+    setup()
+    from bs4 import BeautifulSoup
+    import ncaabParser
+
+    def old_ncaab_data(html):
+        # ncaabData.ncaabdb before: flatten every th/td, then slice 28 ways
+        table = BeautifulSoup(html, 'html.parser').find('table', {'id': 'sgl-basic'})
+        cells = [cell.text.strip() for cell in table.find_all('th') + table.find_all('td')]
+        return [cells[i::28] for i in range(28)]
+
+    def old_get_team_stats(html):
+        # ncaabGetData.get_team_stats before: per-row find_all('td')
+        body = BeautifulSoup(html, 'html.parser').find('tbody')
+        return [
+            {i: cell.text for i, cell in enumerate(cells)}
+            for cells in (row.find_all('td') for row in body.find_all('tr')) if cells
+        ]
+
+    html = gamelog_page()
+    print(f'page: {len(html) // 1024} KB, {len(ncaabParser.parse_gamelog(html))} games')
+    for name, parse in [
+        ('old ncaabData (html.parser)', old_ncaab_data),
+        ('old ncaabGetData (html.parser)', old_get_team_stats),
+        ('parse_gamelog, lxml', ncaabParser._parse_gamelog_lxml),
+        ('parse_gamelog, bs4 fallback', ncaabParser._parse_gamelog_bs4),
+    ]:
+        print(f'{name:32} {timed(lambda: parse(html), 10) * 1000:6.1f} ms/page')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+user-006: NCAABEvents.get_schedule wall time against a recorded-style
+schedule page served locally with 150ms latency, by window and pool size.
+Usage: python bench/bench_schedule.py
+"""
+import time
+
+from common import serve, setup
+
+GAMES_PER_PAGE = 40
+LATENCY = 0.15
+
+def schedule_page():
+    rows = ''.join(
+        f'<tr><td><a class="team-name">Away {i}</a></td><td><a class="team-name">Home {i}</a></td></tr>'
+        for i in range(GAMES_PER_PAGE)
+    )
+    # ESPN pages carry ~50KB of markup around the schedule tables
+    filler = '<div>' + 'x' * 50000 + '</div>'
+    return f'<html><body><div class="ScheduleTables x"><table>{rows}</table></div>{filler}</body></html>'.encode()
+
+def main():
+    setup()
+    import ncaabEvents
+    import ncaabHttp
+
+    ncaabEvents.SCHEDULE_URL = serve(schedule_page(), delay=LATENCY) + '/{date}'
+    ncaabHttp.DEFAULT_HOST_CONCURRENCY = 16
+    events = ncaabEvents.NCAABEvents()
+
+    for days in (7, 14):
+        for workers in (1, 4, 8):
+            started = time.perf_counter()
+            games = events.get_schedule(days, workers=workers)
+            elapsed = time.perf_counter() - started
+            assert len(games) == days * GAMES_PER_PAGE
+            assert [game['game_day'] for game in games] == sorted(game['game_day'] for game in games)
+            print(f'{days:2} days, {workers} workers: {elapsed:5.2f}s ({len(games)} games)')
+
+if __name__ == '__main__':
+    main()
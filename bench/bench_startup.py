@@ -0,0 +1,54 @@
+"""
+user-001: cold boot time of a worker with the network blocked.
+
+Each run imports app.py in a fresh interpreter, starts the app and serves
+/ncaab/health/live. Any outbound connection fails the run.
+Usage: python bench/bench_startup.py [runs]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import REPO_DIR
+
+BOOT = r'''
+import socket, sys, time
+started = time.perf_counter()
+
+def blocked(self, address, *args):
+    if isinstance(address, tuple) and address[0] not in ('127.0.0.1', 'localhost', 'testserver'):
+        raise RuntimeError(f'network access during startup: {address}')
+    return real_connect(self, address, *args)
+real_connect = socket.socket.connect
+socket.socket.connect = blocked
+
+sys.path.insert(0, sys.argv[1])
+import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.app) as client:
+    assert client.get('/ncaab/health/live').status_code == 200
+    served = time.perf_counter()
+print(f'{imported - started:.3f} {served - started:.3f}')
+'''
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = dict(os.environ, NCAAB_SCHEDULER='0')
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', BOOT, REPO_DIR],
+            cwd=tempfile.mkdtemp(prefix='ncaab-bench-'), env=env,
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(tuple(float(value) for value in output[-2:]))
+
+    imported = min(timing[0] for timing in timings)
+    served = min(timing[1] for timing in timings)
+    print(f'import app:            {imported * 1000:7.0f} ms (best of {runs})')
+    print(f'first request served:  {served * 1000:7.0f} ms (best of {runs})')
+
+if __name__ == '__main__':
+    main()
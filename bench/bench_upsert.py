@@ -0,0 +1,55 @@
+"""
+user-003/user-025: 10k-row upsert_many and streaming import into a new
+table, with the consensus kept inline or deferred to the end of the write.
+Usage: python bench/bench_upsert.py [rows]
+"""
+import io
+import json
+import sys
+import time
+
+from common import best_of, setup
+
+def slate(rows):
+    return [{
+        'source': ('draftkings', 'fanduel')[i % 2], 'home_team': f'Home {i // 2}', 'away_team': f'Away {i // 2}',
+        'game_day': f'2030-01-{1 + i // 2 % 28:02d}', 'start_time': '19:00',
+        'home_ml': -150 - i % 7, 'away_ml': 130 + i % 5, 'home_spread': -3.5, 'away_spread': 3.5,
+        'home_spread_odds': -110, 'away_spread_odds': -110, 'over_under': 145.5, 'over_odds': -110, 'under_odds': -110
+    } for i in range(rows)]
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    setup()
+    from ncaabGamelines import GamelineManager
+    from ncaabImport import import_gamelines_stream
+
+    games = slate(rows)
+    body = json.dumps({'gamelines': games}).encode()
+    databases = iter(range(1000))
+
+    def fresh_manager():
+        return GamelineManager(f'upsert-{next(databases)}.db')
+
+    def timed_new(write):
+        best = float('inf')
+        for _ in range(3):
+            manager = fresh_manager()
+            started = time.perf_counter()
+            write(manager)
+            best = min(best, time.perf_counter() - started)
+        return best, manager
+
+    inline, _ = timed_new(lambda manager: manager.upsert_many(None, games))
+    deferred, manager = timed_new(lambda manager: manager.upsert_many(None, games, defer_consensus=True))
+    drain = best_of(manager.refresh_pending_consensus, 1)
+    imported, manager = timed_new(lambda manager: import_gamelines_stream(io.BytesIO(body), manager, 'slate.json'))
+    consensus = len(manager.read_consensus_json())
+
+    print(f'upsert_many, consensus inline:    {inline * 1000:6.0f} ms ({rows} new rows)')
+    print(f'upsert_many, consensus deferred:  {deferred * 1000:6.0f} ms')
+    print(f'deferred consensus refresh:       {drain * 1000:6.0f} ms')
+    print(f'import_gamelines_stream:          {imported * 1000:6.0f} ms ({consensus} games)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Shared setup for the benchmark scripts: paths, a scratch directory and a local stub server"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def setup():
+    """Import the repo modules offline from a throwaway working directory"""
+    sys.path.insert(0, REPO_DIR)
+    sys.path.insert(0, os.path.join(REPO_DIR, 'ncaabFiles'))
+    os.environ.setdefault('NCAAB_STARTUP_REFRESH', '0')
+    os.environ.setdefault('NCAAB_SCHEDULER', '0')
+    workdir = tempfile.mkdtemp(prefix='ncaab-bench-')
+    os.chdir(workdir)
+    logging.disable(logging.CRITICAL)
+    return workdir
+
+def timed(func, runs=5, warmup=1):
+    """Average seconds per call of func() after warmup calls"""
+    for _ in range(warmup):
+        func()
+    started = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - started) / runs
+
+def best_of(func, runs=3):
+    """Fastest of ``runs`` calls of func(), in seconds"""
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def serve(body: bytes, delay=0.0):
+    """Serve ``body`` for every GET on a local keep-alive server; returns its base URL"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
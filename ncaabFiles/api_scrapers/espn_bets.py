@@ -1,4 +1,6 @@
 import re
+import os
+import sys
 import json
 import requests
 import pickle
@@ -8,6 +10,9 @@ from pprint import pprint
 import logging
 import sqlite3
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ncaabHttp import http_get
+
 source1 = 'https://www.espn.com/mens-college-basketball/odds'
 source2 = 'https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard'
 
@@ -21,7 +26,7 @@ def get_espn_bets_gamelines():
     url = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
 
     try:
-        response = requests.get(url, timeout=10)
+        response = http_get(url, timeout=10)
         response.raise_for_status()  # Raise an exception for bad status codes
         data = response.json()
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,320 @@
+import datetime as dt
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from ncaabData import scrape_season
+from ncaabGetData import current_season
+from ncaabStore import get_season_store, team_slug
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Sports Reference blocks clients making more than 20 requests a minute
+BACKFILL_REQUESTS_PER_MINUTE = 20
+# Matches ncaabHttp.HOST_CONCURRENCY for www.sports-reference.com
+BACKFILL_WORKERS = 2
+BACKFILL_MAX_ATTEMPTS = 3
+BACKFILL_RETRY_DELAY_SECONDS = 120
+# A job still 'running' after this long belongs to a crashed worker
+BACKFILL_LEASE_SECONDS = 300
+BACKFILL_IDLE_POLL_SECONDS = 5
+BACKFILL_THROUGHPUT_WINDOW_SECONDS = 600
+
+BACKFILL_JOBS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS backfill_jobs (
+        team TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        games INTEGER,
+        last_error TEXT,
+        enqueued_at REAL NOT NULL,
+        not_before REAL NOT NULL DEFAULT 0,
+        started_at REAL,
+        finished_at REAL,
+        owner TEXT,
+        lease_until REAL,
+        PRIMARY KEY (team, year)
+    )
+'''
+BACKFILL_JOBS_INDEX = 'CREATE INDEX IF NOT EXISTS idx_backfill_jobs_status ON backfill_jobs(status, not_before)'
+
+# New pairs are inserted; failed jobs are retried; finished ones only with force
+ENQUEUE_JOB_SQL = '''
+    INSERT INTO backfill_jobs (team, year, status, enqueued_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT(team, year) DO UPDATE SET
+        status = excluded.status,
+        attempts = 0,
+        last_error = NULL,
+        not_before = 0,
+        enqueued_at = excluded.enqueued_at
+    WHERE backfill_jobs.status = 'failed'
+       OR (? AND backfill_jobs.status IN ('done', 'skipped'))
+'''
+NEXT_JOB_SQL = '''
+    SELECT team, year FROM backfill_jobs
+    WHERE (status = 'pending' AND not_before <= ?) OR (status = 'running' AND lease_until < ?)
+    ORDER BY year DESC, team
+    LIMIT 1
+'''
+CLAIM_JOB_SQL = '''
+    UPDATE backfill_jobs
+    SET status = 'running', owner = ?, lease_until = ?, started_at = ?, attempts = attempts + 1
+    WHERE team = ? AND year = ?
+'''
+FINISH_JOB_SQL = '''
+    UPDATE backfill_jobs
+    SET status = 'done', games = ?, last_error = NULL, finished_at = ?, owner = NULL, lease_until = NULL
+    WHERE team = ? AND year = ? AND owner = ?
+'''
+FAIL_JOB_SQL = '''
+    UPDATE backfill_jobs
+    SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+        last_error = ?, not_before = ?, finished_at = ?, owner = NULL, lease_until = NULL
+    WHERE team = ? AND year = ? AND owner = ?
+'''
+RELEASE_JOBS_SQL = '''
+    UPDATE backfill_jobs SET status = 'pending', attempts = attempts - 1, owner = NULL, lease_until = NULL
+    WHERE status = 'running' AND owner = ?
+'''
+JOB_COUNTS_SQL = 'SELECT status, COUNT(*) FROM backfill_jobs GROUP BY status'
+RECENT_DONE_SQL = "SELECT COUNT(*) FROM backfill_jobs WHERE status = 'done' AND finished_at >= ?"
+RECENT_FAILURES_SQL = '''
+    SELECT team, year, attempts, last_error FROM backfill_jobs
+    WHERE last_error IS NOT NULL ORDER BY finished_at DESC LIMIT 5
+'''
+
+class RateLimiter:
+    """Spaces calls at least 60/per_minute seconds apart across threads"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, stop_event=None):
+        """Block until this caller's slot; returns False if stop_event fired first"""
+        with self._lock:
+            slot = max(time.monotonic(), self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - time.monotonic()
+        if delay <= 0:
+            return True
+        if stop_event is not None:
+            return not stop_event.wait(delay)
+        time.sleep(delay)
+        return True
+
+class BackfillRunner:
+    """Durable team x year scrape queue drained by a rate-limited worker pool.
+
+    Jobs live in the backfill_jobs table of the season store, so a restart
+    picks up where the last run stopped: pending jobs stay pending and jobs
+    left 'running' by a dead worker are reclaimed once their lease expires.
+    """
+
+    def __init__(self, workers=BACKFILL_WORKERS, requests_per_minute=BACKFILL_REQUESTS_PER_MINUTE,
+                 scrape=scrape_season, store=None):
+        self.workers = workers
+        self.requests_per_minute = requests_per_minute
+        self.scrape = scrape
+        self.store = store
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.limiter = RateLimiter(requests_per_minute)
+
+        self._threads = []
+        self._stop = threading.Event()
+        self._tables_ready = False
+        self.started_at = None
+        self.completed = 0
+        self.failed = 0
+
+    def _connection(self):
+        store = self.store or get_season_store()
+        conn = store.pool.get_connection()
+        if not self._tables_ready:
+            with conn:
+                conn.execute(BACKFILL_JOBS_SCHEMA)
+                conn.execute(BACKFILL_JOBS_INDEX)
+            self._tables_ready = True
+        return conn
+
+    # Queue
+
+    def enqueue(self, teams, years, force=False):
+        """
+        Queue a scrape for every team x year pair. Completed past seasons
+        already in the store are recorded as skipped unless force is set.
+        """
+        store = self.store or get_season_store()
+        conn = self._connection()
+        stored = {(season['team'], season['year']) for season in store.list_seasons()}
+        this_season = current_season()
+        now_ts = time.time()
+
+        pending = []
+        skipped = []
+        for year in sorted({int(year) for year in years}, reverse=True):
+            for team in dict.fromkeys(team_slug(team) for team in teams):
+                # The current season keeps gaining games, so it is never complete
+                if (team, year) in stored and year < this_season and not force:
+                    skipped.append((team, year, 'skipped', now_ts, 0))
+                else:
+                    pending.append((team, year, 'pending', now_ts, int(force)))
+
+        with conn:
+            conn.executemany(ENQUEUE_JOB_SQL, skipped)
+            before = conn.total_changes
+            conn.executemany(ENQUEUE_JOB_SQL, pending)
+            queued = conn.total_changes - before
+
+        logger.info(f"Backfill queued {queued} of {len(pending) + len(skipped)} team-seasons ({len(skipped)} already stored)")
+        return {'requested': len(pending) + len(skipped), 'queued': queued, 'already_stored': len(skipped)}
+
+    def _claim(self):
+        """Atomically take the next runnable job; None when nothing is due"""
+        conn = self._connection()
+        now_ts = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(NEXT_JOB_SQL, (now_ts, now_ts)).fetchone()
+            if row is not None:
+                conn.execute(CLAIM_JOB_SQL, (self.owner, now_ts + BACKFILL_LEASE_SECONDS, now_ts) + tuple(row))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return row
+
+    def _finish(self, team, year, games):
+        conn = self._connection()
+        with conn:
+            conn.execute(FINISH_JOB_SQL, (games, time.time(), team, year, self.owner))
+
+    def _fail(self, team, year, error):
+        now_ts = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(FAIL_JOB_SQL, (
+                BACKFILL_MAX_ATTEMPTS, error, now_ts + BACKFILL_RETRY_DELAY_SECONDS, now_ts,
+                team, year, self.owner
+            ))
+
+    def _has_open_jobs(self):
+        counts = dict(self._connection().execute(JOB_COUNTS_SQL).fetchall())
+        return counts.get('pending', 0) + counts.get('running', 0) > 0
+
+    # Workers
+
+    def run_job(self, team, year):
+        """Scrape one claimed team-season and record the outcome"""
+        try:
+            games = self.scrape(team, year)
+            if not games:
+                raise ValueError("no games found")
+            self._finish(team, year, games)
+            self.completed += 1
+            logger.info(f"Backfill stored {games} games for {team} {year}")
+        except Exception as e:
+            self._fail(team, year, str(e))
+            self.failed += 1
+            logger.error(f"Backfill failed for {team} {year}: {e}")
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error(f"Backfill claim failed: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    if not self._has_open_jobs():
+                        break
+                except Exception as e:
+                    logger.error(f"Backfill queue check failed: {e}")
+                # Only retries waiting out their delay (or other workers' jobs) are left
+                self._stop.wait(BACKFILL_IDLE_POLL_SECONDS)
+                continue
+
+            if not self.limiter.wait(self._stop):
+                break
+            self.run_job(*job)
+
+        logger.info(f"Backfill worker {threading.current_thread().name} exiting")
+
+    def start(self):
+        if self.is_running():
+            return False
+
+        self._stop.clear()
+        self.started_at = time.time()
+        self.completed = 0
+        self.failed = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f'ncaab-backfill-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Backfill started with {self.workers} workers at {self.requests_per_minute} requests/minute")
+        return True
+
+    def stop(self, timeout=None):
+        """Stop the workers and hand any job still in flight back to the queue"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(RELEASE_JOBS_SQL, (self.owner,))
+        except Exception as e:
+            logger.debug(f"Error releasing backfill jobs: {e}")
+
+    def is_running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def status(self):
+        """Queue counts, throughput over the last window and an ETA for the rest"""
+        conn = self._connection()
+        counts = dict(conn.execute(JOB_COUNTS_SQL).fetchall())
+        now_ts = time.time()
+
+        window_start = now_ts - BACKFILL_THROUGHPUT_WINDOW_SECONDS
+        if self.started_at:
+            window_start = max(window_start, self.started_at)
+        recent_done = conn.execute(RECENT_DONE_SQL, (window_start,)).fetchone()[0]
+        elapsed = now_ts - window_start
+        per_minute = recent_done / elapsed * 60 if recent_done and elapsed > 0 else 0
+
+        remaining = counts.get('pending', 0) + counts.get('running', 0)
+        eta_seconds = round(remaining / per_minute * 60) if per_minute else None
+
+        return {
+            'running': self.is_running(),
+            'owner': self.owner,
+            'workers': self.workers,
+            'requests_per_minute': self.requests_per_minute,
+            'counts': {status: counts.get(status, 0) for status in ('pending', 'running', 'done', 'failed', 'skipped')},
+            'session': {
+                'started_at': dt.datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+                'completed': self.completed,
+                'failed': self.failed
+            },
+            'throughput_per_minute': round(per_minute, 2),
+            'eta_seconds': eta_seconds,
+            'eta': (dt.datetime.now() + dt.timedelta(seconds=eta_seconds)).isoformat() if eta_seconds is not None else None,
+            'recent_errors': [
+                dict(zip(('team', 'year', 'attempts', 'error'), row))
+                for row in conn.execute(RECENT_FAILURES_SQL).fetchall()
+            ]
+        }
+
+backfill_runner = BackfillRunner()
@@ -0,0 +1,138 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    """A load in progress that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and request coalescing.
+
+    ``get_or_load`` runs the loader once per key no matter how many threads
+    miss at the same time; the others block until the first load finishes
+    and share its result.
+    """
+
+    def __init__(self, maxsize=256, name='cache'):
+        self.maxsize = maxsize
+        self.name = name
+        self._data = OrderedDict()  # key -> (value, expires_at or None)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        """Return (found, value); caller must hold the lock"""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            return False, None
+
+        self._data.move_to_end(key)
+        return True, value
+
+    def _store(self, key, value, ttl):
+        """Insert and evict least-recently-used entries; caller must hold the lock"""
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Cache ``value``; ttl=None keeps it until evicted"""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_load(self, key, loader, ttl=None, should_cache=None):
+        """Return the cached value for ``key`` or load it exactly once.
+
+        ``ttl`` may be a number of seconds, None (no expiry) or a callable
+        taking the loaded value. Values rejected by ``should_cache`` are
+        handed to every waiting caller but not stored.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                flight = self._inflight[key] = _Flight()
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and (should_cache is None or should_cache(flight.value)):
+                    entry_ttl = ttl(flight.value) if callable(ttl) else ttl
+                    self._store(key, flight.value, entry_ttl)
+                del self._inflight[key]
+            flight.done.set()
+
+        return flight.value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0
+            }
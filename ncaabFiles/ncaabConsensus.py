@@ -0,0 +1,158 @@
+from statistics import median
+from typing import Dict, List, Optional
+
+# (side, price column, line column or None) for each side of each market
+BEST_LINE_SIDES = [
+    ('home_ml', 'home_ml', None),
+    ('away_ml', 'away_ml', None),
+    ('home_spread', 'home_spread_odds', 'home_spread'),
+    ('away_spread', 'away_spread_odds', 'away_spread'),
+    ('over', 'over_odds', 'over_under'),
+    ('under', 'under_odds', 'over_under')
+]
+CONSENSUS_COLUMNS = ['home_ml', 'away_ml', 'home_spread', 'away_spread', 'over_under']
+# Lines copied from the highest-priority source into each game's 'primary' entry
+PRIMARY_COLUMNS = ['home_ml', 'away_ml', 'home_spread', 'away_spread', 'home_spread_odds',
+                   'away_spread_odds', 'over_under', 'over_odds', 'under_odds']
+# American odds jump from -100 to +100, so their median is taken on implied probability
+MONEYLINE_COLUMNS = ('home_ml', 'away_ml')
+
+def game_key(game_day, home_team, away_team):
+    """Key identifying the same game across sportsbooks: (game_day, home, away), names lowercased"""
+    return (str(game_day or ''), (home_team or '').strip().lower(), (away_team or '').strip().lower())
+
+def implied_probability(price) -> Optional[float]:
+    """American odds -> implied win probability (-110 -> 0.5238)"""
+    if price is None or price == 0 or -100 < price < 100:
+        return None
+    return -price / (-price + 100) if price < 0 else 100 / (price + 100)
+
+def american_odds(probability) -> Optional[int]:
+    """Implied win probability -> American odds (0.5238 -> -110, 0.5 -> +100)"""
+    if probability is None or not 0 < probability < 1:
+        return None
+    if probability > 0.5:
+        return round(-100 * probability / (1 - probability))
+    return round(100 * (1 - probability) / probability)
+
+def _median_price(prices) -> Optional[int]:
+    """Median moneyline, taken in implied-probability space"""
+    probabilities = [implied_probability(price) for price in prices]
+    probabilities = [probability for probability in probabilities if probability is not None]
+    return american_odds(median(probabilities)) if probabilities else None
+
+def _line_rank(side, line, price):
+    """Sort key where larger is better for the bettor on ``side``"""
+    # Unders want the highest total, overs the lowest; spreads want the most points
+    line_rank = -line if side == 'over' else line
+    return (line_rank if line is not None else float('-inf'), price if price is not None else float('-inf'))
+
+def best_line(side, price_column, line_column, lines: Dict[str, Dict]) -> Optional[Dict]:
+    """Best price (and number) offered on one side across sources, with every source offering it"""
+    best = None
+    sources = []
+    for source, row in lines.items():
+        price = row.get(price_column)
+        if line_column:
+            line = row.get(line_column)
+            if line is None:
+                continue
+            rank = _line_rank(side, line, price)
+        else:
+            if price is None:
+                continue
+            line = None
+            rank = (price,)
+        if best is None or rank > best[0]:
+            best = (rank, line, price)
+            sources = [source]
+        elif rank == best[0]:
+            sources.append(source)
+    if best is None:
+        return None
+
+    _, line, price = best
+    result = {'price': price, 'sources': sorted(sources)}
+    if line_column:
+        result['line'] = line
+    return result
+
+def _hold(first: Optional[Dict], second: Optional[Dict], same_number=True) -> Optional[float]:
+    """Bookmaker margin implied by two opposing prices, in percent (negative = arbitrage)"""
+    if not first or not second or not same_number:
+        return None
+    probabilities = [implied_probability(first['price']), implied_probability(second['price'])]
+    if None in probabilities:
+        return None
+    return round((sum(probabilities) - 1) * 100, 2)
+
+def game_consensus(lines: Dict[str, Dict]) -> Dict:
+    """
+    Best available line per side, median consensus and best-line market hold
+    for one game, from {source: gameline row} with numeric odds and lines.
+    """
+    best = {
+        side: best_line(side, price_column, line_column, lines)
+        for side, price_column, line_column in BEST_LINE_SIDES
+    }
+
+    consensus = {}
+    for column in CONSENSUS_COLUMNS:
+        values = [row[column] for row in lines.values() if row.get(column) is not None]
+        if column in MONEYLINE_COLUMNS:
+            consensus[column] = _median_price(values)
+        else:
+            consensus[column] = median(values) if values else None
+
+    home_spread, away_spread = best['home_spread'], best['away_spread']
+    over, under = best['over'], best['under']
+    hold = {
+        'moneyline': _hold(best['home_ml'], best['away_ml']),
+        # Only two sides of the same number form a market
+        'spread': _hold(home_spread, away_spread,
+                        bool(home_spread and away_spread) and home_spread['line'] == -away_spread['line']),
+        'total': _hold(over, under, bool(over and under) and over['line'] == under['line'])
+    }
+
+    return {
+        'sources': sorted(lines),
+        'books': len(lines),
+        'best': best,
+        'consensus': consensus,
+        'hold': hold
+    }
+
+def consensus_by_game(rows: List[Dict], priority=None) -> Dict[tuple, Dict]:
+    """
+    Group gameline rows by canonical game and compute each game's consensus.
+    Names, start time and the ``primary`` lines come from the highest
+    ``priority(source)`` source.
+    """
+    priority = priority or (lambda source: 0)
+    games = {}
+    for row in sorted(rows, key=lambda row: (priority(row['source']), row['source'])):
+        key = game_key(row['game_day'], row['home_team'], row['away_team'])
+        game = games.setdefault(key, {
+            'game_day': key[0],
+            'home_team': row['home_team'],
+            'away_team': row['away_team'],
+            'start_time': row.get('start_time'),
+            'primary': row['source'],
+            'lines': {}
+        })
+        game['lines'][row['source']] = row
+
+    return {
+        key: {
+            'game_day': game['game_day'],
+            'home_team': game['home_team'],
+            'away_team': game['away_team'],
+            'start_time': game['start_time'],
+            'primary': {
+                'source': game['primary'],
+                **{column: game['lines'][game['primary']].get(column) for column in PRIMARY_COLUMNS}
+            },
+            **game_consensus(game['lines'])
+        }
+        for key, game in games.items()
+    }
@@ -1,183 +1,101 @@
-import sqlite3
 import datetime as dt
-import requests
-from bs4 import BeautifulSoup
-import os
-import pandas as pd
 import logging
 
+from ncaabHttp import http_get
+from ncaabParser import parse_gamelog
+from ncaabStore import get_season_store, team_slug, LEGACY_STATS_COLUMNS
+from ncaabEvents import ncaab_events_manager
+from ncaabGetData import current_season
+from ncaabSummary import season_summary, league_season_summaries, SEASON_SUMMARY_COLUMNS
+
 logger = logging.getLogger(__name__)
 
 current_year = dt.datetime.now().year
 
-# Database field lists for NCAA Basketball
-Date = []
-Opponent = []
-Result = []
-Tm = []
-Opp = []
-FGM = []
-FGA = []
-FG_Pct = []
-ThreePM = []
-ThreePA = []
-ThreeP_Pct = []
-FTM = []
-FTA = []
-FT_Pct = []
-ORB = []
-TRB = []
-AST = []
-STL = []
-BLK = []
-TOV = []
-PF = []
-Opp_FGM = []
-Opp_FGA = []
-Opp_FG_Pct = []
-Opp_ThreePM = []
-Opp_ThreePA = []
-Opp_ThreeP_Pct = []
-Opp_FTM = []
-Opp_FTA = []
-Opp_FT_Pct = []
-Opp_ORB = []
-Opp_TRB = []
-Opp_AST = []
-Opp_STL = []
-Opp_BLK = []
-Opp_TOV = []
-Opp_PF = []
+# Columns of the legacy per-team Stats table, in storage order
+STATS_COLUMNS = LEGACY_STATS_COLUMNS
 
-def ncaabdb(team, year=current_year):
+GAMELOG_URL = 'https://www.sports-reference.com/cbb/schools/{team}/{year}/gamelog/'
+
+def scrape_season(team, year):
     """
-    Scrape NCAA Basketball team stats and store in SQLite database
+    Fetch one team-season game log into the season store.
+    Returns the number of games stored; raises on fetch errors.
     """
     team = team.lower()
-    year = year
     
-    # Create ncaabDb directory if it doesn't exist
-    os.makedirs('ncaabDb', exist_ok=True)
+    # NCAA Basketball stats URL (using Sports Reference format)
+    url = GAMELOG_URL.format(team=team, year=year)
+    
+    content = http_get(url)
+    content.raise_for_status()
+    
+    # Single pass over the sgl-basic table into typed rows
+    games = parse_gamelog(content.content)
+    if not games:
+        return 0
+    
+    store = get_season_store()
+    stored = store.replace_season(team, year, games)
+    store.record_source(team, year, url, content.headers.get('ETag'), content.headers.get('Last-Modified'), changed=True)
+    return stored
+
+def _needs_fetch(team, year, source):
+    """False when no game can have been played since the last stored one"""
+    if not source['last_game_date']:
+        return True
+    # A finished season that is already stored never changes
+    if int(year) < current_season():
+        return False
+    # None means the schedule can't tell, so fetch
+    return ncaab_events_manager.team_games_since(team, source['last_game_date']) != 0
+
+def refresh_season(team, year, force=False):
+    """
+    Incrementally refresh a team-season: skip the fetch when the schedule
+    shows no game since the last stored one, send If-None-Match /
+    If-Modified-Since from the previous fetch, and upsert only new or
+    changed games (keyed on team, year, date, opponent).
+    """
+    team = team_slug(team)
+    store = get_season_store()
+    source = store.season_source(team, year)
+    
+    if source and not force and not _needs_fetch(team, year, source):
+        return {'status': 'skipped', 'team': team, 'year': year, 'last_game_date': source['last_game_date']}
+    
+    url = GAMELOG_URL.format(team=team, year=year)
+    headers = {}
+    if source and not force:
+        if source['etag']:
+            headers['If-None-Match'] = source['etag']
+        if source['last_modified']:
+            headers['If-Modified-Since'] = source['last_modified']
+    
+    response = http_get(url, headers=headers or None)
+    if response.status_code == 304:
+        store.record_source(team, year, url, source['etag'], source['last_modified'])
+        return {'status': 'not_modified', 'team': team, 'year': year}
+    response.raise_for_status()
     
-    sample_list = []
+    games = parse_gamelog(response.content)
+    counts = store.upsert_games(team, year, games)
+    changed = counts['inserted'] + counts['updated'] > 0
+    store.record_source(team, year, url, response.headers.get('ETag'), response.headers.get('Last-Modified'), changed=changed)
     
+    return {'status': 'updated' if changed else 'unchanged', 'team': team, 'year': year, **counts}
+
+def ncaabdb(team, year=current_year):
+    """
+    Scrape NCAA Basketball team stats and store them in the season store
+    """
     try:
-        # NCAA Basketball stats URL (using Sports Reference format)
-        url = f'https://www.sports-reference.com/cbb/schools/{team}/{year}/gamelog/'
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        content = requests.get(url, headers=headers)
-        content.raise_for_status()
-        
-        soup = BeautifulSoup(content.content, 'html.parser')
-        
-        # Find the stats table
-        table = soup.find('table', {'id': 'sgl-basic'})
-        if not table:
+        stored = scrape_season(team, year)
+        if not stored:
             print(f"No stats table found for {team} {year}")
             return False
-            
-        # Extract all table cells
-        td = table.find_all('td')
-        th = table.find_all('th')
-        
-        # Combine all cells for processing
-        all_cells = th + td
-        
-        for cell in all_cells:
-            sample_list.append(cell.text.strip())
-        
-        # NCAA Basketball typically has around 25+ stats per game
-        stats_per_game = 28  # Adjust based on actual table structure
-        
-        if len(sample_list) < stats_per_game:
-            print(f"Not enough data found for {team} {year}")
-            return False
-        
-        # Extract stats by slicing the list
-        Date = sample_list[0::stats_per_game]
-        Opponent = sample_list[1::stats_per_game]
-        Result = sample_list[3::stats_per_game]
-        Tm = sample_list[4::stats_per_game] if len(sample_list) > 4 else []
-        Opp = sample_list[5::stats_per_game] if len(sample_list) > 5 else []
-        FGM = sample_list[6::stats_per_game] if len(sample_list) > 6 else []
-        FGA = sample_list[7::stats_per_game] if len(sample_list) > 7 else []
-        FG_Pct = sample_list[8::stats_per_game] if len(sample_list) > 8 else []
-        ThreePM = sample_list[9::stats_per_game] if len(sample_list) > 9 else []
-        ThreePA = sample_list[10::stats_per_game] if len(sample_list) > 10 else []
-        ThreeP_Pct = sample_list[11::stats_per_game] if len(sample_list) > 11 else []
-        FTM = sample_list[12::stats_per_game] if len(sample_list) > 12 else []
-        FTA = sample_list[13::stats_per_game] if len(sample_list) > 13 else []
-        FT_Pct = sample_list[14::stats_per_game] if len(sample_list) > 14 else []
-        ORB = sample_list[15::stats_per_game] if len(sample_list) > 15 else []
-        TRB = sample_list[16::stats_per_game] if len(sample_list) > 16 else []
-        AST = sample_list[17::stats_per_game] if len(sample_list) > 17 else []
-        STL = sample_list[18::stats_per_game] if len(sample_list) > 18 else []
-        BLK = sample_list[19::stats_per_game] if len(sample_list) > 19 else []
-        TOV = sample_list[20::stats_per_game] if len(sample_list) > 20 else []
-        PF = sample_list[21::stats_per_game] if len(sample_list) > 21 else []
-        Opp_FGM = sample_list[22::stats_per_game] if len(sample_list) > 22 else []
-        Opp_FGA = sample_list[23::stats_per_game] if len(sample_list) > 23 else []
-        Opp_FG_Pct = sample_list[24::stats_per_game] if len(sample_list) > 24 else []
-        Opp_ThreePM = sample_list[25::stats_per_game] if len(sample_list) > 25 else []
-        Opp_ThreePA = sample_list[26::stats_per_game] if len(sample_list) > 26 else []
-        Opp_ThreeP_Pct = sample_list[27::stats_per_game] if len(sample_list) > 27 else []
-        
-        # Create database connection
-        db_path = os.path.join('ncaabDb', f'{team}-{year}-stats.db')
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        
-        # Create table
-        cur.execute("""CREATE TABLE IF NOT EXISTS Stats(
-            Date TEXT, Opponent TEXT, Result TEXT, Tm TEXT, Opp TEXT,
-            FGM TEXT, FGA TEXT, FG_Pct TEXT, ThreePM TEXT, ThreePA TEXT, ThreeP_Pct TEXT,
-            FTM TEXT, FTA TEXT, FT_Pct TEXT, ORB TEXT, TRB TEXT, AST TEXT, STL TEXT,
-            BLK TEXT, TOV TEXT, PF TEXT, Opp_FGM TEXT, Opp_FGA TEXT, Opp_FG_Pct TEXT,
-            Opp_ThreePM TEXT, Opp_ThreePA TEXT, Opp_ThreeP_Pct TEXT)""")
         
-        # Insert data
-        for i in range(len(Date)):
-            try:
-                cur.execute("""INSERT INTO Stats VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-                          (Date[i] if i < len(Date) else '',
-                           Opponent[i] if i < len(Opponent) else '',
-                           Result[i] if i < len(Result) else '',
-                           Tm[i] if i < len(Tm) else '',
-                           Opp[i] if i < len(Opp) else '',
-                           FGM[i] if i < len(FGM) else '',
-                           FGA[i] if i < len(FGA) else '',
-                           FG_Pct[i] if i < len(FG_Pct) else '',
-                           ThreePM[i] if i < len(ThreePM) else '',
-                           ThreePA[i] if i < len(ThreePA) else '',
-                           ThreeP_Pct[i] if i < len(ThreeP_Pct) else '',
-                           FTM[i] if i < len(FTM) else '',
-                           FTA[i] if i < len(FTA) else '',
-                           FT_Pct[i] if i < len(FT_Pct) else '',
-                           ORB[i] if i < len(ORB) else '',
-                           TRB[i] if i < len(TRB) else '',
-                           AST[i] if i < len(AST) else '',
-                           STL[i] if i < len(STL) else '',
-                           BLK[i] if i < len(BLK) else '',
-                           TOV[i] if i < len(TOV) else '',
-                           PF[i] if i < len(PF) else '',
-                           Opp_FGM[i] if i < len(Opp_FGM) else '',
-                           Opp_FGA[i] if i < len(Opp_FGA) else '',
-                           Opp_FG_Pct[i] if i < len(Opp_FG_Pct) else '',
-                           Opp_ThreePM[i] if i < len(Opp_ThreePM) else '',
-                           Opp_ThreePA[i] if i < len(Opp_ThreePA) else '',
-                           Opp_ThreeP_Pct[i] if i < len(Opp_ThreeP_Pct) else ''))
-            except Exception as e:
-                print(f"Error inserting row {i}: {e}")
-                continue
-                
-        conn.commit()
-        conn.close()
-        
-        print(f"Successfully stored {len(Date)} games for {team} {year}")
+        print(f"Successfully stored {stored} games for {team} {year}")
         return True
         
     except Exception as e:
@@ -208,35 +126,11 @@ def get_team_stats(team, year):
         return {"error": str(e)}
 
 def _get_stats_from_db(team, year):
-    """Get stats from SQLite database"""
+    """Get stats from the season store"""
     try:
-        db_path = f"ncaabDb/{team}-{year}-stats.db"
-        if not os.path.exists(db_path):
-            return None
-            
-        conn = sqlite3.connect(db_path)
-        cur = conn.cursor()
-        
-        # Get all games
-        cur.execute('SELECT * FROM Stats')
-        rows = cur.fetchall()
-        conn.close()
-        
-        if not rows:
+        games = get_season_store().load_season(team, year)
+        if not games:
             return None
-            
-        # Convert to list of dictionaries
-        columns = [
-            'Date', 'Opponent', 'Result', 'Tm', 'Opp', 'FGM', 'FGA', 'FG_Pct',
-            'ThreePM', 'ThreePA', 'ThreeP_Pct', 'FTM', 'FTA', 'FT_Pct', 'ORB',
-            'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'Opp_FGM', 'Opp_FGA',
-            'Opp_FG_Pct', 'Opp_ThreePM', 'Opp_ThreePA', 'Opp_ThreeP_Pct'
-        ]
-        
-        games = []
-        for row in rows:
-            game_dict = dict(zip(columns, row))
-            games.append(game_dict)
         
         # Calculate summary stats
         summary = _calculate_summary_stats(games)
@@ -250,61 +144,28 @@ def _get_stats_from_db(team, year):
         logger.error(f"Error reading from database: {e}")
         return None
 
+def get_league_summaries(year, teams):
+    """
+    Summaries for many teams from the season store in one query.
+    Returns {'summaries': {team: summary}, 'missing': [teams not stored]}
+    """
+    slugs = {team: team_slug(team) for team in teams}
+    columns = get_season_store().load_league_columns(year, slugs.values(), SEASON_SUMMARY_COLUMNS)
+    by_slug = league_season_summaries(columns)
+
+    summaries = {}
+    missing = []
+    for team, slug in slugs.items():
+        if slug in by_slug:
+            summaries[team] = dict(by_slug[slug], team=slug, year=year)
+        else:
+            missing.append(team)
+
+    return {'summaries': summaries, 'missing': missing}
+
 def _calculate_summary_stats(games):
     """Calculate summary statistics from game data"""
-    try:
-        if not games:
-            return {}
-            
-        total_games = len(games)
-        wins = 0
-        losses = 0
-        
-        # Basic stats accumulators
-        total_points = 0
-        total_points_against = 0
-        total_fgm = 0
-        total_fga = 0
-        total_threepm = 0
-        total_ftm = 0
-        
-        for game in games:
-            try:
-                # Calculate win/loss
-                if 'W' in str(game.get('Result', '')):
-                    wins += 1
-                elif 'L' in str(game.get('Result', '')):
-                    losses += 1
-                
-                # Accumulate stats
-                total_points += int(game['Tm']) if game['Tm'] and str(game['Tm']).isdigit() else 0
-                total_points_against += int(game['Opp']) if game['Opp'] and str(game['Opp']).isdigit() else 0
-                total_fgm += int(game['FGM']) if game['FGM'] and str(game['FGM']).isdigit() else 0
-                total_fga += int(game['FGA']) if game['FGA'] and str(game['FGA']).isdigit() else 0
-                total_threepm += int(game['ThreePM']) if game['ThreePM'] and str(game['ThreePM']).isdigit() else 0
-                total_ftm += int(game['FTM']) if game['FTM'] and str(game['FTM']).isdigit() else 0
-                
-            except (ValueError, KeyError):
-                continue
-        
-        # Calculate percentages
-        fg_pct = (total_fgm / total_fga * 100) if total_fga > 0 else 0
-        
-        return {
-            'record': f"{wins}-{losses}",
-            'wins': wins,
-            'losses': losses,
-            'points_per_game': round(total_points / total_games, 1) if total_games > 0 else 0,
-            'points_against_per_game': round(total_points_against / total_games, 1) if total_games > 0 else 0,
-            'fg_percentage': round(fg_pct, 1),
-            'threes_per_game': round(total_threepm / total_games, 1) if total_games > 0 else 0,
-            'ftm_per_game': round(total_ftm / total_games, 1) if total_games > 0 else 0,
-            'total_games': total_games
-        }
-        
-    except Exception as e:
-        logger.error(f"Error calculating summary stats: {e}")
-        return {}
+    return season_summary(games)
 
 def get_player_stats(player, season=None):
     """
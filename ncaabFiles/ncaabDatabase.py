@@ -0,0 +1,138 @@
+import os
+import sqlite3
+import threading
+import weakref
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Applied to every pooled connection
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # negative = KiB, ~16MB page cache
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000
+}
+STATEMENT_CACHE_SIZE = 256
+CONNECT_TIMEOUT = 10
+
+class ConnectionPool:
+    """Thread-local SQLite connection pool.
+
+    Each worker thread gets one long-lived, tuned connection so prepared
+    statements stay cached between requests instead of being thrown away
+    with a fresh sqlite3.connect() per call. Connections of threads that
+    have exited are closed when the next thread opens its connection.
+    """
+
+    def __init__(self, db_file, pragmas=None):
+        self.db_file = db_file
+        self.pragmas = pragmas or SQLITE_PRAGMAS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def connect(self):
+        """Open a new tuned connection that is not bound to the calling thread"""
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=CONNECT_TIMEOUT,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        for pragma, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {pragma}={value}')
+        return conn
+
+    def get_connection(self):
+        """Return the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.connect()
+            self._local.conn = conn
+            thread = weakref.ref(threading.current_thread())
+            with self._lock:
+                self._close_dead_threads()
+                self._connections.append((thread, conn))
+        return conn
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+
+    def _close_dead_threads(self):
+        """Close the connections of threads that have exited; call with the lock held"""
+        live = []
+        for thread_ref, conn in self._connections:
+            thread = thread_ref()
+            if thread is not None and thread.is_alive():
+                live.append((thread_ref, conn))
+            else:
+                self._close(conn)
+        self._connections = live
+
+    def close_all(self):
+        """Close every connection handed out by this pool"""
+        with self._lock:
+            for _, conn in self._connections:
+                self._close(conn)
+            self._connections = []
+        self._local = threading.local()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_file):
+    """Process-wide pool for a database file"""
+    key = os.path.abspath(db_file)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_file)
+            _pools[key] = pool
+        return pool
+
+def schema_version(conn):
+    """The database's PRAGMA user_version (0 for a new file)"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def run_migrations(conn, migrations, name='database'):
+    """Apply (version, description, step) migrations newer than user_version.
+
+    ``step`` is a list of SQL statements or a callable taking the connection.
+    Each migration runs in its own BEGIN IMMEDIATE transaction together with
+    its user_version bump, so a failed step leaves the file at the previous
+    version and concurrent processes never apply the same step twice.
+    Returns the version the database ends up at.
+    """
+    current = schema_version(conn)
+    for version, description, step in sorted(migrations, key=lambda migration: migration[0]):
+        if version <= current:
+            continue
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            current = schema_version(conn)
+            if version <= current:
+                conn.rollback()
+                continue
+            if callable(step):
+                step(conn)
+            else:
+                for statement in step:
+                    conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {int(version)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.error(f"Migration {version} of {name} failed: {description}")
+            raise
+
+        current = version
+        logger.info(f"Migrated {name} to version {version}: {description}")
+    return current
@@ -1,55 +1,164 @@
 import datetime as dt
-import requests
 from bs4 import BeautifulSoup
-import sqlite3
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict
 
+from ncaabDatabase import get_pool
+from ncaabHttp import http_get
+from ncaabStore import team_slug
+
 logger = logging.getLogger(__name__)
 
+# Schedule scraping configuration
+SCHEDULE_URL = "https://www.espn.com/mens-college-basketball/schedule/_/date/{date}"
+SCHEDULE_FETCH_WORKERS = 8
+# Windows at least this many days long are parsed in a process pool
+SCHEDULE_PROCESS_PARSE_MIN_DAYS = 10
+SCHEDULE_PARSE_PROCESSES = min(4, os.cpu_count() or 1)
+# Parse workers must not be forked from the multithreaded server: a fork
+# copies locks other threads hold (logging, the SQLite and HTTP pools)
+SCHEDULE_PARSE_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """Process-wide schedule parsing pool, started on first use and reused"""
+    global _parse_pool
+    if _parse_pool is None:
+        with _parse_pool_lock:
+            if _parse_pool is None:
+                _parse_pool = ProcessPoolExecutor(
+                    max_workers=SCHEDULE_PARSE_PROCESSES,
+                    mp_context=multiprocessing.get_context(SCHEDULE_PARSE_START_METHOD)
+                )
+    return _parse_pool
+
+def shutdown_parse_pool():
+    """Stop the parsing processes; the next large window starts a new pool"""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _parse_schedule_page(html, game_day: str) -> List[Dict]:
+    """Parse one ESPN schedule page into game dicts (top-level so it pickles)"""
+    games = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    game_containers = soup.find_all('div', class_=lambda x: x and 'ScheduleTables' in x)
+    
+    for container in game_containers:
+        try:
+            teams = container.find_all('a', class_='team-name')
+            for i in range(0, len(teams), 2):
+                if i + 1 < len(teams):
+                    away_team = teams[i].text.strip()
+                    home_team = teams[i + 1].text.strip()
+                    
+                    if away_team and home_team:
+                        games.append({
+                            'game_day': game_day,
+                            'start_time': 'TBD',
+                            'home_team': home_team,
+                            'away_team': away_team
+                        })
+        except Exception as e:
+            logger.debug(f"Error parsing NCAAB game container: {e}")
+            continue
+    
+    return games
+
 class NCAABEvents:
     def __init__(self):
         self.sport = 'ncaab'
+        # Latest schedule from refresh_schedule(), kept for request paths
+        self.schedule = []
+        self.schedule_updated_at = None
+        # First day the in-memory schedule covers
+        self.schedule_start = None
+    
+    def refresh_schedule(self, days: int = 7) -> int:
+        """Re-scrape the upcoming schedule and keep it in memory"""
+        games = self.get_schedule(days)
+        if games:
+            self.schedule = games
+            self.schedule_updated_at = dt.datetime.now().isoformat()
+            self.schedule_start = dt.date.today()
+        return len(games)
     
-    def get_schedule(self, days: int = 7) -> List[Dict]:
-        """Get NCAAB schedule for upcoming days"""
+    def team_games_since(self, team: str, last_game_day: str, today: dt.date = None):
+        """
+        Number of scheduled games for ``team`` after ``last_game_day`` up to
+        today, or None when the in-memory schedule can't tell (team not in
+        it, or it starts later than the day after ``last_game_day``).
+        """
+        if not self.schedule or self.schedule_start is None or not last_game_day:
+            return None
+        
+        try:
+            last_game = dt.date.fromisoformat(str(last_game_day)[:10])
+        except ValueError:
+            return None
+        if self.schedule_start > last_game + dt.timedelta(days=1):
+            return None
+        
+        slug = team_slug(team)
+        game_days = [
+            game['game_day'] for game in self.schedule
+            if slug in (team_slug(game['home_team']), team_slug(game['away_team']))
+        ]
+        if not game_days:
+            return None
+        
+        today = today or dt.date.today()
+        return sum(1 for day in game_days if last_game < dt.date.fromisoformat(day) <= today)
+    
+    def get_schedule(self, days: int = 7, workers: int = SCHEDULE_FETCH_WORKERS) -> List[Dict]:
+        """Get NCAAB schedule for upcoming days.
+        
+        Per-date pages are fetched concurrently on a bounded thread pool;
+        long windows are parsed in a process pool. Games are returned in
+        date order regardless of which fetch finished first.
+        """
         try:
             upcoming_dates = self._get_upcoming_dates(days)
-            games = []
+            if not upcoming_dates:
+                return []
             
-            for target_date in upcoming_dates:
-                url = f"https://www.espn.com/mens-college-basketball/schedule/_/date/{target_date.strftime('%Y%m%d')}"
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                
-                response = requests.get(url, headers=headers)
-                if response.status_code != 200:
-                    continue
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                game_containers = soup.find_all('div', class_=lambda x: x and 'ScheduleTables' in x)
-                
-                for container in game_containers:
-                    try:
-                        teams = container.find_all('a', class_='team-name')
-                        for i in range(0, len(teams), 2):
-                            if i + 1 < len(teams):
-                                away_team = self._clean_team_name(teams[i].text.strip())
-                                home_team = self._clean_team_name(teams[i + 1].text.strip())
-                                
-                                if away_team and home_team:
-                                    game_data = {
-                                        'game_day': target_date.strftime('%Y-%m-%d'),
-                                        'start_time': 'TBD',
-                                        'home_team': home_team,
-                                        'away_team': away_team
-                                    }
-                                    games.append(game_data)
-                    except Exception as e:
-                        logger.debug(f"Error parsing NCAAB game container: {e}")
-                        continue
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(upcoming_dates)))) as executor:
+                pages = list(executor.map(self._fetch_schedule_page, upcoming_dates))
+            
+            fetched = [
+                (html, target_date.strftime('%Y-%m-%d'))
+                for target_date, html in zip(upcoming_dates, pages)
+                if html is not None
+            ]
+            
+            parsed = None
+            if len(fetched) >= SCHEDULE_PROCESS_PARSE_MIN_DAYS and SCHEDULE_PARSE_PROCESSES > 1:
+                try:
+                    parsed = list(get_parse_pool().map(_parse_schedule_page, *zip(*fetched)))
+                except BrokenProcessPool as e:
+                    # A worker died; parse here and start a fresh pool next time
+                    logger.warning(f"NCAAB schedule parse pool failed, parsing in-process: {e}")
+                    shutdown_parse_pool()
+            if parsed is None:
+                parsed = [_parse_schedule_page(html, game_day) for html, game_day in fetched]
+            
+            games = []
+            for day_games in parsed:
+                for game in day_games:
+                    game['home_team'] = self._clean_team_name(game['home_team'])
+                    game['away_team'] = self._clean_team_name(game['away_team'])
+                    if game['home_team'] and game['away_team']:
+                        games.append(game)
             
             return games
             
@@ -57,13 +166,24 @@ class NCAABEvents:
             logger.error(f"Error scraping NCAAB schedule: {e}")
             return []
     
+    def _fetch_schedule_page(self, target_date):
+        """Fetch one day's schedule page; None when unavailable"""
+        url = SCHEDULE_URL.format(date=target_date.strftime('%Y%m%d'))
+        try:
+            response = http_get(url)
+            if response.status_code != 200:
+                return None
+            return response.content
+        except Exception as e:
+            logger.debug(f"Error fetching NCAAB schedule for {target_date}: {e}")
+            return None
+    
     def get_existing_gamelines(self, days: int = 7) -> List[Dict]:
         """Get existing NCAAB gamelines from database"""
         try:
-            conn = sqlite3.connect('ncaab_gamelines.db')
-            cursor = conn.cursor()
+            conn = get_pool('ncaab_gamelines.db').get_connection()
             
-            cursor.execute('''
+            cursor = conn.execute('''
                 SELECT * FROM gamelines 
                 WHERE game_day BETWEEN date('now') AND date('now', ?)
                 ORDER BY game_day, start_time
@@ -71,8 +191,6 @@ class NCAABEvents:
             
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
-            conn.close()
             return results
             
         except Exception as e:
@@ -0,0 +1,71 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Running totals kept per game: (form column, team_games column)
+FORM_STATS = [
+    ('points', 'Tm'),
+    ('points_against', 'Opp'),
+    ('fgm', 'FGM'),
+    ('fga', 'FGA'),
+    ('threepm', 'ThreePM'),
+    ('threepa', 'ThreePA'),
+    ('ftm', 'FTM'),
+    ('fta', 'FTA'),
+    ('rebounds', 'TRB'),
+    ('assists', 'AST'),
+    ('turnovers', 'TOV')
+]
+FORM_COLUMNS = ['wins', 'losses'] + [name for name, _ in FORM_STATS]
+
+# team_games columns the engine reads, in order
+SOURCE_COLUMNS = ['Date', 'Result'] + [column for _, column in FORM_STATS]
+
+def cumulative_rows(games: List[tuple]) -> List[tuple]:
+    """
+    One pass over a season's games (SOURCE_COLUMNS tuples, in date order)
+    -> (game_no, Date, *running totals of FORM_COLUMNS) per game.
+    """
+    if not games:
+        return []
+
+    dates = [game[0] for game in games]
+    results = [str(game[1] or '') for game in games]
+    wins = np.fromiter(('W' in r for r in results), dtype=bool, count=len(results))
+    losses = ~wins & np.fromiter(('L' in r for r in results), dtype=bool, count=len(results))
+
+    # Missing stats count as 0, same as the season summaries
+    stats = np.nan_to_num(np.array([game[2:] for game in games], dtype=float))
+    totals = np.column_stack([wins, losses, stats]).astype(np.int64).cumsum(axis=0)
+
+    return [
+        (game_no, dates[game_no - 1], *map(int, row))
+        for game_no, row in enumerate(totals, start=1)
+    ]
+
+def _per_game(total, games):
+    return round(total / games, 1) if games > 0 else 0
+
+def _pct(made, attempted):
+    return round(made / attempted * 100, 1) if attempted > 0 else 0
+
+def window_form(last: Dict, before: Optional[Dict], num_games: int) -> Dict:
+    """Form over the last ``num_games`` from two running-total rows (last - before)"""
+    t = {column: last[column] - (before[column] if before else 0) for column in FORM_COLUMNS}
+
+    return {
+        'games': num_games,
+        'record': f"{t['wins']}-{t['losses']}",
+        'wins': t['wins'],
+        'losses': t['losses'],
+        'points_per_game': _per_game(t['points'], num_games),
+        'points_against_per_game': _per_game(t['points_against'], num_games),
+        'margin_per_game': _per_game(t['points'] - t['points_against'], num_games),
+        'fg_percentage': _pct(t['fgm'], t['fga']),
+        'three_point_percentage': _pct(t['threepm'], t['threepa']),
+        'free_throw_percentage': _pct(t['ftm'], t['fta']),
+        'rebounds_per_game': _per_game(t['rebounds'], num_games),
+        'assists_per_game': _per_game(t['assists'], num_games),
+        'turnovers_per_game': _per_game(t['turnovers'], num_games),
+        'last_date': last['Date']
+    }
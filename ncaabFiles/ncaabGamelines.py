@@ -1,18 +1,28 @@
 import re
 import json
-import requests
-import pickle
+try:
+    # orjson is optional; consensus payloads fall back to the stdlib encoder
+    import orjson
+except ImportError:
+    orjson = None
 import sys
 import os
 from datetime import timedelta
 import datetime as dt
 from time import sleep
-from pprint import pprint
 import logging
 import sqlite3
+import threading
+import time
+import csv
+import io
+import zlib
+import base64
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-now = dt.datetime.now()
-today = now.date()
+from ncaabDatabase import get_pool, run_migrations
+from ncaabImport import import_gamelines_stream
+from ncaabConsensus import consensus_by_game, game_key
 
 # Add paths
 sys.path.append(os.path.dirname(__file__) + "/api_scrapers/")
@@ -34,10 +44,19 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 # Configuration
-CACHE_FILE = 'ncaab_gamelines_cache.pkl'
+CACHE_KEY = 'all_gamelines'
 CACHE_EXPIRY_MINUTES = 2
+# Stale entries younger than this are served while a refresh runs in the background
+CACHE_STALE_MAX_MINUTES = 30
+# How long a worker may hold the refresh lease before others can take over
+CACHE_REFRESH_LEASE_SECONDS = 120
 REQUEST_DELAY = 1
 DB_FILE = 'ncaab_gamelines.db'
+# Set NCAAB_STARTUP_REFRESH=0 to skip the background refresh after boot
+STARTUP_REFRESH = os.environ.get('NCAAB_STARTUP_REFRESH', '1') != '0'
+STARTUP_REFRESH_DELAY = 1
+# Default per-source deadline for a concurrent refresh, in seconds
+SOURCE_DEADLINE_SECONDS = 15
 
 # Sportsbook configurations with priority order
 SPORTSBOOKS = {
@@ -46,104 +65,680 @@ SPORTSBOOKS = {
         'type': 'web',  # web or api
         'function': get_draftkings_ncaab_gamelines,
         'enabled': True,
-        'priority': 1
+        'priority': 1,
+        'deadline': 20
     },
     'espn_bets': {
         'name': 'ESPN Bets', 
         'type': 'api',
         'function': get_espn_bets_gamelines,
         'enabled': True,
-        'priority': 2
+        'priority': 2,
+        'deadline': 12
     }
 }
 
+# Per-source fetch metrics, updated by fetch_all_sources()
+source_stats = {}
+_source_stats_lock = threading.Lock()
+
+GAMELINES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS gamelines (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT NOT NULL,
+        game_day DATE NOT NULL,
+        start_time TEXT,
+        home_team TEXT NOT NULL,
+        away_team TEXT NOT NULL,
+        home_ml INTEGER,
+        away_ml INTEGER,
+        home_spread REAL,
+        away_spread REAL,
+        home_spread_odds INTEGER,
+        away_spread_odds INTEGER,
+        over_under REAL,
+        over_odds INTEGER,
+        under_odds INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(source, game_day, home_team, away_team)
+    )
+'''
+
+GAMELINE_CACHE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS gameline_cache (
+        cache_key TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        refreshing_until REAL
+    )
+'''
+
+# Bumped in the same transaction as every gameline write; read endpoints
+# derive their ETags from it
+DATA_VERSION_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS data_version (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        updated_at REAL NOT NULL
+    )
+'''
+BUMP_VERSION_SQL = '''
+    INSERT INTO data_version (name, version, updated_at) VALUES (?, 1, ?)
+    ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at
+'''
+SELECT_VERSION_SQL = 'SELECT version, updated_at FROM data_version WHERE name = ?'
+GAMELINES_VERSION_KEY = 'gamelines'
+
+# Price columns hold American odds (integers), line columns points (reals).
+# Scrapers send both as text like "+3.5", "-110" or "N/A".
+ODDS_COLUMNS = ('home_ml', 'away_ml', 'home_spread_odds', 'away_spread_odds', 'over_odds', 'under_odds')
+LINE_COLUMNS = ('home_spread', 'away_spread', 'over_under')
+ODDS_ALIASES = {'EVEN': 100, 'EV': 100}
+LINE_ALIASES = {'PK': 0.0, 'PICK': 0.0, "PICK'EM": 0.0}
+NUMBER_PATTERN = re.compile(r'([+-]*)\s*(\d+(?:\.\d*)?|\.\d+)')
+
+# Applied in order by ncaabDatabase.run_migrations, tracked in PRAGMA user_version
+GAMELINE_INDEXES = [
+    # Serves the ORDER BY of every full read without a sort
+    'CREATE INDEX IF NOT EXISTS idx_gamelines_day_time ON gamelines(game_day, start_time)',
+    'CREATE INDEX IF NOT EXISTS idx_gamelines_home_team ON gamelines(home_team)',
+    'CREATE INDEX IF NOT EXISTS idx_gamelines_away_team ON gamelines(away_team)',
+    # The UNIQUE index already leads with (source, game_day); adding
+    # start_time lets per-source reads skip the sort as well
+    'CREATE INDEX IF NOT EXISTS idx_gamelines_source_day_time ON gamelines(source, game_day, start_time)'
+]
+SELECT_TEXT_NUMBERS_SQL = f'''
+    SELECT id, {', '.join(ODDS_COLUMNS + LINE_COLUMNS)} FROM gamelines
+    WHERE {' OR '.join(f"typeof({column}) = 'text'" for column in ODDS_COLUMNS + LINE_COLUMNS)}
+'''
+UPDATE_NUMBERS_SQL = f'''
+    UPDATE gamelines SET {', '.join(f'{column} = ?' for column in ODDS_COLUMNS + LINE_COLUMNS)}
+    WHERE id = ?
+'''
+
+def _to_number(value, aliases):
+    """Parse "+3.5", "-110", "--3.5" (a negated -3.5) etc.; None when it isn't a number"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value if value == value else None
+    if not isinstance(value, str):
+        return value
+    
+    text = value.strip().upper()
+    if text in aliases:
+        return aliases[text]
+    match = NUMBER_PATTERN.fullmatch(text)
+    if not match:
+        return None
+    number = float(match.group(2))
+    return -number if match.group(1).count('-') % 2 else number
+
+def odds_value(value):
+    """American odds as an int ("-110" -> -110, "EVEN" -> 100)"""
+    number = _to_number(value, ODDS_ALIASES)
+    if isinstance(number, float) and number.is_integer():
+        return int(number)
+    return number
+
+def line_value(value):
+    """Spread or total as a float ("+3.5" -> 3.5, "PK" -> 0.0)"""
+    number = _to_number(value, LINE_ALIASES)
+    return float(number) if isinstance(number, int) else number
+
+def _normalize_stored_numbers(conn):
+    """Rewrite odds and lines stored as text to numbers"""
+    rows = conn.execute(SELECT_TEXT_NUMBERS_SQL).fetchall()
+    conn.executemany(UPDATE_NUMBERS_SQL, [
+        tuple(odds_value(value) for value in row[1:1 + len(ODDS_COLUMNS)])
+        + tuple(line_value(value) for value in row[1 + len(ODDS_COLUMNS):])
+        + (row[0],)
+        for row in rows
+    ])
+    if rows:
+        conn.execute(BUMP_VERSION_SQL, (GAMELINES_VERSION_KEY, time.time()))
+    logger.info(f"Normalized odds and lines on {len(rows)} NCAAB gamelines")
+
+# Line movement. Each snapshot stores only the market columns that changed
+# since the game's previous snapshot (its bit in ``changed`` is set; other
+# columns are NULL). Rows are clustered by game then capture time, so a
+# game's series is one range scan and old days prune as a key-range delete.
+MARKET_COLUMNS = ('home_ml', 'away_ml', 'home_spread', 'away_spread', 'home_spread_odds',
+                  'away_spread_odds', 'over_under', 'over_odds', 'under_odds')
+ALL_MARKETS_CHANGED = (1 << len(MARKET_COLUMNS)) - 1
+SNAPSHOT_RETENTION_DAYS = 180
+GAMELINE_SNAPSHOTS_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS gameline_snapshots (
+        game_day TEXT NOT NULL,
+        home_team TEXT NOT NULL,
+        away_team TEXT NOT NULL,
+        source TEXT NOT NULL,
+        captured_at INTEGER NOT NULL,
+        changed INTEGER NOT NULL,
+        {', '.join(f"{column} {'INTEGER' if column in ODDS_COLUMNS else 'REAL'}" for column in MARKET_COLUMNS)},
+        PRIMARY KEY (game_day, home_team, away_team, source, captured_at)
+    ) WITHOUT ROWID
+'''
+# The current rows become each game's base snapshot
+SEED_SNAPSHOTS_SQL = f'''
+    INSERT OR IGNORE INTO gameline_snapshots
+    (game_day, home_team, away_team, source, captured_at, changed, {', '.join(MARKET_COLUMNS)})
+    SELECT game_day, home_team, away_team, source,
+           CAST(IFNULL(strftime('%s', updated_at), strftime('%s', 'now')) AS INTEGER) * 1000,
+           {ALL_MARKETS_CHANGED}, {', '.join(MARKET_COLUMNS)}
+    FROM gamelines
+'''
+SELECT_MARKETS_SQL = f'''
+    SELECT start_time, {', '.join(MARKET_COLUMNS)} FROM gamelines
+    WHERE source = ? AND game_day = ? AND home_team = ? AND away_team = ?
+'''
+# Two snapshots of a game in the same millisecond merge into one
+INSERT_SNAPSHOT_SQL = f'''
+    INSERT INTO gameline_snapshots
+    (game_day, home_team, away_team, source, captured_at, changed, {', '.join(MARKET_COLUMNS)})
+    VALUES ({', '.join('?' * (len(MARKET_COLUMNS) + 6))})
+    ON CONFLICT(game_day, home_team, away_team, source, captured_at) DO UPDATE SET
+        changed = changed | excluded.changed,
+        {', '.join(
+            f'{column} = CASE WHEN excluded.changed & {1 << i} THEN excluded.{column} ELSE {column} END'
+            for i, column in enumerate(MARKET_COLUMNS)
+        )}
+'''
+SELECT_MOVEMENT_SQL = f'''
+    SELECT source, captured_at, changed, {', '.join(MARKET_COLUMNS)} FROM gameline_snapshots
+    WHERE game_day = ? AND home_team = ? AND away_team = ?{{source_filter}}
+    ORDER BY source, captured_at
+'''
+DELETE_OLD_SNAPSHOTS_SQL = 'DELETE FROM gameline_snapshots WHERE game_day < ?'
+
+# Cross-source consensus, one row per canonical game (ncaabConsensus.game_key),
+# rewritten in the write transaction for just the games whose lines moved
+# (bulk imports queue the games instead, see refresh_pending_consensus)
+GAMELINE_CONSENSUS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS gameline_consensus (
+        game_day TEXT NOT NULL,
+        home_key TEXT NOT NULL,
+        away_key TEXT NOT NULL,
+        start_time TEXT,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (game_day, home_key, away_key)
+    ) WITHOUT ROWID
+'''
+SELECT_DAY_MARKETS_SQL = f'''
+    SELECT source, game_day, start_time, home_team, away_team, {', '.join(MARKET_COLUMNS)}
+    FROM gamelines WHERE game_day = ?
+'''
+# Lines of one game, found through idx_gamelines_game_key. The key expressions
+# mirror game_key(): SQLite's lower() and this trim set match Python's
+# lower()/strip() on ASCII names. Rows with non-ASCII names can differ, so the
+# second query returns all of a day's such rows for game_key() to check.
+_TEAM_KEY_SQL = 'lower(trim({column}, char(32, 9, 10, 11, 12, 13, 28, 29, 30, 31)))'
+_NON_ASCII_NAMES_SQL = ('length(CAST(home_team AS BLOB)) > length(home_team) '
+                        'OR length(CAST(away_team AS BLOB)) > length(away_team)')
+SELECT_GAME_MARKETS_SQL = f'''
+    SELECT source, game_day, start_time, home_team, away_team, {', '.join(MARKET_COLUMNS)}
+    FROM gamelines
+    WHERE game_day = ? AND {_TEAM_KEY_SQL.format(column='home_team')} = ? AND {_TEAM_KEY_SQL.format(column='away_team')} = ?
+'''
+SELECT_NON_ASCII_MARKETS_SQL = f'''
+    SELECT source, game_day, start_time, home_team, away_team, {', '.join(MARKET_COLUMNS)}
+    FROM gamelines WHERE game_day = ? AND ({_NON_ASCII_NAMES_SQL})
+'''
+GAME_KEY_INDEXES = [
+    f'''CREATE INDEX IF NOT EXISTS idx_gamelines_game_key ON gamelines(
+        game_day, {_TEAM_KEY_SQL.format(column='home_team')}, {_TEAM_KEY_SQL.format(column='away_team')}
+    )''',
+    f'CREATE INDEX IF NOT EXISTS idx_gamelines_non_ascii ON gamelines(game_day) WHERE {_NON_ASCII_NAMES_SQL}'
+]
+SELECT_MARKET_DAYS_SQL = 'SELECT DISTINCT game_day FROM gamelines'
+UPSERT_CONSENSUS_SQL = '''
+    INSERT OR REPLACE INTO gameline_consensus (game_day, home_key, away_key, start_time, payload)
+    VALUES (?, ?, ?, ?, ?)
+'''
+DELETE_CONSENSUS_SQL = 'DELETE FROM gameline_consensus WHERE game_day = ? AND home_key = ? AND away_key = ?'
+# Games whose consensus a bulk import deferred; drained by refresh_pending_consensus()
+# at the end of the import and by the scheduler
+GAMELINE_CONSENSUS_PENDING_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS gameline_consensus_pending (
+        game_day TEXT NOT NULL,
+        home_key TEXT NOT NULL,
+        away_key TEXT NOT NULL,
+        PRIMARY KEY (game_day, home_key, away_key)
+    ) WITHOUT ROWID
+'''
+QUEUE_CONSENSUS_SQL = 'INSERT OR IGNORE INTO gameline_consensus_pending (game_day, home_key, away_key) VALUES (?, ?, ?)'
+SELECT_PENDING_CONSENSUS_SQL = 'SELECT game_day, home_key, away_key FROM gameline_consensus_pending'
+HAS_PENDING_CONSENSUS_SQL = 'SELECT 1 FROM gameline_consensus_pending LIMIT 1'
+CLEAR_PENDING_CONSENSUS_SQL = 'DELETE FROM gameline_consensus_pending'
+SELECT_CONSENSUS_SQL = 'SELECT payload FROM gameline_consensus{where} ORDER BY game_day, IFNULL(start_time, \'\'), home_key'
+
+def _source_priority(source):
+    return SPORTSBOOKS.get(source, {}).get('priority', len(SPORTSBOOKS) + 1)
+
+def _consensus_payload(game):
+    if orjson is not None:
+        return orjson.dumps(game).decode('utf-8')
+    return json.dumps(game, separators=(',', ':'))
+
+def _refresh_consensus_day(conn, game_day, keys=None, computed_at=None):
+    """
+    Recompute the consensus of one day's games, or of just ``keys`` on it,
+    from their stored lines. Returns the number of games written.
+    """
+    columns = ['source', 'game_day', 'start_time', 'home_team', 'away_team'] + list(MARKET_COLUMNS)
+    computed_at = computed_at or dt.datetime.now().isoformat(timespec='seconds')
+    if keys is None:
+        rows = [dict(zip(columns, row)) for row in conn.execute(SELECT_DAY_MARKETS_SQL, (game_day,))]
+    else:
+        # Only rows of affected games; the rest of the day is unchanged
+        found = []
+        for key in keys:
+            found.extend(conn.execute(SELECT_GAME_MARKETS_SQL, key).fetchall())
+        found.extend(conn.execute(SELECT_NON_ASCII_MARKETS_SQL, (game_day,)).fetchall())
+        rows = [
+            row for row in (dict(zip(columns, values)) for values in set(found))
+            if game_key(row['game_day'], row['home_team'], row['away_team']) in keys
+        ]
+    consensus = consensus_by_game(rows, _source_priority)
+    
+    upserts = []
+    for key, game in consensus.items():
+        game['updated_at'] = computed_at
+        upserts.append(key + (game['start_time'], _consensus_payload(game)))
+    conn.executemany(UPSERT_CONSENSUS_SQL, upserts)
+    if keys is not None:
+        conn.executemany(DELETE_CONSENSUS_SQL, [key for key in keys if key not in consensus])
+    return len(upserts)
+
+def _refresh_consensus(conn, games):
+    """
+    Recompute the consensus of ``games`` (canonical game keys) from their
+    stored lines; call inside the write's transaction. Only the affected
+    games' rows are read, through idx_gamelines_game_key.
+    """
+    by_day = {}
+    for key in games:
+        by_day.setdefault(key[0], set()).add(key)
+    
+    computed_at = dt.datetime.now().isoformat(timespec='seconds')
+    return sum(_refresh_consensus_day(conn, game_day, keys, computed_at) for game_day, keys in by_day.items())
+
+def _defer_consensus(conn, games):
+    """Queue ``games`` for refresh_pending_consensus(); call inside the write's transaction"""
+    conn.executemany(QUEUE_CONSENSUS_SQL, games)
+
+def _rebuild_consensus(conn):
+    """Compute the consensus of every stored game"""
+    conn.execute(GAMELINE_CONSENSUS_SCHEMA)
+    conn.execute('DELETE FROM gameline_consensus')
+    computed_at = dt.datetime.now().isoformat(timespec='seconds')
+    count = sum(
+        _refresh_consensus_day(conn, game_day, computed_at=computed_at)
+        for (game_day,) in conn.execute(SELECT_MARKET_DAYS_SQL).fetchall()
+    )
+    logger.info(f"Built NCAAB consensus for {count} games")
+
+GAMELINE_MIGRATIONS = [
+    (1, 'index gamelines by date, team and source', GAMELINE_INDEXES),
+    (2, 'store odds and lines as numbers', _normalize_stored_numbers),
+    (3, 'index the query keyset order', [
+        "CREATE INDEX IF NOT EXISTS idx_gamelines_keyset ON gamelines(game_day, IFNULL(start_time, ''), id)"
+    ]),
+    (4, 'record line movement snapshots', [GAMELINE_SNAPSHOTS_SCHEMA, SEED_SNAPSHOTS_SQL]),
+    (5, 'maintain cross-source consensus', _rebuild_consensus),
+    (6, 'queue consensus refreshes deferred by bulk imports', [GAMELINE_CONSENSUS_PENDING_SCHEMA]),
+    (7, 'add the primary source line to consensus', _rebuild_consensus),
+    (8, 'index gamelines by canonical game key', GAME_KEY_INDEXES)
+]
+
+# Statement text is kept constant so the per-connection statement cache reuses it.
+# Only new games are inserted; the write lock is held from the comparison with
+# the stored rows, so they can't conflict. Stored games whose values differ are
+# updated in place, so they keep their id and created_at, an unchanged slate
+# writes nothing and no AUTOINCREMENT ids are spent on existing rows.
+UPDATED_GAMELINE_COLUMNS = ('start_time',) + MARKET_COLUMNS
+INSERT_GAMELINE_SQL = '''
+    INSERT INTO gamelines 
+    (source, game_day, start_time, home_team, away_team, home_ml, away_ml, 
+    home_spread, away_spread, home_spread_odds, away_spread_odds, 
+    over_under, over_odds, under_odds, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+'''
+UPDATE_GAMELINE_SQL = f'''
+    UPDATE gamelines SET
+        {', '.join(f'{column} = ?' for column in UPDATED_GAMELINE_COLUMNS)},
+        updated_at = CURRENT_TIMESTAMP
+    WHERE source = ? AND game_day = ? AND home_team = ? AND away_team = ?
+'''
+SELECT_GAMELINES_SQL = 'SELECT * FROM gamelines ORDER BY game_day, start_time'
+SELECT_GAMELINES_BY_SOURCE_SQL = 'SELECT * FROM gamelines WHERE source = ? ORDER BY game_day, start_time'
+# Same rows as SELECT_GAMELINES_SQL, rendered to JSON text by SQLite
+SELECT_GAMELINES_JSON_SQL = 'SELECT {fields} FROM gamelines{where} ORDER BY game_day, start_time'
+SELECT_SOURCES_SQL = 'SELECT DISTINCT source FROM gamelines ORDER BY source'
+SELECT_EXPORT_SQL = 'SELECT {fields} FROM gamelines{where} ORDER BY game_day, start_time, id'
+
+# Streaming export
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+# Query API. Pages follow the keyset (game_day, IFNULL(start_time, ''), id):
+# NULL start times compare as '' so the cursor works as a row value.
+QUERY_DEFAULT_LIMIT = 100
+QUERY_MAX_LIMIT = 1000
+SELECT_QUERY_SQL = '''
+    SELECT {fields}, game_day, IFNULL(start_time, ''), id FROM gamelines
+    WHERE {where}
+    ORDER BY game_day, IFNULL(start_time, ''), id
+    LIMIT ?
+'''
+KEYSET_AFTER_SQL = "(game_day, IFNULL(start_time, ''), id) > (?, ?, ?)"
+HAS_ODDS_SQL = '(' + ' OR '.join(f'{column} IS NOT NULL' for column in ODDS_COLUMNS + LINE_COLUMNS) + ')'
+EXPIRED_WHERE_SQL = '''
+    WHERE (game_day < ?) 
+       OR (game_day = ? AND start_time IS NOT NULL AND start_time < ?)
+       OR (game_day = ? AND start_time IS NULL)
+'''
+SELECT_EXPIRED_GAMES_SQL = 'SELECT DISTINCT game_day, home_team, away_team FROM gamelines' + EXPIRED_WHERE_SQL
+DELETE_EXPIRED_SQL = 'DELETE FROM gamelines' + EXPIRED_WHERE_SQL
+
 class GamelineManager:
+    # Database files whose schema has already been initialized in this process
+    _initialized = set()
+    _init_lock = threading.Lock()
+
     def __init__(self, db_file=DB_FILE):
         self.db_file = db_file
+        self.pool = get_pool(db_file)
+        self._column_names = None
+        self._has_json = None
         self.init_database()
     
     def init_database(self):
-        """Initialize SQLite database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        """Initialize SQLite database (once per process per file)"""
+        key = os.path.abspath(self.db_file)
+        with self._init_lock:
+            if key in self._initialized:
+                return
+            
+            conn = self.pool.get_connection()
+            with conn:
+                conn.execute(GAMELINES_SCHEMA)
+                conn.execute(GAMELINE_CACHE_SCHEMA)
+                conn.execute(DATA_VERSION_SCHEMA)
+            run_migrations(conn, GAMELINE_MIGRATIONS, self.db_file)
+            
+            self._initialized.add(key)
+        logger.info("NCAAB database initialized")
+    
+    @staticmethod
+    def _bump_version(conn):
+        """Record a change to gamelines; call inside the write's transaction"""
+        conn.execute(BUMP_VERSION_SQL, (GAMELINES_VERSION_KEY, time.time()))
+    
+    def data_version(self):
+        """(version, updated_at) of the gamelines table; (0, None) before the first write"""
+        conn = self.pool.get_connection()
+        row = conn.execute(SELECT_VERSION_SQL, (GAMELINES_VERSION_KEY,)).fetchone()
+        return tuple(row) if row else (0, None)
+    
+    @staticmethod
+    def _gameline_params(source, game_data):
+        """Build the INSERT parameter tuple for one game, validating required fields"""
+        home = game_data.get('home') or game_data.get('home_team')
+        away = game_data.get('away') or game_data.get('away_team')
+        source = source or game_data.get('source')
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gamelines (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                source TEXT NOT NULL,
-                game_day DATE NOT NULL,
-                start_time TEXT,
-                home_team TEXT NOT NULL,
-                away_team TEXT NOT NULL,
-                home_ml INTEGER,
-                away_ml INTEGER,
-                home_spread REAL,
-                away_spread REAL,
-                home_spread_odds INTEGER,
-                away_spread_odds INTEGER,
-                over_under REAL,
-                over_odds INTEGER,
-                under_odds INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(source, game_day, home_team, away_team)
-            )
-        ''')
+        if not source:
+            raise ValueError("Missing source")
+        if not home or not away:
+            raise ValueError("Missing home or away team")
         
-        conn.commit()
-        conn.close()
-        logger.info("NCAAB database initialized")
+        params = (
+            source,
+            game_data.get('game_day') or str(dt.date.today()),
+            game_data.get('start_time'),
+            home,
+            away,
+            odds_value(game_data.get('home_ml')),
+            odds_value(game_data.get('away_ml')),
+            line_value(game_data.get('home_spread')),
+            line_value(game_data.get('away_spread')),
+            odds_value(game_data.get('home_spread_odds')),
+            odds_value(game_data.get('away_spread_odds')),
+            # The ESPN scraper names the total 'total'
+            line_value(game_data.get('over_under', game_data.get('total'))),
+            odds_value(game_data.get('over_odds')),
+            odds_value(game_data.get('under_odds'))
+        )
+        
+        for value in params:
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(f"Unsupported value {value!r}")
+        
+        return params
+    
+    @staticmethod
+    def _record_snapshots(conn, rows):
+        """
+        Compare ``rows`` (INSERT parameter tuples, one per game) with the stored gamelines and
+        append a movement snapshot for every game whose prices or lines moved.
+        Call inside the write's transaction, before writing. Returns the rows
+        of new games, the rows of stored games whose values differ, the number
+        of snapshots and the canonical keys of games whose markets or start
+        time moved.
+        """
+        captured_at = int(time.time() * 1000)
+        
+        snapshots = []
+        new_rows = []
+        changed_rows = []
+        changed_games = set()
+        for params in rows:
+            source, game_day, home, away = params[0], params[1], params[3], params[4]
+            values = params[5:14]
+            previous = conn.execute(SELECT_MARKETS_SQL, (source, game_day, home, away)).fetchone()
+            if previous is None:
+                changed = ALL_MARKETS_CHANGED
+                new_rows.append(params)
+            else:
+                changed = sum(1 << i for i, (old, new) in enumerate(zip(previous[1:], values)) if old != new)
+                # Consensus also shows the start time, which snapshots don't track
+                if not changed and previous[0] == params[2]:
+                    continue
+                changed_rows.append(params)
+            changed_games.add(game_key(game_day, home, away))
+            if changed:
+                snapshots.append((game_day, home, away, source, captured_at, changed) + tuple(
+                    value if changed >> i & 1 else None for i, value in enumerate(values)
+                ))
+        
+        conn.executemany(INSERT_SNAPSHOT_SQL, snapshots)
+        return {
+            'new_rows': new_rows,
+            'changed_rows': changed_rows,
+            'snapshots': len(snapshots),
+            'changed_games': changed_games
+        }
+    
+    def _write_gamelines(self, conn, rows, defer_consensus=False):
+        """
+        Snapshot and write ``rows`` (INSERT parameter tuples) in one transaction,
+        touching only new games and games whose values differ. Returns the
+        number of rows inserted and changed.
+        """
+        with conn:
+            # Hold the write lock from the comparison with the stored rows to the write
+            conn.execute('BEGIN IMMEDIATE')
+            snapshot = self._record_snapshots(conn, rows)
+            new_rows, changed_rows = snapshot['new_rows'], snapshot['changed_rows']
+            # Only new games take an AUTOINCREMENT id; stored ones are updated in place
+            conn.executemany(INSERT_GAMELINE_SQL, new_rows)
+            conn.executemany(UPDATE_GAMELINE_SQL, [
+                params[2:3] + params[5:] + params[0:2] + params[3:5] for params in changed_rows
+            ])
+            if new_rows or changed_rows:
+                if defer_consensus:
+                    _defer_consensus(conn, snapshot['changed_games'])
+                else:
+                    _refresh_consensus(conn, snapshot['changed_games'])
+                self._bump_version(conn)
+        return len(new_rows), len(changed_rows)
+    
+    def line_movement(self, game_day, home_team, away_team, source=None):
+        """
+        Price and line history of one game per source, oldest first. Each point
+        is the full market state after that snapshot plus the fields it changed.
+        """
+        conn = self.pool.get_connection()
+        params = [str(game_day), home_team, away_team]
+        source_filter = ''
+        if source:
+            source_filter = ' AND source = ?'
+            params.append(source)
+        
+        sources = {}
+        state = {}
+        for row in conn.execute(SELECT_MOVEMENT_SQL.format(source_filter=source_filter), params):
+            row_source, captured_at, changed = row[:3]
+            current = state.setdefault(row_source, dict.fromkeys(MARKET_COLUMNS))
+            changed_columns = []
+            for i, column in enumerate(MARKET_COLUMNS):
+                if changed >> i & 1:
+                    current[column] = row[3 + i]
+                    changed_columns.append(column)
+            sources.setdefault(row_source, []).append({
+                'captured_at': dt.datetime.fromtimestamp(captured_at / 1000).isoformat(timespec='milliseconds'),
+                'changed': changed_columns,
+                **current
+            })
+        
+        return {
+            'game_day': str(game_day),
+            'home_team': home_team,
+            'away_team': away_team,
+            'snapshots': sum(len(points) for points in sources.values()),
+            'sources': sources
+        }
+    
+    def refresh_pending_consensus(self):
+        """Recompute the consensus of games queued by deferred writes; returns how many were queued"""
+        conn = self.pool.get_connection()
+        if conn.execute(HAS_PENDING_CONSENSUS_SQL).fetchone() is None:
+            return 0
+        
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            games = [tuple(row) for row in conn.execute(SELECT_PENDING_CONSENSUS_SQL)]
+            _refresh_consensus(conn, games)
+            conn.execute(CLEAR_PENDING_CONSENSUS_SQL)
+        logger.info(f"Refreshed deferred NCAAB consensus for {len(games)} games")
+        return len(games)
+    
+    def read_consensus_json(self, start=None, end=None, team=None):
+        """
+        Consensus payloads (JSON text) for the stored games, in game order.
+        Read-only: games queued by a running import keep their previous
+        consensus until the queue is drained.
+        """
+        clauses = []
+        params = []
+        if start:
+            clauses.append('game_day >= ?')
+            params.append(str(start))
+        if end:
+            clauses.append('game_day <= ?')
+            params.append(str(end))
+        if team:
+            clauses.append('(home_key = ? OR away_key = ?)')
+            params.extend([team.strip().lower()] * 2)
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        
+        conn = self.pool.get_connection()
+        return [row[0] for row in conn.execute(SELECT_CONSENSUS_SQL.format(where=where), params)]
     
     def update_gameline(self, source, game_data):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        """Upsert one gameline; returns 'inserted', 'changed' or 'unchanged'"""
+        conn = self.pool.get_connection()
         
         try:
-            logger.info(f"Updating gameline: {source} - {game_data['home']} vs {game_data['away']}")
+            params = self._gameline_params(source, game_data)
+            logger.debug(f"Updating gameline: {source} - {params[3]} vs {params[4]}")
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO gamelines 
-                (source, game_day, start_time, home_team, away_team, home_ml, away_ml, 
-                home_spread, away_spread, home_spread_odds, away_spread_odds, 
-                over_under, over_odds, under_odds, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                source,
-                game_data.get('game_day', str(today)),
-                game_data.get('start_time'),
-                game_data['home'],
-                game_data['away'],
-                game_data.get('home_ml'),
-                game_data.get('away_ml'),
-                game_data.get('home_spread'),
-                game_data.get('away_spread'),
-                game_data.get('home_spread_odds'),
-                game_data.get('away_spread_odds'),
-                game_data.get('over_under'),
-                game_data.get('over_odds'),
-                game_data.get('under_odds')
-            ))
+            inserted, changed = self._write_gamelines(conn, [params])
             
-            conn.commit()
-            logger.info(f"✓ Successfully updated NCAAB gameline for {game_data['home']} vs {game_data['away']} from {source}")
+            if inserted:
+                outcome = 'inserted'
+            else:
+                outcome = 'changed' if changed else 'unchanged'
+            logger.info(f"✓ NCAAB gameline for {params[3]} vs {params[4]} from {source}: {outcome}")
+            return outcome
             
         except Exception as e:
             logger.error(f"✗ Error updating NCAAB gameline: {e}")
             logger.error(f"Game data: {game_data}")
             raise
-        finally:
-            conn.close()
+    
+    def upsert_many(self, source, games, defer_consensus=False):
+        """Write a whole slate of gamelines in a single transaction.
+        
+        ``source`` applies to every row; pass None to use each row's own
+        ``source`` key. Rows that fail validation are reported in ``errors``
+        (by their index in ``games``) without aborting the rest of the batch.
+        ``written`` counts the valid rows. A game repeated in the batch is
+        written once, at its last values, and its earlier rows are counted as
+        ``duplicates``; ``inserted``, ``changed`` and ``unchanged`` split the
+        distinct games by how they compare with the stored rows.
+        With ``defer_consensus`` the touched games are queued and their
+        consensus is recomputed by refresh_pending_consensus() instead.
+        """
+        latest = {}
+        errors = []
+        written = inserted = changed = 0
+        
+        for i, game_data in enumerate(games):
+            try:
+                params = self._gameline_params(source, game_data)
+            except Exception as e:
+                errors.append({'index': i, 'error': str(e)})
+                continue
+            written += 1
+            latest[(params[0], params[1], params[3], params[4])] = params
+        
+        rows = list(latest.values())
+        if rows:
+            conn = self.pool.get_connection()
+            try:
+                inserted, changed = self._write_gamelines(conn, rows, defer_consensus)
+            except Exception as e:
+                logger.error(f"✗ Error upserting NCAAB gameline batch from {source or 'mixed sources'}: {e}")
+                raise
+        
+        unchanged = len(rows) - inserted - changed
+        duplicates = written - len(rows)
+        logger.info(
+            f"Upserted {written} NCAAB gamelines from {source or 'mixed sources'}: "
+            f"{inserted} inserted, {changed} changed, {unchanged} unchanged, {duplicates} duplicates "
+            f"({len(errors)} rejected)"
+        )
+        return {
+            'written': written,
+            'inserted': inserted,
+            'changed': changed,
+            'unchanged': unchanged,
+            'duplicates': duplicates,
+            'errors': errors
+        }
     
     def read_gamelines(self, source=None):
         """Read gamelines from database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        conn = self.pool.get_connection()
         
         try:
             if source:
-                cursor.execute('SELECT * FROM gamelines WHERE source = ? ORDER BY game_day, start_time', (source,))
+                cursor = conn.execute(SELECT_GAMELINES_BY_SOURCE_SQL, (source,))
             else:
-                cursor.execute('SELECT * FROM gamelines ORDER BY game_day, start_time')
+                cursor = conn.execute(SELECT_GAMELINES_SQL)
             
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -152,34 +747,233 @@ class GamelineManager:
         except Exception as e:
             logger.error(f"Error reading NCAAB gamelines: {e}")
             return []
+            
+    def _columns(self):
+        """Column names of the gamelines table, in table order"""
+        if self._column_names is None:
+            conn = self.pool.get_connection()
+            self._column_names = [row[1] for row in conn.execute('PRAGMA table_info(gamelines)').fetchall()]
+        return self._column_names
+    
+    def _json_supported(self):
+        """Whether this SQLite build has json_object()"""
+        if self._has_json is None:
+            try:
+                self.pool.get_connection().execute("SELECT json_object('a', 1)").fetchone()
+                self._has_json = True
+            except sqlite3.OperationalError:
+                self._has_json = False
+        return self._has_json
+    
+    def _json_fields(self):
+        return 'json_object(' + ', '.join(f"'{column}', {column}" for column in self._columns()) + ')'
+    
+    def read_gamelines_json(self, source=None):
+        """
+        read_gamelines() as a list of JSON object strings rendered by SQLite's
+        json_object(), so large reads never build a dict per row. Floats are
+        rendered with SQLite's 15 significant digits.
+        """
+        if not self._json_supported():
+            return [json.dumps(row, default=str) for row in self.read_gamelines(source)]
+        
+        conn = self.pool.get_connection()
+        
+        try:
+            where = ' WHERE source = ?' if source else ''
+            sql = SELECT_GAMELINES_JSON_SQL.format(fields=self._json_fields(), where=where)
+            cursor = conn.execute(sql, (source,) if source else ())
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error reading NCAAB gamelines: {e}")
+            return []
+    
+    def iter_gameline_batches(self, fields, source=None, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Yield lists of ``fields`` rows for the filtered gamelines, ``batch_size``
+        at a time. Uses its own connection: a StreamingResponse advances the
+        generator from different threadpool threads.
+        """
+        clauses = []
+        params = []
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if start:
+            clauses.append('game_day >= ?')
+            params.append(str(start))
+        if end:
+            clauses.append('game_day <= ?')
+            params.append(str(end))
+        where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        
+        conn = self.pool.connect()
+        try:
+            cursor = conn.execute(SELECT_EXPORT_SQL.format(fields=fields, where=where), params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
         finally:
             conn.close()
-            
-    def delete_gamelines(self, source=None):
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
     
+    def _ndjson_chunks(self, **filters):
+        if self._json_supported():
+            for rows in self.iter_gameline_batches(self._json_fields(), **filters):
+                yield ('\n'.join(row[0] for row in rows) + '\n').encode('utf-8')
+            return
+        
+        columns = self._columns()
+        for rows in self.iter_gameline_batches(', '.join(columns), **filters):
+            lines = (json.dumps(dict(zip(columns, row)), default=str) for row in rows)
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+    
+    def _csv_chunks(self, **filters):
+        columns = self._columns()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        
+        for rows in self.iter_gameline_batches(', '.join(columns), **filters):
+            writer.writerows(rows)
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        
+        if buffer.tell():
+            # Header only: no rows matched
+            yield buffer.getvalue().encode('utf-8')
+    
+    def stream_export(self, fmt='ndjson', source=None, start=None, end=None, compress=False):
+        """
+        Yield the filtered gamelines as NDJSON or CSV byte chunks (gzip'd
+        when ``compress``), holding one batch in memory at a time.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format {fmt!r}")
+        
+        filters = {'source': source, 'start': start, 'end': end}
+        chunks = self._ndjson_chunks(**filters) if fmt == 'ndjson' else self._csv_chunks(**filters)
+        if not compress:
+            yield from chunks
+            return
+        
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    
+    @staticmethod
+    def encode_cursor(game_day, start_key, row_id):
+        """Opaque cursor for the page after the row with this keyset"""
+        raw = json.dumps([game_day, start_key, row_id], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def decode_cursor(cursor):
         try:
-            # More efficient single query approach
-            query = '''
-                DELETE FROM gamelines 
-                WHERE (game_day < ?) 
-                   OR (game_day = ? AND start_time IS NOT NULL AND start_time < ?)
-                   OR (game_day = ? AND start_time IS NULL)
-            '''
-            
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            game_day, start_key, row_id = json.loads(raw)
+            if not isinstance(game_day, str) or not isinstance(start_key, str) or not isinstance(row_id, int):
+                raise ValueError
+            return game_day, start_key, row_id
+        except Exception:
+            raise ValueError("Invalid cursor")
+    
+    def query(self, start=None, end=None, team=None, source=None, has_odds=None, fields=None,
+              limit=QUERY_DEFAULT_LIMIT, cursor=None):
+        """
+        One page of gamelines matching the filters, in game order.
+        
+        ``team`` matches either side; ``has_odds`` keeps rows with (True) or
+        without (False) any price or line. ``fields`` projects the returned
+        columns. Pass the returned ``next_cursor`` back to get the following
+        page; it is None on the last one. Raises ValueError for bad arguments.
+        """
+        columns = self._columns()
+        fields = list(fields) if fields else columns
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if not 1 <= limit <= QUERY_MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {QUERY_MAX_LIMIT}")
+        
+        clauses = []
+        params = []
+        if start:
+            clauses.append('game_day >= ?')
+            params.append(str(start))
+        if end:
+            clauses.append('game_day <= ?')
+            params.append(str(end))
+        if team:
+            clauses.append('(home_team = ? OR away_team = ?)')
+            params.extend([team, team])
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        if has_odds is not None:
+            clauses.append(HAS_ODDS_SQL if has_odds else f'NOT {HAS_ODDS_SQL}')
+        if cursor:
+            clauses.append(KEYSET_AFTER_SQL)
+            params.extend(self.decode_cursor(cursor))
+        
+        sql = SELECT_QUERY_SQL.format(fields=', '.join(fields), where=' AND '.join(clauses) or '1')
+        conn = self.pool.get_connection()
+        # One extra row tells us whether another page exists
+        rows = conn.execute(sql, params + [limit + 1]).fetchall()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(*rows[-1][-3:])
+        
+        width = len(fields)
+        return {
+            'gamelines': [dict(zip(fields, row[:width])) for row in rows],
+            'count': len(rows),
+            'next_cursor': next_cursor
+        }
+    
+    def read_sources(self):
+        """Distinct sources present in the gamelines table"""
+        conn = self.pool.get_connection()
+        return [row[0] for row in conn.execute(SELECT_SOURCES_SQL).fetchall()]
+    
+    def delete_gamelines(self, source=None, now=None):
+        """Delete gamelines whose start has passed, as of ``now`` (default: the current time)"""
+        conn = self.pool.get_connection()
+    
+        try:
+            now = now or dt.datetime.now()
+            today = str(now.date())
             # Format current time for comparison
             current_time_str = now.strftime('%H:%M:%S')
             
-            cursor.execute(query, (
+            expired = (
                 today,           # game_day < today
                 today,           # game_day = today AND start_time < now
                 current_time_str,
                 today            # game_day = today AND start_time IS NULL (assume past)
-            ))
+            )
             
-            deleted_count = cursor.rowcount
-            conn.commit()
+            with conn:
+                # Sources start at different times, so a game can lose only some of its rows
+                expired_games = {game_key(*row) for row in conn.execute(SELECT_EXPIRED_GAMES_SQL, expired)}
+                deleted_count = conn.execute(DELETE_EXPIRED_SQL, expired).rowcount
+                if deleted_count > 0:
+                    _refresh_consensus(conn, expired_games)
+                # Movement history outlives the gamelines themselves
+                retention_start = str(now.date() - timedelta(days=SNAPSHOT_RETENTION_DAYS))
+                pruned_count = conn.execute(DELETE_OLD_SNAPSHOTS_SQL, (retention_start,)).rowcount
+                if deleted_count > 0 or pruned_count > 0:
+                    self._bump_version(conn)
+            
+            if pruned_count > 0:
+                logger.info(f"Pruned {pruned_count} NCAAB gameline snapshots before {retention_start}")
             
             if deleted_count > 0:
                 logger.info(f"Successfully deleted {deleted_count} expired NCAAB gamelines")
@@ -190,10 +984,7 @@ class GamelineManager:
             
         except Exception as e:
             logger.error(f"Error deleting NCAAB gamelines: {e}")
-            conn.rollback()
             return 0
-        finally:
-            conn.close()
     
     def export_gamelines(self, export_dir='exports'):
         """Export all gamelines to a JSON file with sport name and timestamp"""
@@ -233,84 +1024,133 @@ class GamelineManager:
             return None
     
     def import_gamelines(self, filepath):
-        """Import gamelines from a JSON export file"""
+        """Import gamelines from a JSON or NDJSON export file (optionally gzipped)"""
         try:
             if not os.path.exists(filepath):
                 logger.error(f"Import file not found: {filepath}")
                 return False
             
-            # Read the export file
-            with open(filepath, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            # Parsed and written in batches, so large archives never load whole
+            with open(filepath, 'rb') as f:
+                result = import_gamelines_stream(f, self, filename=filepath)
             
-            # Validate import data structure
-            if 'gamelines' not in import_data:
-                logger.error("Invalid import file: missing 'gamelines' key")
-                return False
-            
-            gamelines = import_data['gamelines']
-            imported_count = 0
-            
-            # Import each gameline
-            for game_data in gamelines:
-                try:
-                    # Extract source from the game data
-                    source = game_data.get('source')
-                    if not source:
-                        logger.warning("Skipping gameline with missing source")
-                        continue
-                    
-                    # Update the gameline in database
-                    self.update_gameline(source, game_data)
-                    imported_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error importing gameline {game_data}: {e}")
-                    continue
+            for error in result['errors']:
+                logger.warning(f"Skipping gameline {error.get('index', error.get('line'))}: {error['error']}")
             
-            logger.info(f"Successfully imported {imported_count} NCAAB gamelines from {filepath}")
+            logger.info(f"Successfully imported {result['written']} NCAAB gamelines from {filepath}")
             return True
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in import file: {e}")
+        except ValueError as e:
+            logger.error(f"{e}")
             return False
         except Exception as e:
             logger.error(f"Error importing NCAAB gamelines: {e}")
             return False
-            
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_gameline_manager():
+    """Process-wide GamelineManager so routes share one pool and schema init"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = GamelineManager()
+    return _manager
+
 # Cache functions
-def cache_data(data, filename=CACHE_FILE):
-    """Cache data with timestamp"""
-    cache_data = {
-        'timestamp': now,
-        'data': data
-    }
+# The cache lives in a SQLite table so every worker process shares it; ages are
+# measured against wall-clock time.time() at read time.
+CACHE_WRITE_SQL = '''
+    INSERT INTO gameline_cache (cache_key, payload, updated_at, refreshing_until)
+    VALUES (?, ?, ?, NULL)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        payload = excluded.payload,
+        updated_at = excluded.updated_at,
+        refreshing_until = NULL
+'''
+CACHE_READ_SQL = 'SELECT payload, updated_at FROM gameline_cache WHERE cache_key = ?'
+CACHE_LEASE_SQL = '''
+    UPDATE gameline_cache SET refreshing_until = ?
+    WHERE cache_key = ? AND (refreshing_until IS NULL OR refreshing_until < ?)
+'''
+CACHE_RELEASE_SQL = 'UPDATE gameline_cache SET refreshing_until = NULL WHERE cache_key = ?'
+
+def cache_data(data, key=CACHE_KEY):
+    """Cache data with the current wall-clock timestamp"""
     try:
-        with open(filename, 'wb') as f:
-            pickle.dump(cache_data, f)
-        logger.info(f"NCAAB data cached to {filename}")
+        conn = get_gameline_manager().pool.get_connection()
+        with conn:
+            conn.execute(CACHE_WRITE_SQL, (key, json.dumps(data, default=str), time.time()))
+        logger.info(f"NCAAB data cached under '{key}'")
     except Exception as e:
         logger.error(f"Error caching NCAAB data: {e}")
 
-def load_cached_data(filename=CACHE_FILE, expiry_minutes=CACHE_EXPIRY_MINUTES):
-    """Load cached data if it hasn't expired"""
+def load_cached_entry(key=CACHE_KEY):
+    """Return (data, age_seconds) for a cache entry, or (None, None)"""
     try:
-        with open(filename, 'rb') as f:
-            cache_data = pickle.load(f)
-        
-        cache_age = now - cache_data['timestamp']
-        if cache_age < timedelta(minutes=expiry_minutes):
-            logger.info(f"Using cached NCAAB data (age: {cache_age.total_seconds():.0f}s)")
-            return cache_data['data']
-        else:
-            logger.info(f"NCAAB cache expired (age: {cache_age.total_seconds():.0f}s)")
-    except FileNotFoundError:
-        logger.info("No NCAAB cache file found")
+        conn = get_gameline_manager().pool.get_connection()
+        row = conn.execute(CACHE_READ_SQL, (key,)).fetchone()
+        if row is None:
+            logger.info("No NCAAB cache entry found")
+            return None, None
+        return json.loads(row[0]), time.time() - row[1]
     except Exception as e:
         logger.error(f"Error loading NCAAB cache: {e}")
+        return None, None
+
+def load_cached_data(key=CACHE_KEY, expiry_minutes=CACHE_EXPIRY_MINUTES):
+    """Load cached data if it hasn't expired"""
+    data, age = load_cached_entry(key)
+    if data is None:
+        return None
+    
+    if age < expiry_minutes * 60:
+        logger.info(f"Using cached NCAAB data (age: {age:.0f}s)")
+        return data
     
+    logger.info(f"NCAAB cache expired (age: {age:.0f}s)")
     return None
 
+def _acquire_refresh_lease(key=CACHE_KEY):
+    """Claim the right to refresh ``key``; only one worker process wins"""
+    now_ts = time.time()
+    conn = get_gameline_manager().pool.get_connection()
+    with conn:
+        cursor = conn.execute(CACHE_LEASE_SQL, (now_ts + CACHE_REFRESH_LEASE_SECONDS, key, now_ts))
+    return cursor.rowcount == 1
+
+def _release_refresh_lease(key=CACHE_KEY):
+    conn = get_gameline_manager().pool.get_connection()
+    with conn:
+        conn.execute(CACHE_RELEASE_SQL, (key,))
+
+def _refresh_cache():
+    """Fetch fresh gamelines and write them to the cache"""
+    try:
+        all_gamelines = get_gamelines_with_fallback()
+        if all_gamelines:
+            cache_data(all_gamelines)
+        return all_gamelines
+    finally:
+        # No-op when cache_data already cleared the lease
+        _release_refresh_lease()
+
+def refresh_cache_in_background():
+    """Revalidate the cache on a daemon thread unless another worker already is"""
+    try:
+        if not _acquire_refresh_lease():
+            logger.debug("NCAAB cache refresh already in progress")
+            return None
+    except Exception as e:
+        logger.error(f"Error acquiring NCAAB cache refresh lease: {e}")
+        return None
+    
+    thread = threading.Thread(target=_refresh_cache, name='ncaab-cache-refresh', daemon=True)
+    thread.start()
+    return thread
+
 def validate_gamelines(gamelines):
     """Validate that gamelines data is complete and reasonable"""
     if not gamelines or len(gamelines) == 0:
@@ -327,71 +1167,156 @@ def validate_gamelines(gamelines):
     # Consider valid if at least 50% of games have data
     return valid_count >= len(gamelines) * 0.5
 
-def get_gamelines_with_fallback():
-    """Get gamelines with fallback strategy: API -> Web -> Manual"""
-    manager = GamelineManager()
+def _record_source_result(source_id, latency, games=0, error=None, call=None):
+    """Update per-source latency/success metrics.
+
+    ``call`` is the per-fetch state shared with fetch_all_sources; only the
+    first outcome recorded for a call counts, so a scraper that finishes
+    after its deadline miss was recorded is dropped. Returns whether the
+    outcome was recorded.
+    """
+    with _source_stats_lock:
+        if call is not None:
+            if call['settled']:
+                return False
+            call['settled'] = True
+        stats = source_stats.setdefault(source_id, {
+            'successes': 0,
+            'failures': 0,
+            'last_latency': None,
+            'last_games': 0,
+            'last_error': None,
+            'last_run': None
+        })
+        stats['last_latency'] = round(latency, 3)
+        stats['last_run'] = dt.datetime.now().isoformat()
+        stats['last_error'] = error
+        if error is None:
+            stats['successes'] += 1
+            stats['last_games'] = games
+        else:
+            stats['failures'] += 1
+            stats['last_games'] = 0
+    return True
+
+def _fetch_source(source_id, config, call=None):
+    """Run one scraper and validate its output, timing the call"""
+    started = time.perf_counter()
+    try:
+        gamelines = config['function']()
+    except Exception as e:
+        _record_source_result(source_id, time.perf_counter() - started, error=str(e), call=call)
+        raise
     
-    # Try API scrapers first
-    api_sources = {k: v for k, v in SPORTSBOOKS.items() if v['type'] == 'api' and v['enabled']}
-    web_sources = {k: v for k, v in SPORTSBOOKS.items() if v['type'] == 'web' and v['enabled']}
+    if not validate_gamelines(gamelines):
+        _record_source_result(source_id, time.perf_counter() - started, error='invalid data', call=call)
+        return None
     
-    all_gamelines = {}
+    if not _record_source_result(source_id, time.perf_counter() - started, games=len(gamelines), call=call):
+        logger.info(f"Dropping late NCAAB {config['name']} result")
+        return None
+    return gamelines
+
+def fetch_all_sources(sportsbooks=None):
+    """Fetch every enabled sportsbook concurrently.
     
-    # Try API sources first
-    for source_id, config in sorted(api_sources.items(), key=lambda x: x[1]['priority']):
-        if not config['function']:
-            continue
-            
-        logger.info(f"Trying NCAAB API scraper: {config['name']}")
-        try:
-            gamelines = config['function']()
-            if validate_gamelines(gamelines):
-                all_gamelines[source_id] = gamelines
-                logger.info(f"✓ NCAAB API {config['name']} successful: {len(gamelines)} games")
-                
-                # Update database
-                for game in gamelines:
-                    manager.update_gameline(source_id, game)
-                    
-                break  # Stop after first successful API source
-            else:
-                logger.warning(f"✗ NCAAB API {config['name']} returned invalid data")
-        except Exception as e:
-            logger.error(f"Error with NCAAB API {config['name']}: {e}")
+    Each source runs on its own worker thread and is given its configured
+    ``deadline``; a refresh therefore costs the slowest source rather than
+    the sum of all of them. Returns {source_id: gamelines} for the sources
+    that returned valid data in time.
+    """
+    sportsbooks = sportsbooks or SPORTSBOOKS
+    enabled = {
+        k: v for k, v in sportsbooks.items()
+        if v['enabled'] and v['function']
+    }
+    if not enabled:
+        return {}
     
-    # If no API sources worked, try web scrapers
-    if not all_gamelines:
-        logger.info("No NCAAB API sources successful, trying web scrapers...")
-        for source_id, config in sorted(web_sources.items(), key=lambda x: x[1]['priority']):
-            if not config['function']:
-                continue
-                
-            logger.info(f"Trying NCAAB web scraper: {config['name']}")
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=len(enabled), thread_name_prefix='ncaab-fetch')
+    started = time.monotonic()
+    
+    try:
+        calls = {source_id: {'settled': False} for source_id in enabled}
+        futures = {
+            source_id: executor.submit(_fetch_source, source_id, config, calls[source_id])
+            for source_id, config in enabled.items()
+        }
+        
+        for source_id, future in futures.items():
+            config = enabled[source_id]
+            deadline = config.get('deadline', SOURCE_DEADLINE_SECONDS)
+            remaining = max(0, deadline - (time.monotonic() - started))
+            
             try:
-                gamelines = config['function']()
-                if validate_gamelines(gamelines):
-                    all_gamelines[source_id] = gamelines
-                    logger.info(f"✓ NCAAB Web {config['name']} successful: {len(gamelines)} games")
-                    
-                    # Update database
-                    for game in gamelines:
-                        manager.update_gameline(source_id, game)
-                        
-                    break  # Stop after first successful web source
-                else:
-                    logger.warning(f"✗ NCAAB Web {config['name']} returned invalid data")
+                try:
+                    gamelines = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    if not _record_source_result(
+                        source_id, time.monotonic() - started,
+                        error='deadline exceeded', call=calls[source_id]
+                    ):
+                        # The scraper recorded its outcome just as the deadline passed
+                        gamelines = future.result()
+                    else:
+                        logger.warning(f"✗ NCAAB {config['name']} missed its {deadline}s deadline")
+                        continue
             except Exception as e:
-                logger.error(f"Error with NCAAB web {config['name']}: {e}")
+                logger.error(f"Error with NCAAB {config['type']} {config['name']}: {e}")
+                continue
+            
+            if gamelines is None:
+                logger.warning(f"✗ NCAAB {config['name']} returned invalid data")
+                continue
+            
+            results[source_id] = gamelines
+            logger.info(f"✓ NCAAB {config['name']} successful: {len(gamelines)} games")
+    finally:
+        # Don't wait on scrapers that blew their deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+def get_gamelines_with_fallback():
+    """Get gamelines from every enabled sportsbook concurrently and store them"""
+    manager = get_gameline_manager()
+    
+    all_gamelines = fetch_all_sources()
+    if not all_gamelines:
+        logger.warning("No NCAAB sportsbook returned usable gamelines; use the manual input route")
+        return all_gamelines
+    
+    # Update database; only games whose lines moved are written and
+    # re-aggregated across sources in gameline_consensus
+    for source_id, gamelines in all_gamelines.items():
+        result = manager.upsert_many(source_id, gamelines)
+        with _source_stats_lock:
+            if source_id in source_stats:
+                source_stats[source_id]['last_write'] = {
+                    key: result[key] for key in ('inserted', 'changed', 'unchanged', 'duplicates')
+                }
     
     return all_gamelines
 
-def get_all_ncaab_gamelines(use_cache=True):
-    """Get gamelines from all sources with caching and fallback"""
+def get_all_ncaab_gamelines(use_cache=True, allow_stale=True):
+    """Get gamelines from all sources with caching and fallback.
+    
+    Fresh cache entries are returned as-is. With ``allow_stale`` an expired
+    entry (up to CACHE_STALE_MAX_MINUTES old) is returned immediately while
+    a background refresh revalidates it, so callers never wait on scrapers.
+    """
     
     if use_cache:
-        cached_data = load_cached_data()
+        cached_data, age = load_cached_entry()
         if cached_data is not None:
-            return cached_data
+            if age < CACHE_EXPIRY_MINUTES * 60:
+                logger.info(f"Using cached NCAAB data (age: {age:.0f}s)")
+                return cached_data
+            if allow_stale and age < CACHE_STALE_MAX_MINUTES * 60:
+                logger.info(f"Serving stale NCAAB data (age: {age:.0f}s) while refreshing")
+                refresh_cache_in_background()
+                return cached_data
     
     all_gamelines = get_gamelines_with_fallback()
     
@@ -401,10 +1326,10 @@ def get_all_ncaab_gamelines(use_cache=True):
     
     return all_gamelines
 
-def main():
+def main(allow_stale=True):
     """Main function"""
     print("Fetching NCAAB gamelines...")
-    all_gamelines = get_all_ncaab_gamelines()
+    all_gamelines = get_all_ncaab_gamelines(allow_stale=allow_stale)
     
     if all_gamelines:
         print(f"Successfully retrieved NCAAB gamelines from {len(all_gamelines)} sources:")
@@ -422,8 +1347,60 @@ def main():
         print("Please use the manual input route in the web app.")
         return {"gamelines": []}
 
-# Clean up old gamelines and fetch new ones
-deleter = GamelineManager()
-deleter.delete_gamelines()
+# Startup readiness: set once the first gameline refresh has landed
+startup_refresh_complete = threading.Event()
+startup_refresh_state = {
+    'started_at': None,
+    'finished_at': None,
+    'error': None
+}
+
+def refresh_gamelines():
+    """Clean up old gamelines and fetch new ones"""
+    deleter = get_gameline_manager()
+    deleter.delete_gamelines()
+    return main(allow_stale=False)
+
+def mark_startup_refresh_complete(error=None):
+    """Record the outcome of the first refresh and flip readiness"""
+    if startup_refresh_complete.is_set():
+        return
+    startup_refresh_state['error'] = error
+    startup_refresh_state['finished_at'] = dt.datetime.now().isoformat()
+    startup_refresh_complete.set()
+
+def _run_startup_refresh(delay):
+    """Run the initial refresh once the server is listening"""
+    sleep(delay)
+    startup_refresh_state['started_at'] = dt.datetime.now().isoformat()
+    error = None
+    try:
+        refresh_gamelines()
+    except Exception as e:
+        logger.error(f"Initial NCAAB gameline refresh failed: {e}")
+        error = str(e)
+    finally:
+        mark_startup_refresh_complete(error)
+
+def start_background_refresh(delay=STARTUP_REFRESH_DELAY):
+    """Schedule the initial gameline refresh on a daemon thread.
+
+    Importing this module performs no network I/O; the server calls this
+    from its startup hook so workers can accept traffic immediately.
+    """
+    if not STARTUP_REFRESH:
+        logger.info("NCAAB startup refresh disabled")
+        startup_refresh_complete.set()
+        return None
+
+    thread = threading.Thread(
+        target=_run_startup_refresh,
+        args=(delay,),
+        name='ncaab-startup-refresh',
+        daemon=True
+    )
+    thread.start()
+    return thread
 
-ncaab_game_lines = main()
+if __name__ == "__main__":
+    refresh_gamelines()
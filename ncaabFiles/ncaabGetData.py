@@ -1,5 +1,4 @@
 import datetime as dt
-import requests
 from bs4 import BeautifulSoup
 import os
 import json
@@ -8,33 +7,85 @@ import time
 from random import uniform
 from typing import List, Dict, Optional
 
+from ncaabHttp import http_get
+from ncaabCache import TTLCache
+from ncaabParser import parse_gamelog
+from ncaabSummary import basketball_summary
+
 logger = logging.getLogger(__name__)
 
 current_year = dt.datetime.now().year
 
+# Team stats cache: past seasons never change, the current one does
+TEAM_STATS_CACHE_SIZE = 512
+TEAM_STATS_CURRENT_SEASON_TTL = 300
+team_stats_cache = TTLCache(maxsize=TEAM_STATS_CACHE_SIZE, name='team_stats')
+
 # Basketball-specific headers
 basketball_headers = [
     "Date", "Location", "Opp", "W/L", "Tm", "Opp", "FG", "FGA", "FG%", "3P", "3PA", "3P%", 
     "FT", "FTA", "FT%", "ORB", "TRB", "AST", "STL", "BLK", "TOV", "PF"
 ]
 
-def get_soup(url):
-    """Helper function to fetch and parse HTML"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+# Parser column -> key used in the games returned by get_team_stats
+GAMELOG_COLUMN_KEYS = {
+    'Date': 'Date', 'Location': 'Location', 'Result': 'W/L', 'Tm': 'Tm', 'Opp': 'Opp',
+    'FGM': 'FG', 'FGA': 'FGA', 'FG_Pct': 'FG%', 'ThreePM': '3P', 'ThreePA': '3PA',
+    'ThreeP_Pct': '3P%', 'FTM': 'FT', 'FTA': 'FTA', 'FT_Pct': 'FT%', 'ORB': 'ORB',
+    'TRB': 'TRB', 'AST': 'AST', 'STL': 'STL', 'BLK': 'BLK', 'TOV': 'TOV', 'PF': 'PF'
+}
+
+def get_page(url):
+    """Helper function to fetch raw HTML"""
     try:
         # Add respectful delay
         time.sleep(uniform(1, 3))
-        content = requests.get(url, headers=headers, timeout=10)
+        content = http_get(url, timeout=10)
         content.raise_for_status()
-        soup = BeautifulSoup(content.content, 'html.parser')
-        return soup
+        return content.content
     except Exception as e:
         logger.error(f"Error fetching URL {url}: {e}")
         return None
 
+def get_soup(url):
+    """Helper function to fetch and parse HTML"""
+    content = get_page(url)
+    if content is None:
+        return None
+    return BeautifulSoup(content, 'html.parser')
+
+def current_season() -> int:
+    """Season label for today's date (the 2024-25 season is 2025)"""
+    today = dt.date.today()
+    return today.year + 1 if today.month >= 11 else today.year
+
+def _team_stats_ttl(year):
+    """Completed seasons are cached indefinitely, the current one briefly"""
+    try:
+        if int(year) < current_season():
+            return None
+    except (TypeError, ValueError):
+        pass
+    return TEAM_STATS_CURRENT_SEASON_TTL
+
 def get_team_stats(team: str, year: int) -> Dict:
+    """
+    Get NCAAB team stats, served from the (team, year) cache when possible.
+    Concurrent misses for the same team-season share a single scrape.
+    """
+    try:
+        key = (team.lower(), int(year))
+    except (TypeError, ValueError):
+        key = (team.lower(), str(year))
+    
+    return team_stats_cache.get_or_load(
+        key,
+        lambda: _fetch_team_stats(team, year),
+        ttl=_team_stats_ttl(year),
+        should_cache=lambda stats: bool(stats) and 'error' not in stats
+    )
+
+def _fetch_team_stats(team: str, year: int) -> Dict:
     """
     Get NCAAB team stats using Sports Reference (following your working structure)
     """
@@ -42,29 +93,18 @@ def get_team_stats(team: str, year: int) -> Dict:
         team = team.lower()
         url = f'https://www.sports-reference.com/cbb/schools/{team}/{year}-gamelogs.html'
         
-        soup = get_soup(url)
-        if not soup:
+        page = get_page(url)
+        if not page:
             return {"error": f"Could not fetch data for {team} {year}"}
         
-        body = soup.find('tbody')
-        if not body:
+        rows = parse_gamelog(page)
+        if not rows:
             return {"error": f"No data found for {team} {year}"}
 
-        rows = body.find_all('tr')  
-        all_data = []
-        
-        for row in rows:
-            cells = row.find_all('td')
-            if not cells:
-                continue
-
-            # Create data dictionary using your header structure
-            data = {
-                header: cells[idx].text if len(cells) > idx else None
-                for idx, header in enumerate(basketball_headers)
-            }
-            
-            all_data.append(data)
+        all_data = [
+            {key: row[column] for column, key in GAMELOG_COLUMN_KEYS.items()}
+            for row in rows
+        ]
 
         # Calculate summary stats
         summary = _calculate_basketball_summary(all_data)
@@ -80,106 +120,7 @@ def get_team_stats(team: str, year: int) -> Dict:
 
 def _calculate_basketball_summary(games: List[Dict]) -> Dict:
     """Calculate basketball summary statistics"""
-    try:
-        if not games:
-            return {}
-            
-        total_games = len(games)
-        wins = 0
-        losses = 0
-        
-        # Basketball stats accumulators
-        total_points = 0
-        total_points_against = 0
-        total_fg_made = 0
-        total_fg_attempted = 0
-        total_3p_made = 0
-        total_3p_attempted = 0
-        total_ft_made = 0
-        total_ft_attempted = 0
-        total_rebounds = 0
-        total_assists = 0
-        total_turnovers = 0
-        
-        for game in games:
-            try:
-                # Win/Loss
-                wl = game.get('W/L', '')
-                if wl == 'W':
-                    wins += 1
-                elif wl == 'L':
-                    losses += 1
-                
-                # Points
-                points = _safe_int(game.get('Tm'))
-                points_against = _safe_int(game.get('Opp'))
-                
-                total_points += points
-                total_points_against += points_against
-                
-                # Field goals
-                fg_made = _safe_int(game.get('FG'))
-                fg_attempted = _safe_int(game.get('FGA'))
-                total_fg_made += fg_made
-                total_fg_attempted += fg_attempted
-                
-                # 3-pointers
-                three_made = _safe_int(game.get('3P'))
-                three_attempted = _safe_int(game.get('3PA'))
-                total_3p_made += three_made
-                total_3p_attempted += three_attempted
-                
-                # Free throws
-                ft_made = _safe_int(game.get('FT'))
-                ft_attempted = _safe_int(game.get('FTA'))
-                total_ft_made += ft_made
-                total_ft_attempted += ft_attempted
-                
-                # Other stats
-                rebounds = _safe_int(game.get('TRB'))
-                assists = _safe_int(game.get('AST'))
-                turnovers = _safe_int(game.get('TOV'))
-                
-                total_rebounds += rebounds
-                total_assists += assists
-                total_turnovers += turnovers
-                
-            except (ValueError, KeyError) as e:
-                logger.debug(f"Error processing basketball game stats: {e}")
-                continue
-        
-        # Calculate percentages and averages
-        fg_percentage = (total_fg_made / total_fg_attempted * 100) if total_fg_attempted > 0 else 0
-        three_percentage = (total_3p_made / total_3p_attempted * 100) if total_3p_attempted > 0 else 0
-        ft_percentage = (total_ft_made / total_ft_attempted * 100) if total_ft_attempted > 0 else 0
-        
-        return {
-            'record': f"{wins}-{losses}",
-            'wins': wins,
-            'losses': losses,
-            'points_per_game': round(total_points / total_games, 1) if total_games > 0 else 0,
-            'points_against_per_game': round(total_points_against / total_games, 1) if total_games > 0 else 0,
-            'field_goal_percentage': round(fg_percentage, 1),
-            'three_point_percentage': round(three_percentage, 1),
-            'free_throw_percentage': round(ft_percentage, 1),
-            'rebounds_per_game': round(total_rebounds / total_games, 1) if total_games > 0 else 0,
-            'assists_per_game': round(total_assists / total_games, 1) if total_games > 0 else 0,
-            'turnovers_per_game': round(total_turnovers / total_games, 1) if total_games > 0 else 0,
-            'total_games': total_games
-        }
-        
-    except Exception as e:
-        logger.error(f"Error calculating basketball summary stats: {e}")
-        return {}
-
-def _safe_int(value):
-    """Safely convert to int, return 0 if invalid"""
-    try:
-        if value and str(value).strip().replace('.', '').isdigit():
-            return int(float(value))
-        return 0
-    except (ValueError, TypeError):
-        return 0
+    return basketball_summary(games)
 
 def ncaabdb(team: str, year: int = current_year) -> bool:
     """
@@ -189,7 +130,7 @@ def ncaabdb(team: str, year: int = current_year) -> bool:
         team_url = team.lower().replace(' ', '-').replace('(', '').replace(')', '')
         url = f'https://www.sports-reference.com/cbb/schools/{team_url}/{year}-gamelogs.html'
         
-        response = requests.get(url)
+        response = http_get(url)
         soup = BeautifulSoup(response.text, 'html.parser')
         body = soup.find('tbody')
         
@@ -248,4 +189,5 @@ def test_scraping():
 
     print('ncaab stats loaded')
 
-test_scraping()
+if __name__ == "__main__":
+    test_scraping()
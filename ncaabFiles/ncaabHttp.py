@@ -0,0 +1,184 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+HTTP_TIMEOUT = 10
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 20
+DEFAULT_HOST_CONCURRENCY = 8
+# Hosts that need gentler treatment than the default
+HOST_CONCURRENCY = {
+    'www.sports-reference.com': 2
+}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+# HTTP/2 needs the optional h2 package on top of httpx
+HTTP2_AVAILABLE = httpx is not None and importlib.util.find_spec('h2') is not None
+
+class HttpClient:
+    """Shared keep-alive HTTP client used by every scraper.
+
+    Wraps one requests.Session with a pooled adapter that retries transient
+    failures with exponential backoff, and caps in-flight requests per host
+    so concurrent refreshes don't hammer a single upstream.
+    """
+
+    def __init__(self, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            max_retries=retry
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).hostname or ''
+        with self._lock:
+            semaphore = self._host_limits.get(host)
+            if semaphore is None:
+                limit = HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+                semaphore = self._host_limits[host] = threading.BoundedSemaphore(limit)
+            return semaphore
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """GET through the shared pool; raises requests exceptions like requests.get"""
+        with self._host_semaphore(url):
+            return self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+
+    def stats(self):
+        """Per-host request and connection counts from the urllib3 pools"""
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools[key]
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            stats[host] = {
+                'requests': pool.num_requests,
+                'connections_opened': pool.num_connections
+            }
+        return stats
+
+    def close(self):
+        self.session.close()
+
+class AsyncHttpClient:
+    """Async counterpart of HttpClient for use inside FastAPI routes.
+
+    Uses httpx (with HTTP/2 when h2 is installed) if available, and falls
+    back to running the shared sync client in a worker thread otherwise.
+    """
+
+    def __init__(self, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._client = None
+        self._host_limits = {}
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=DEFAULT_HEADERS,
+                timeout=self.timeout,
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=POOL_MAXSIZE,
+                    max_keepalive_connections=POOL_MAXSIZE
+                )
+            )
+        return self._client
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).hostname or ''
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            limit = HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+            semaphore = self._host_limits[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def get(self, url, headers=None, timeout=None, **kwargs):
+        if httpx is None:
+            return await asyncio.to_thread(get_http_client().get, url, headers=headers, timeout=timeout, **kwargs)
+
+        client = self._get_client()
+        async with self._host_semaphore(url):
+            for attempt in range(self.retries + 1):
+                try:
+                    response = await client.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+                    if response.status_code not in HTTP_RETRY_STATUSES or attempt == self.retries:
+                        return response
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        raise
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Process-wide sync client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+def get_async_http_client():
+    """Process-wide async client"""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncHttpClient()
+    return _async_client
+
+def http_get(url, headers=None, timeout=None, **kwargs):
+    """Drop-in replacement for requests.get() that goes through the shared pool"""
+    return get_http_client().get(url, headers=headers, timeout=timeout, **kwargs)
+
+async def async_http_get(url, headers=None, timeout=None, **kwargs):
+    """Async GET through the shared async client"""
+    return await get_async_http_client().get(url, headers=headers, timeout=timeout, **kwargs)
@@ -0,0 +1,267 @@
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+IMPORT_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 64 * 1024
+IMPORT_MAX_ERRORS_REPORTED = 20
+IMPORT_PROGRESS_HISTORY = 20
+IMPORT_FORMATS = ('json', 'ndjson')
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Recent and running imports, newest last, for the status endpoint
+import_progress = OrderedDict()
+_progress_lock = threading.Lock()
+
+def detect_format(filename):
+    """'ndjson' for .ndjson/.jsonl uploads (optionally .gz), otherwise 'json'"""
+    name = (filename or '').lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    return 'ndjson' if name.endswith(('.ndjson', '.jsonl')) else 'json'
+
+def open_import_stream(fileobj):
+    """Binary stream over the upload, transparently gunzipping gzip'd files"""
+    stream = fileobj if isinstance(fileobj, io.BufferedReader) else io.BufferedReader(_Raw(fileobj))
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return io.BufferedReader(gzip.GzipFile(fileobj=stream))
+    return stream
+
+class _Raw(io.RawIOBase):
+    """Adapts any object with read() (e.g. a SpooledTemporaryFile) to RawIOBase"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.fileobj.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def _iter_json_array_fallback(stream, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Incrementally decode the gamelines of a JSON export ({..., "gamelines": [...]})
+    or a bare JSON array with json.raw_decode, holding one chunk plus the
+    current object in memory.
+    """
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(stream, encoding='utf-8')
+    buffer = ''
+    eof = False
+
+    def fill():
+        nonlocal buffer, eof
+        chunk = reader.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+    # Locate the opening bracket of the array
+    while not eof and not buffer.lstrip():
+        fill()
+    stripped = buffer.lstrip()
+    if stripped.startswith('['):
+        pos = buffer.index('[') + 1
+    elif stripped.startswith('{'):
+        marker = '"gamelines"'
+        while marker not in buffer and not eof:
+            fill()
+        if marker not in buffer:
+            raise ValueError("Invalid import file: missing 'gamelines' key")
+        pos = buffer.index(marker) + len(marker)
+        while '[' not in buffer[pos:] and not eof:
+            fill()
+        bracket = buffer.find('[', pos)
+        if bracket < 0 or buffer[pos:bracket].strip() != ':':
+            raise ValueError("Invalid import file: 'gamelines' is not a list")
+        pos = bracket + 1
+    else:
+        raise ValueError("Invalid import file: expected a JSON object or array")
+
+    while True:
+        # Skip separators, reading more when the buffer runs dry
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = buffer[pos:], 0
+            fill()
+
+        if pos >= len(buffer):
+            raise ValueError("Invalid import file: unterminated gamelines list")
+        if buffer[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Invalid JSON in import file")
+            complete = False
+        if not complete:
+            # The value straddles the chunk boundary
+            buffer, pos = buffer[pos:], 0
+            fill()
+            continue
+
+        yield item
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+def iter_json_gamelines(stream):
+    """Yield gamelines from a JSON export or array, with ijson when installed"""
+    if ijson is None:
+        yield from _iter_json_array_fallback(stream)
+        return
+
+    first = stream.peek(64).lstrip()[:1]
+    prefix = 'item' if first == b'[' else 'gamelines.item'
+    try:
+        yield from ijson.items(stream, prefix, use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"Invalid JSON in import file: {e}")
+
+def iter_ndjson_gamelines(stream, errors):
+    """
+    Yield (line number, gameline) per non-blank line; bad lines are appended
+    to ``errors`` and yield None in place of the gameline.
+    """
+    for line_no, line in enumerate(io.TextIOWrapper(stream, encoding='utf-8'), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            errors.append({'line': line_no, 'error': f"Invalid JSON: {e.msg}"})
+            yield line_no, None
+
+def _start_progress(filename, fmt):
+    import_id = uuid.uuid4().hex[:8]
+    progress = {
+        'id': import_id,
+        'filename': filename,
+        'format': fmt,
+        'status': 'running',
+        'started_at': time.time(),
+        'finished_at': None,
+        'read': 0,
+        'written': 0,
+        'inserted': 0,
+        'changed': 0,
+        'unchanged': 0,
+        'duplicates': 0,
+        'rejected': 0,
+        'batches': 0,
+        'rows_per_second': 0,
+        'errors': [],
+        'error': None
+    }
+    with _progress_lock:
+        import_progress[import_id] = progress
+        while len(import_progress) > IMPORT_PROGRESS_HISTORY:
+            import_progress.popitem(last=False)
+    return progress
+
+def import_gamelines_stream(fileobj, manager, filename='', fmt=None, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Parse an upload incrementally and upsert it in ``batch_size`` transactions.
+    Memory stays bounded by one batch; progress is published in import_progress.
+    Raises ValueError for files that can't be parsed as a whole.
+    """
+    fmt = fmt or detect_format(filename)
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format {fmt!r}")
+
+    progress = _start_progress(filename, fmt)
+    parse_errors = []
+
+    def record_errors(errors):
+        progress['rejected'] += len(errors)
+        room = IMPORT_MAX_ERRORS_REPORTED - len(progress['errors'])
+        if room > 0:
+            progress['errors'].extend(errors[:room])
+
+    def flush(batch, positions):
+        # Consensus is queued and recomputed once per game when the import ends, not per batch
+        result = manager.upsert_many(None, batch, defer_consensus=True)
+        progress['written'] += result['written']
+        for key in ('inserted', 'changed', 'unchanged', 'duplicates'):
+            progress[key] += result[key]
+        progress['batches'] += 1
+        # Errors index into the batch; report the item's place in the file
+        record_errors([
+            {position_key: positions[error['index']], 'error': error['error']}
+            for error in result['errors']
+        ])
+        elapsed = time.time() - progress['started_at']
+        progress['rows_per_second'] = round(progress['read'] / elapsed) if elapsed > 0 else 0
+
+    try:
+        stream = open_import_stream(fileobj)
+        # NDJSON items are reported by line number, JSON array items by index
+        if fmt == 'ndjson':
+            position_key = 'line'
+            items = iter_ndjson_gamelines(stream, parse_errors)
+        else:
+            position_key = 'index'
+            items = enumerate(iter_json_gamelines(stream))
+
+        batch = []
+        positions = []
+        for position, item in items:
+            progress['read'] += 1
+            if parse_errors:
+                record_errors(parse_errors)
+                parse_errors.clear()
+            if item is None:
+                continue
+            batch.append(item)
+            positions.append(position)
+            if len(batch) >= batch_size:
+                flush(batch, positions)
+                batch = []
+                positions = []
+                if progress['batches'] % 50 == 0:
+                    logger.info(f"NCAAB import {progress['id']}: {progress['read']} read, {progress['written']} written")
+        if batch:
+            flush(batch, positions)
+
+        progress['status'] = 'done'
+    except Exception as e:
+        progress['status'] = 'failed'
+        progress['error'] = str(e)
+        raise
+    finally:
+        # Batches already written count even when the import failed part-way
+        try:
+            manager.refresh_pending_consensus()
+        except Exception as e:
+            logger.error(f"NCAAB import {progress['id']}: error refreshing deferred consensus: {e}")
+        progress['finished_at'] = time.time()
+        logger.info(
+            f"NCAAB import {progress['id']} {progress['status']}: {progress['read']} read, "
+            f"{progress['written']} written, {progress['rejected']} rejected"
+        )
+
+    return progress
@@ -0,0 +1,153 @@
+import io
+import logging
+from typing import Dict, List
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Sports Reference has used both ids for the team game log table
+GAMELOG_TABLE_IDS = ('sgl-basic', 'team_game_log')
+
+# (column, data-stat aliases, type) for the team game log. Columns match the
+# Stats table written by ncaabData.ncaabdb; aliases cover the old and the
+# redesigned page layouts.
+GAMELOG_FIELDS = [
+    ('Date', ('date_game', 'date'), str),
+    ('Location', ('game_location',), str),
+    ('Opponent', ('opp_id', 'opp_name'), str),
+    ('Result', ('game_result', 'team_game_result'), str),
+    ('Tm', ('pts', 'team_game_score'), int),
+    ('Opp', ('opp_pts', 'opp_team_game_score'), int),
+    ('FGM', ('fg',), int),
+    ('FGA', ('fga',), int),
+    ('FG_Pct', ('fg_pct',), float),
+    ('ThreePM', ('fg3',), int),
+    ('ThreePA', ('fg3a',), int),
+    ('ThreeP_Pct', ('fg3_pct',), float),
+    ('FTM', ('ft',), int),
+    ('FTA', ('fta',), int),
+    ('FT_Pct', ('ft_pct',), float),
+    ('ORB', ('orb',), int),
+    ('TRB', ('trb',), int),
+    ('AST', ('ast',), int),
+    ('STL', ('stl',), int),
+    ('BLK', ('blk',), int),
+    ('TOV', ('tov',), int),
+    ('PF', ('pf',), int),
+    ('Opp_FGM', ('opp_fg',), int),
+    ('Opp_FGA', ('opp_fga',), int),
+    ('Opp_FG_Pct', ('opp_fg_pct',), float),
+    ('Opp_ThreePM', ('opp_fg3',), int),
+    ('Opp_ThreePA', ('opp_fg3a',), int),
+    ('Opp_ThreeP_Pct', ('opp_fg3_pct',), float)
+]
+
+# data-stat -> (column, type), built once
+_STAT_LOOKUP = {
+    alias: (column, kind)
+    for column, aliases, kind in GAMELOG_FIELDS
+    for alias in aliases
+}
+
+def _convert(text, kind):
+    """Typed value for a cell; blanks and junk become None"""
+    text = (text or '').strip()
+    if not text:
+        return None
+    if kind is str:
+        return text
+    try:
+        return kind(text)
+    except ValueError:
+        return None
+
+def _empty_row():
+    return {column: None for column, _, _ in GAMELOG_FIELDS}
+
+def _finish_row(row):
+    """Keep real game rows only (repeated header rows have no date)"""
+    return row if row['Date'] else None
+
+def _parse_gamelog_lxml(html) -> List[Dict]:
+    """Stream the page with lxml, building rows as each <tr> closes"""
+    rows = []
+    in_table = False
+    in_body = False
+    row = None
+
+    source = io.BytesIO(html if isinstance(html, bytes) else html.encode('utf-8'))
+    for event, element in etree.iterparse(source, events=('start', 'end'), html=True, recover=True):
+        tag = element.tag
+        if event == 'start':
+            if tag == 'table' and element.get('id') in GAMELOG_TABLE_IDS:
+                in_table = True
+            elif in_table and tag == 'tbody':
+                in_body = True
+            elif in_body and tag == 'tr':
+                row = None if 'thead' in (element.get('class') or '') else _empty_row()
+            continue
+
+        if in_body and row is not None and tag in ('td', 'th'):
+            target = _STAT_LOOKUP.get(element.get('data-stat'))
+            if target is not None:
+                column, kind = target
+                row[column] = _convert(''.join(element.itertext()), kind)
+        elif in_body and tag == 'tr':
+            if row is not None:
+                finished = _finish_row(row)
+                if finished:
+                    rows.append(finished)
+            row = None
+            element.clear()
+        elif in_table and tag == 'tbody':
+            in_body = False
+        elif in_table and tag == 'table':
+            # Only the first game log table on the page is wanted
+            break
+
+    return rows
+
+def _parse_gamelog_bs4(html) -> List[Dict]:
+    """Fallback when lxml is not installed"""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = None
+    for table_id in GAMELOG_TABLE_IDS:
+        table = soup.find('table', {'id': table_id})
+        if table:
+            break
+    if not table or not table.tbody:
+        return []
+
+    rows = []
+    for tr in table.tbody.find_all('tr'):
+        if 'thead' in (tr.get('class') or []):
+            continue
+        row = _empty_row()
+        for cell in tr.find_all(['th', 'td']):
+            target = _STAT_LOOKUP.get(cell.get('data-stat'))
+            if target is not None:
+                column, kind = target
+                row[column] = _convert(cell.get_text(), kind)
+        finished = _finish_row(row)
+        if finished:
+            rows.append(finished)
+    return rows
+
+def parse_gamelog(html) -> List[Dict]:
+    """
+    Parse a Sports Reference team game log page into typed rows keyed by
+    GAMELOG_FIELDS columns (ints for counting stats, floats for percentages).
+    """
+    try:
+        if etree is not None:
+            return _parse_gamelog_lxml(html)
+        return _parse_gamelog_bs4(html)
+    except Exception as e:
+        logger.error(f"Error parsing NCAAB gamelog: {e}")
+        return []
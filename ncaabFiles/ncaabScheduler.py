@@ -0,0 +1,340 @@
+import datetime as dt
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+
+from ncaabGamelines import (
+    DB_FILE,
+    STARTUP_REFRESH_DELAY,
+    cache_data,
+    get_gameline_manager,
+    get_gamelines_with_fallback,
+    mark_startup_refresh_complete,
+    startup_refresh_complete,
+    startup_refresh_state
+)
+from ncaabEvents import ncaab_events_manager
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+# Set NCAAB_SCHEDULER=0 to fall back to a single refresh at startup
+SCHEDULER_ENABLED = os.environ.get('NCAAB_SCHEDULER', '1') != '0'
+SCHEDULER_TICK_SECONDS = 5
+LEADER_LEASE_SECONDS = 60
+LEADER_LEASE_NAME = 'ncaab-refresh'
+
+# Odds cadence tightens as the next tip-off approaches:
+# (seconds until tip-off, refresh interval in seconds), checked in order
+ODDS_REFRESH_TIERS = [
+    (15 * 60, 60),
+    (60 * 60, 120),
+    (3 * 60 * 60, 300)
+]
+ODDS_REFRESH_INTERVAL_SECONDS = 900
+PRUNE_INTERVAL_SECONDS = 300
+# Backstop for consensus left queued by an import that stopped before draining it
+CONSENSUS_DRAIN_INTERVAL_SECONDS = 60
+EVENTS_REFRESH_INTERVAL_SECONDS = 3600
+EVENTS_REFRESH_DAYS = 7
+
+LEASE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS scheduler_leases (
+        name TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+'''
+ACQUIRE_LEASE_SQL = '''
+    INSERT INTO scheduler_leases (name, owner, expires_at) VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        owner = excluded.owner,
+        expires_at = excluded.expires_at
+    WHERE scheduler_leases.owner = excluded.owner OR scheduler_leases.expires_at < ?
+'''
+RELEASE_LEASE_SQL = 'DELETE FROM scheduler_leases WHERE name = ? AND owner = ?'
+# The leader records every gameline refresh here, failed or not, so followers
+# can flip readiness off the leader's outcome instead of the cache contents
+REFRESH_RUNS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS scheduler_refresh_runs (
+        name TEXT PRIMARY KEY,
+        finished_at REAL NOT NULL,
+        error TEXT
+    )
+'''
+RECORD_REFRESH_RUN_SQL = '''
+    INSERT INTO scheduler_refresh_runs (name, finished_at, error) VALUES (?, ?, ?)
+    ON CONFLICT(name) DO UPDATE SET
+        finished_at = excluded.finished_at,
+        error = excluded.error
+'''
+SELECT_REFRESH_RUN_SQL = 'SELECT finished_at, error FROM scheduler_refresh_runs WHERE name = ?'
+UPCOMING_START_TIMES_SQL = '''
+    SELECT game_day, start_time FROM gamelines
+    WHERE game_day BETWEEN ? AND ? AND start_time IS NOT NULL
+'''
+
+_TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})\s*([AaPp][Mm])?')
+
+def _parse_start(game_day, start_time):
+    """Best-effort datetime for a stored game_day/start_time pair"""
+    match = _TIME_PATTERN.search(start_time or '')
+    if not match:
+        return None
+    try:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        meridiem = (match.group(3) or '').lower()
+        if meridiem == 'pm' and hour < 12:
+            hour += 12
+        elif meridiem == 'am' and hour == 12:
+            hour = 0
+        day = dt.date.fromisoformat(str(game_day))
+        return dt.datetime.combine(day, dt.time(hour, minute))
+    except ValueError:
+        return None
+
+class RefreshScheduler:
+    """In-process scheduler for gameline refreshes, pruning and schedule scrapes.
+
+    Every worker runs one, but only the holder of the SQLite lease row does
+    the work, so N gunicorn workers still produce one refresh per interval.
+    """
+
+    def __init__(self, db_file=DB_FILE, tick_seconds=SCHEDULER_TICK_SECONDS, odds_tiers=None):
+        self.db_file = db_file
+        self.tick_seconds = tick_seconds
+        self.odds_tiers = odds_tiers or ODDS_REFRESH_TIERS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self.next_tipoff = None
+
+        self.jobs = {
+            'prune': {'func': self._prune_gamelines, 'interval': lambda: PRUNE_INTERVAL_SECONDS},
+            'consensus': {'func': self._drain_consensus, 'interval': lambda: CONSENSUS_DRAIN_INTERVAL_SECONDS},
+            'gamelines': {'func': self._refresh_gamelines, 'interval': self._odds_interval},
+            'events': {'func': self._refresh_events, 'interval': lambda: EVENTS_REFRESH_INTERVAL_SECONDS}
+        }
+        self.metrics = {
+            name: {
+                'runs': 0,
+                'failures': 0,
+                'last_run': None,
+                'last_duration': None,
+                'last_error': None,
+                'next_run': None
+            }
+            for name in self.jobs
+        }
+        self._next_run_ts = {name: None for name in self.jobs}
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_ts = None
+        self._tables_ready = False
+
+    # Leader election
+
+    def _connection(self):
+        conn = get_gameline_manager().pool.get_connection()
+        if not self._tables_ready:
+            with conn:
+                conn.execute(LEASE_SCHEMA)
+                conn.execute(REFRESH_RUNS_SCHEMA)
+            self._tables_ready = True
+        return conn
+
+    def _acquire_leadership(self):
+        now_ts = time.time()
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(ACQUIRE_LEASE_SQL, (
+                    LEADER_LEASE_NAME, self.owner, now_ts + LEADER_LEASE_SECONDS, now_ts
+                ))
+            leader = cursor.rowcount == 1
+        except Exception as e:
+            logger.error(f"Error acquiring NCAAB scheduler lease: {e}")
+            leader = False
+
+        if leader != self.is_leader:
+            logger.info(f"NCAAB scheduler {self.owner} {'acquired' if leader else 'lost'} leadership")
+        self.is_leader = leader
+        return leader
+
+    def _release_leadership(self):
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(RELEASE_LEASE_SQL, (LEADER_LEASE_NAME, self.owner))
+        except Exception as e:
+            logger.debug(f"Error releasing NCAAB scheduler lease: {e}")
+        self.is_leader = False
+
+    # Cadence
+
+    def _find_next_tipoff(self):
+        """Earliest known start time still in the future"""
+        now = dt.datetime.now()
+        try:
+            conn = self._connection()
+            rows = conn.execute(UPCOMING_START_TIMES_SQL, (
+                str(now.date()), str(now.date() + dt.timedelta(days=1))
+            )).fetchall()
+        except Exception as e:
+            logger.debug(f"Error reading NCAAB start times: {e}")
+            return None
+
+        starts = [start for start in (_parse_start(*row) for row in rows) if start and start >= now]
+        return min(starts) if starts else None
+
+    def _odds_interval(self):
+        self.next_tipoff = self._find_next_tipoff()
+        if self.next_tipoff is None:
+            return ODDS_REFRESH_INTERVAL_SECONDS
+
+        seconds_to_tipoff = (self.next_tipoff - dt.datetime.now()).total_seconds()
+        for window, interval in self.odds_tiers:
+            if seconds_to_tipoff <= window:
+                return interval
+        return ODDS_REFRESH_INTERVAL_SECONDS
+
+    # Jobs
+
+    def _prune_gamelines(self):
+        return get_gameline_manager().delete_gamelines(now=dt.datetime.now())
+
+    def _drain_consensus(self):
+        return get_gameline_manager().refresh_pending_consensus()
+
+    def _refresh_gamelines(self):
+        error = None
+        try:
+            all_gamelines = get_gamelines_with_fallback()
+            if all_gamelines:
+                cache_data(all_gamelines)
+            return sum(len(games) for games in all_gamelines.values())
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self._record_refresh_run(error)
+            mark_startup_refresh_complete(error)
+
+    def _record_refresh_run(self, error):
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(RECORD_REFRESH_RUN_SQL, ('gamelines', time.time(), error))
+        except Exception as e:
+            logger.error(f"Error recording NCAAB refresh run: {e}")
+
+    def _follow_leader_refresh(self):
+        """Flip follower readiness once the leader has finished a refresh.
+
+        Runs recorded within one full odds interval before this scheduler
+        started still count, so a restarted follower does not wait for the
+        leader's next run.
+        """
+        try:
+            row = self._connection().execute(SELECT_REFRESH_RUN_SQL, ('gamelines',)).fetchone()
+        except Exception as e:
+            logger.debug(f"Error reading NCAAB refresh run: {e}")
+            return
+        started_ts = self._started_ts or time.time()
+        if row and row[0] >= started_ts - ODDS_REFRESH_INTERVAL_SECONDS:
+            mark_startup_refresh_complete(row[1])
+
+    def _refresh_events(self):
+        return ncaab_events_manager.refresh_schedule(EVENTS_REFRESH_DAYS)
+
+    def run_job(self, name):
+        """Run one job now and record its metrics"""
+        job = self.jobs[name]
+        metrics = self.metrics[name]
+        started = time.perf_counter()
+        metrics['last_run'] = dt.datetime.now().isoformat()
+
+        try:
+            result = job['func']()
+            metrics['last_error'] = None
+            logger.info(f"NCAAB scheduler job '{name}' finished: {result}")
+        except Exception as e:
+            metrics['failures'] += 1
+            metrics['last_error'] = str(e)
+            logger.error(f"NCAAB scheduler job '{name}' failed: {e}")
+        finally:
+            metrics['runs'] += 1
+            metrics['last_duration'] = round(time.perf_counter() - started, 3)
+            interval = job['interval']()
+            self._next_run_ts[name] = time.time() + interval
+            metrics['next_run'] = dt.datetime.fromtimestamp(self._next_run_ts[name]).isoformat()
+
+    def tick(self):
+        """Run every job that is due, if this worker holds the lease"""
+        if not self._acquire_leadership():
+            if not startup_refresh_complete.is_set():
+                self._follow_leader_refresh()
+            return
+
+        now_ts = time.time()
+        for name in self.jobs:
+            if self._stop.is_set():
+                break
+            next_run = self._next_run_ts[name]
+            if next_run is None or next_run <= now_ts:
+                self.run_job(name)
+
+    def _run(self, initial_delay, refresh_on_start):
+        if not refresh_on_start:
+            # Leave the first gameline refresh to the regular cadence
+            self._next_run_ts['gamelines'] = time.time() + self._odds_interval()
+        if self._stop.wait(initial_delay):
+            return
+        startup_refresh_state['started_at'] = dt.datetime.now().isoformat()
+
+        while True:
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"NCAAB scheduler tick failed: {e}")
+            if self._stop.wait(self.tick_seconds):
+                break
+
+        self._release_leadership()
+
+    def start(self, initial_delay=STARTUP_REFRESH_DELAY, refresh_on_start=True):
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        self._stop.clear()
+        self._started_ts = time.time()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(initial_delay, refresh_on_start),
+            name='ncaab-scheduler',
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"NCAAB scheduler started as {self.owner}")
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def status(self):
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'owner': self.owner,
+            'is_leader': self.is_leader,
+            'tick_seconds': self.tick_seconds,
+            'next_tipoff': self.next_tipoff.isoformat() if self.next_tipoff else None,
+            'jobs': self.metrics
+        }
+
+refresh_scheduler = RefreshScheduler()
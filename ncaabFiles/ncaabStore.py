@@ -0,0 +1,458 @@
+import os
+import re
+import sys
+import sqlite3
+import threading
+import time
+import logging
+
+from ncaabDatabase import get_pool
+from ncaabForm import FORM_COLUMNS, SOURCE_COLUMNS, cumulative_rows, window_form
+
+logger = logging.getLogger(__name__)
+
+SEASON_DB_FILE = 'ncaab_seasons.db'
+LEGACY_DB_DIR = 'ncaabDb'
+# ncaabData wrote under the working directory, NcaabTeam read next to this file
+LEGACY_DB_DIRS = [LEGACY_DB_DIR, os.path.join(os.path.dirname(__file__), LEGACY_DB_DIR)]
+LEGACY_DB_PATTERN = re.compile(r'^(?P<team>.+)-(?P<year>\d{4})-stats\.db$')
+
+# (column, SQL type, Python type) in storage order. Names match the legacy
+# per-team Stats table so rows read back as the same dicts.
+GAME_COLUMNS = [
+    ('Date', 'TEXT', str),
+    ('Location', 'TEXT', str),
+    ('Opponent', 'TEXT', str),
+    ('Result', 'TEXT', str),
+    ('Tm', 'INTEGER', int),
+    ('Opp', 'INTEGER', int),
+    ('FGM', 'INTEGER', int),
+    ('FGA', 'INTEGER', int),
+    ('FG_Pct', 'REAL', float),
+    ('ThreePM', 'INTEGER', int),
+    ('ThreePA', 'INTEGER', int),
+    ('ThreeP_Pct', 'REAL', float),
+    ('FTM', 'INTEGER', int),
+    ('FTA', 'INTEGER', int),
+    ('FT_Pct', 'REAL', float),
+    ('ORB', 'INTEGER', int),
+    ('TRB', 'INTEGER', int),
+    ('AST', 'INTEGER', int),
+    ('STL', 'INTEGER', int),
+    ('BLK', 'INTEGER', int),
+    ('TOV', 'INTEGER', int),
+    ('PF', 'INTEGER', int),
+    ('Opp_FGM', 'INTEGER', int),
+    ('Opp_FGA', 'INTEGER', int),
+    ('Opp_FG_Pct', 'REAL', float),
+    ('Opp_ThreePM', 'INTEGER', int),
+    ('Opp_ThreePA', 'INTEGER', int),
+    ('Opp_ThreeP_Pct', 'REAL', float)
+]
+GAME_COLUMN_NAMES = [column for column, _, _ in GAME_COLUMNS]
+
+# Column order of the legacy ncaabDb/{team}-{year}-stats.db Stats table
+LEGACY_STATS_COLUMNS = [column for column in GAME_COLUMN_NAMES if column != 'Location']
+
+TEAM_GAMES_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS team_games (
+        id INTEGER PRIMARY KEY,
+        team TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        {', '.join(f'{column} {sql_type}' for column, sql_type, _ in GAME_COLUMNS)}
+    )
+'''
+TEAM_GAMES_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_team_games_team_year_date ON team_games(team, year, Date)',
+    'CREATE INDEX IF NOT EXISTS idx_team_games_year_team ON team_games(year, team)'
+]
+
+# Running totals per game so any last-N window is two primary key lookups
+TEAM_GAME_FORM_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS team_game_form (
+        team TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        game_no INTEGER NOT NULL,
+        Date TEXT,
+        {', '.join(f'{column} INTEGER NOT NULL' for column in FORM_COLUMNS)},
+        PRIMARY KEY (team, year, game_no)
+    ) WITHOUT ROWID
+'''
+
+# Per team-season fetch state for incremental, conditional refreshes
+SEASON_SOURCES_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS season_sources (
+        team TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        url TEXT,
+        etag TEXT,
+        last_modified TEXT,
+        checked_at REAL,
+        changed_at REAL,
+        PRIMARY KEY (team, year)
+    )
+'''
+
+INSERT_GAME_SQL = f'''
+    INSERT INTO team_games (team, year, {', '.join(GAME_COLUMN_NAMES)})
+    VALUES ({', '.join('?' * (len(GAME_COLUMN_NAMES) + 2))})
+'''
+DELETE_SEASON_SQL = 'DELETE FROM team_games WHERE team = ? AND year = ?'
+SELECT_SEASON_SQL = f'''
+    SELECT {', '.join(GAME_COLUMN_NAMES)} FROM team_games
+    WHERE team = ? AND year = ? ORDER BY Date, id
+'''
+SELECT_LEGACY_SEASON_SQL = f'''
+    SELECT {', '.join(LEGACY_STATS_COLUMNS)} FROM team_games
+    WHERE team = ? AND year = ? ORDER BY Date, id
+'''
+LIST_SEASONS_SQL = '''
+    SELECT team, year, COUNT(*) AS games, MAX(Date) AS last_game
+    FROM team_games GROUP BY team, year ORDER BY team, year
+'''
+SELECT_LEAGUE_SQL = '''
+    SELECT team, {columns} FROM team_games
+    WHERE year = ?{team_filter} ORDER BY team
+'''
+SELECT_RECENT_SQL = f'''
+    SELECT {', '.join(LEGACY_STATS_COLUMNS)} FROM team_games
+    WHERE team = ? AND year = ? ORDER BY Date DESC, id DESC LIMIT ?
+'''
+SELECT_FORM_SOURCE_SQL = f'''
+    SELECT {', '.join(SOURCE_COLUMNS)} FROM team_games
+    WHERE team = ? AND year = ? ORDER BY Date, id
+'''
+DELETE_FORM_SQL = 'DELETE FROM team_game_form WHERE team = ? AND year = ?'
+INSERT_FORM_SQL = f'''
+    INSERT INTO team_game_form (team, year, game_no, Date, {', '.join(FORM_COLUMNS)})
+    VALUES ({', '.join('?' * (len(FORM_COLUMNS) + 4))})
+'''
+# Latest running totals and the ones N games earlier
+SELECT_FORM_WINDOW_SQL = f'''
+    WITH latest AS (
+        SELECT MAX(game_no) AS game_no FROM team_game_form WHERE team = ? AND year = ?
+    )
+    SELECT game_no, Date, {', '.join(FORM_COLUMNS)} FROM team_game_form
+    WHERE team = ? AND year = ?
+      AND game_no IN ((SELECT game_no FROM latest), (SELECT game_no FROM latest) - ?)
+    ORDER BY game_no
+'''
+SEASONS_WITHOUT_FORM_SQL = '''
+    SELECT DISTINCT team, year FROM team_games AS g
+    WHERE NOT EXISTS (
+        SELECT 1 FROM team_game_form AS f WHERE f.team = g.team AND f.year = g.year
+    )
+'''
+# Games are matched on (Date, Opponent) within a team-season
+SELECT_GAME_KEYS_SQL = f'''
+    SELECT id, {', '.join(GAME_COLUMN_NAMES)} FROM team_games WHERE team = ? AND year = ?
+'''
+UPDATE_GAME_SQL = f'''
+    UPDATE team_games SET {', '.join(f'{column} = ?' for column in GAME_COLUMN_NAMES)} WHERE id = ?
+'''
+SELECT_SOURCE_SQL = '''
+    SELECT s.url, s.etag, s.last_modified, s.checked_at, s.changed_at,
+           (SELECT MAX(Date) FROM team_games g WHERE g.team = s.team AND g.year = s.year) AS last_game_date
+    FROM season_sources s WHERE s.team = ? AND s.year = ?
+'''
+RECORD_SOURCE_SQL = '''
+    INSERT INTO season_sources (team, year, url, etag, last_modified, checked_at, changed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(team, year) DO UPDATE SET
+        url = excluded.url,
+        etag = excluded.etag,
+        last_modified = excluded.last_modified,
+        checked_at = excluded.checked_at,
+        changed_at = COALESCE(excluded.changed_at, season_sources.changed_at)
+'''
+HAS_SEASON_SQL = 'SELECT 1 FROM team_games WHERE team = ? AND year = ? LIMIT 1'
+LEAGUE_AGGREGATES_SQL = '''
+    SELECT team,
+           COUNT(*) AS games,
+           SUM(CASE WHEN Result LIKE 'W%' THEN 1 ELSE 0 END) AS wins,
+           SUM(CASE WHEN Result LIKE 'L%' THEN 1 ELSE 0 END) AS losses,
+           ROUND(AVG(Tm), 1) AS points_per_game,
+           ROUND(AVG(Opp), 1) AS points_against_per_game,
+           ROUND(AVG(Tm - Opp), 1) AS margin_per_game,
+           ROUND(100.0 * SUM(FGM) / NULLIF(SUM(FGA), 0), 1) AS fg_percentage,
+           ROUND(100.0 * SUM(ThreePM) / NULLIF(SUM(ThreePA), 0), 1) AS three_point_percentage,
+           ROUND(100.0 * SUM(FTM) / NULLIF(SUM(FTA), 0), 1) AS free_throw_percentage
+    FROM team_games
+    WHERE year = ?
+    GROUP BY team
+    ORDER BY team
+'''
+
+def team_slug(team):
+    """Sports Reference style team key, e.g. 'Michigan State' -> 'michigan-state'"""
+    return str(team).strip().lower().replace(' ', '-').replace('(', '').replace(')', '')
+
+def _coerce(value, kind):
+    """Typed value for storage; legacy TEXT blanks and junk become NULL"""
+    if value is None:
+        return None
+    if isinstance(value, kind) and not isinstance(value, bool):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return kind(text)
+    except ValueError:
+        if kind is int:
+            try:
+                return int(float(text))
+            except ValueError:
+                return None
+        return None
+
+class SeasonStore:
+    """Single SQLite store for every team-season game log.
+
+    Replaces the one-database-per-team-season files under ncaabDb/ with one
+    typed team_games table indexed on (team, year, Date), so league-wide
+    queries are a single statement.
+    """
+
+    _initialized = set()
+    _init_lock = threading.Lock()
+
+    def __init__(self, db_file=SEASON_DB_FILE):
+        self.db_file = db_file
+        self.pool = get_pool(db_file)
+        self.init_database()
+
+    def init_database(self):
+        key = os.path.abspath(self.db_file)
+        with self._init_lock:
+            if key in self._initialized:
+                return
+
+            conn = self.pool.get_connection()
+            with conn:
+                conn.execute(TEAM_GAMES_SCHEMA)
+                for statement in TEAM_GAMES_INDEXES:
+                    conn.execute(statement)
+                conn.execute(TEAM_GAME_FORM_SCHEMA)
+                conn.execute(SEASON_SOURCES_SCHEMA)
+                # Seasons stored before running totals existed
+                for team, year in conn.execute(SEASONS_WITHOUT_FORM_SQL).fetchall():
+                    self._rebuild_form(conn, team, year)
+
+            self._initialized.add(key)
+        logger.info("NCAAB season store initialized")
+
+    @staticmethod
+    def _game_params(team, year, game):
+        return (team, year) + tuple(
+            _coerce(game.get(column), kind) for column, _, kind in GAME_COLUMNS
+        )
+
+    def replace_season(self, team, year, games):
+        """Atomically replace a team-season's games; returns rows written"""
+        team, year = team_slug(team), int(year)
+        rows = [self._game_params(team, year, game) for game in games if game.get('Date')]
+
+        conn = self.pool.get_connection()
+        with conn:
+            conn.execute(DELETE_SEASON_SQL, (team, year))
+            conn.executemany(INSERT_GAME_SQL, rows)
+            self._rebuild_form(conn, team, year)
+
+        logger.info(f"Stored {len(rows)} games for {team} {year}")
+        return len(rows)
+
+    def upsert_games(self, team, year, games):
+        """
+        Merge fetched games into a team-season keyed on (Date, Opponent):
+        new games are inserted, changed ones updated, identical ones left
+        alone. Returns {'inserted', 'updated', 'unchanged'} counts.
+        """
+        team, year = team_slug(team), int(year)
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+        conn = self.pool.get_connection()
+        with conn:
+            existing = {
+                (row[1], row[3]): (row[0], row[1:])
+                for row in conn.execute(SELECT_GAME_KEYS_SQL, (team, year)).fetchall()
+            }
+
+            inserts = []
+            updates = []
+            for game in games:
+                if not game.get('Date'):
+                    continue
+                params = self._game_params(team, year, game)
+                values = params[2:]
+                key = (values[0], values[2])
+                current = existing.get(key)
+                if current is None:
+                    inserts.append(params)
+                    existing[key] = (None, values)
+                elif current[1] != values:
+                    updates.append(values + (current[0],))
+                else:
+                    counts['unchanged'] += 1
+
+            counts['inserted'] = len(inserts)
+            counts['updated'] = len(updates)
+            if inserts or updates:
+                conn.executemany(INSERT_GAME_SQL, inserts)
+                conn.executemany(UPDATE_GAME_SQL, updates)
+                self._rebuild_form(conn, team, year)
+
+        logger.info(f"Merged games for {team} {year}: {counts}")
+        return counts
+
+    def season_source(self, team, year):
+        """Last fetch validators and newest stored game date, or None if never fetched"""
+        conn = self.pool.get_connection()
+        row = conn.execute(SELECT_SOURCE_SQL, (team_slug(team), int(year))).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('url', 'etag', 'last_modified', 'checked_at', 'changed_at', 'last_game_date'), row))
+
+    def record_source(self, team, year, url, etag=None, last_modified=None, changed=False):
+        """Remember a fetch's ETag/Last-Modified for the next conditional request"""
+        now_ts = time.time()
+        conn = self.pool.get_connection()
+        with conn:
+            conn.execute(RECORD_SOURCE_SQL, (
+                team_slug(team), int(year), url, etag, last_modified, now_ts, now_ts if changed else None
+            ))
+
+    @staticmethod
+    def _rebuild_form(conn, team, year):
+        """Recompute a team-season's running totals in one pass; caller owns the transaction"""
+        games = conn.execute(SELECT_FORM_SOURCE_SQL, (team, year)).fetchall()
+        conn.execute(DELETE_FORM_SQL, (team, year))
+        conn.executemany(INSERT_FORM_SQL, [(team, year) + row for row in cumulative_rows(games)])
+
+    def recent_form(self, team, year, num_games):
+        """Averages and record over the last ``num_games``; None if the season is shorter"""
+        team, year, num_games = team_slug(team), int(year), int(num_games)
+        if num_games < 1:
+            return None
+        conn = self.pool.get_connection()
+        rows = conn.execute(SELECT_FORM_WINDOW_SQL, (team, year, team, year, num_games)).fetchall()
+        if not rows or rows[-1][0] < num_games:
+            return None
+
+        names = ['game_no', 'Date'] + FORM_COLUMNS
+        last = dict(zip(names, rows[-1]))
+        before = dict(zip(names, rows[0])) if len(rows) == 2 else None
+        form = window_form(last, before, num_games)
+        form['season_games'] = last['game_no']
+        return form
+
+    def recent_rows(self, team, year, num_games):
+        """Last ``num_games`` games as legacy-order tuples, oldest first"""
+        conn = self.pool.get_connection()
+        rows = conn.execute(SELECT_RECENT_SQL, (team_slug(team), int(year), int(num_games))).fetchall()
+        return rows[::-1]
+
+    def load_season(self, team, year):
+        """Games for a team-season as dicts, in date order"""
+        conn = self.pool.get_connection()
+        cursor = conn.execute(SELECT_SEASON_SQL, (team_slug(team), int(year)))
+        return [dict(zip(GAME_COLUMN_NAMES, row)) for row in cursor.fetchall()]
+
+    def season_rows(self, team, year):
+        """Games as tuples in the legacy Stats column order"""
+        conn = self.pool.get_connection()
+        return conn.execute(SELECT_LEGACY_SEASON_SQL, (team_slug(team), int(year))).fetchall()
+
+    def load_league_columns(self, year, teams=None, columns=None):
+        """Every stored game of a season in one query, as {column: values}.
+
+        Includes a 'team' column; ``teams`` limits the query to those teams.
+        """
+        columns = [column for column in (columns or GAME_COLUMN_NAMES) if column in GAME_COLUMN_NAMES]
+        params = [int(year)]
+        team_filter = ''
+        if teams is not None:
+            slugs = sorted({team_slug(team) for team in teams})
+            team_filter = f" AND team IN ({', '.join('?' * len(slugs))})" if slugs else ' AND 0'
+            params.extend(slugs)
+
+        sql = SELECT_LEAGUE_SQL.format(columns=', '.join(columns), team_filter=team_filter)
+        rows = self.pool.get_connection().execute(sql, params).fetchall()
+        names = ['team'] + columns
+        if not rows:
+            return {name: [] for name in names}
+        return {name: list(values) for name, values in zip(names, zip(*rows))}
+
+    def has_season(self, team, year):
+        conn = self.pool.get_connection()
+        return conn.execute(HAS_SEASON_SQL, (team_slug(team), int(year))).fetchone() is not None
+
+    def list_seasons(self):
+        conn = self.pool.get_connection()
+        cursor = conn.execute(LIST_SEASONS_SQL)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def league_aggregates(self, year):
+        """Record, scoring and shooting aggregates for every stored team in a season"""
+        conn = self.pool.get_connection()
+        cursor = conn.execute(LEAGUE_AGGREGATES_SQL, (int(year),))
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_season_store():
+    """Process-wide SeasonStore"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SeasonStore()
+    return _store
+
+def migrate_legacy_dbs(directories=None, store=None):
+    """Copy every ncaabDb/{team}-{year}-stats.db file into the season store.
+
+    Duplicate rows left behind by repeated scrapes are collapsed. Legacy
+    files are left in place; returns a summary of what was migrated.
+    """
+    store = store or get_season_store()
+    directories = directories or LEGACY_DB_DIRS
+    summary = {'migrated': [], 'skipped': [], 'games': 0}
+
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+
+        for filename in sorted(os.listdir(directory)):
+            match = LEGACY_DB_PATTERN.match(filename)
+            if not match:
+                continue
+
+            path = os.path.join(directory, filename)
+            try:
+                conn = sqlite3.connect(path)
+                try:
+                    rows = conn.execute('SELECT * FROM Stats').fetchall()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.error(f"Error reading legacy NCAAB db {path}: {e}")
+                summary['skipped'].append(filename)
+                continue
+
+            unique_rows = list(dict.fromkeys(rows))
+            games = [dict(zip(LEGACY_STATS_COLUMNS, row)) for row in unique_rows]
+            written = store.replace_season(match.group('team'), match.group('year'), games)
+            summary['migrated'].append(filename)
+            summary['games'] += written
+
+    logger.info(f"Migrated {len(summary['migrated'])} legacy NCAAB season files ({summary['games']} games)")
+    return summary
+
+if __name__ == "__main__":
+    # python ncaabStore.py [legacy_dir ...]
+    logging.basicConfig(level=logging.INFO)
+    print(migrate_legacy_dbs(sys.argv[1:] or None))
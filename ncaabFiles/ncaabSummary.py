@@ -0,0 +1,217 @@
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Accumulated fields for ncaabGetData-style games (Sports Reference headers)
+BASKETBALL_TOTALS = {
+    'points': 'Tm',
+    'points_against': 'Opp',
+    'fg_made': 'FG',
+    'fg_attempted': 'FGA',
+    'three_made': '3P',
+    'three_attempted': '3PA',
+    'ft_made': 'FT',
+    'ft_attempted': 'FTA',
+    'rebounds': 'TRB',
+    'assists': 'AST',
+    'turnovers': 'TOV'
+}
+
+# Accumulated fields for season store games (Stats table columns), in the
+# order the original loop read them
+SEASON_TOTALS = {
+    'points': 'Tm',
+    'points_against': 'Opp',
+    'fgm': 'FGM',
+    'fga': 'FGA',
+    'threepm': 'ThreePM',
+    'ftm': 'FTM'
+}
+
+_INT_ONLY = {int, type(None)}
+
+# Marks a key absent from a game dict (the season loop's game['Tm'] raised)
+MISSING = object()
+
+def to_columns(games, names, default=None) -> Dict[str, list]:
+    """Pull the needed fields out of a list of game dicts in one pass per field.
+
+    Already-columnar input ({name: values}) is passed through unchanged.
+    """
+    if isinstance(games, dict):
+        length = len(next(iter(games.values()), []))
+        return {name: games.get(name, [default] * length) for name in names}
+    return {name: [game.get(name, default) for game in games] for name in names}
+
+def _int_fast_path(values):
+    """Plain ints/None (what the season store returns) need no text parsing"""
+    if set(map(type, values)) <= _INT_ONLY:
+        # None -> NaN -> 0 without a per-value Python call
+        array = np.nan_to_num(np.array(values, dtype=float)).astype(np.int64)
+        # str(negative).isdigit() is False in both original parsers
+        return np.where(array < 0, 0, array)
+    return None
+
+def safe_int_array(values):
+    """Vectorized ncaabGetData._safe_int: digits (dots allowed) -> int, else 0"""
+    fast = _int_fast_path(values)
+    if fast is not None:
+        return fast
+
+    text = pd.Series(values, dtype=object).astype(str).str.strip()
+    valid = text.str.replace('.', '', regex=False).str.isdigit()
+    numbers = pd.to_numeric(text.where(valid), errors='coerce').fillna(0)
+    return np.trunc(numbers.to_numpy(dtype=float)).astype(np.int64)
+
+def digit_int_array(values):
+    """Vectorized `int(x) if x and str(x).isdigit() else 0`.
+
+    Returns (values, failed) where ``failed`` marks entries that pass
+    isdigit() but still make int() raise (e.g. superscript digits) or
+    are MISSING.
+    """
+    fast = _int_fast_path(values)
+    if fast is not None:
+        return fast, np.zeros(len(values), dtype=bool)
+
+    absent = np.fromiter((value is MISSING for value in values), dtype=bool, count=len(values))
+    text = pd.Series(values, dtype=object).where(~absent, '').astype(str)
+    valid = text.str.isdigit().to_numpy(dtype=bool)
+    numbers = pd.to_numeric(text.where(valid), errors='coerce')
+    failed = absent | (valid & numbers.isna().to_numpy())
+    return numbers.fillna(0).to_numpy(dtype=float).astype(np.int64), failed
+
+def _group_sums(arrays, group_keys):
+    """Sum each array overall (group_keys=None) or per group key"""
+    if group_keys is None:
+        return {None: {name: int(array.sum()) for name, array in arrays.items()}}
+
+    inverse, keys = pd.factorize(pd.Series(group_keys, dtype=object).astype(str), sort=True)
+    sums = {
+        name: np.bincount(inverse, weights=array, minlength=len(keys)).astype(np.int64)
+        for name, array in arrays.items()
+    }
+    return {
+        key: {name: int(sums[name][i]) for name in arrays}
+        for i, key in enumerate(keys)
+    }
+
+def _basketball_totals(columns, group_keys=None):
+    results = columns['W/L']
+    arrays = {name: safe_int_array(columns[column]) for name, column in BASKETBALL_TOTALS.items()}
+    arrays['wins'] = np.fromiter((r == 'W' for r in results), dtype=bool, count=len(results)).astype(np.int64)
+    arrays['losses'] = np.fromiter((r == 'L' for r in results), dtype=bool, count=len(results)).astype(np.int64)
+    arrays['total_games'] = np.ones(len(results), dtype=np.int64)
+    return _group_sums(arrays, group_keys)
+
+def _season_totals(columns, group_keys=None):
+    results = ['' if r is MISSING else str(r) for r in columns['Result']]
+    wins = np.fromiter(('W' in r for r in results), dtype=bool, count=len(results))
+    losses = ~wins & np.fromiter(('L' in r for r in results), dtype=bool, count=len(results))
+
+    arrays = {}
+    # The original loop abandoned the rest of a game once int() raised
+    live = np.ones(len(results), dtype=bool)
+    for name, column in SEASON_TOTALS.items():
+        values, failed = digit_int_array(columns[column])
+        live &= ~failed
+        arrays[name] = np.where(live, values, 0)
+
+    arrays['wins'] = wins.astype(np.int64)
+    arrays['losses'] = losses.astype(np.int64)
+    arrays['total_games'] = np.ones(len(results), dtype=np.int64)
+    return _group_sums(arrays, group_keys)
+
+def _basketball_summary(t):
+    """Same arithmetic as the original per-game loop, applied to totals"""
+    total_games = t['total_games']
+    fg_percentage = (t['fg_made'] / t['fg_attempted'] * 100) if t['fg_attempted'] > 0 else 0
+    three_percentage = (t['three_made'] / t['three_attempted'] * 100) if t['three_attempted'] > 0 else 0
+    ft_percentage = (t['ft_made'] / t['ft_attempted'] * 100) if t['ft_attempted'] > 0 else 0
+
+    return {
+        'record': f"{t['wins']}-{t['losses']}",
+        'wins': t['wins'],
+        'losses': t['losses'],
+        'points_per_game': round(t['points'] / total_games, 1) if total_games > 0 else 0,
+        'points_against_per_game': round(t['points_against'] / total_games, 1) if total_games > 0 else 0,
+        'field_goal_percentage': round(fg_percentage, 1),
+        'three_point_percentage': round(three_percentage, 1),
+        'free_throw_percentage': round(ft_percentage, 1),
+        'rebounds_per_game': round(t['rebounds'] / total_games, 1) if total_games > 0 else 0,
+        'assists_per_game': round(t['assists'] / total_games, 1) if total_games > 0 else 0,
+        'turnovers_per_game': round(t['turnovers'] / total_games, 1) if total_games > 0 else 0,
+        'total_games': total_games
+    }
+
+def _season_summary(t):
+    total_games = t['total_games']
+    fg_pct = (t['fgm'] / t['fga'] * 100) if t['fga'] > 0 else 0
+
+    return {
+        'record': f"{t['wins']}-{t['losses']}",
+        'wins': t['wins'],
+        'losses': t['losses'],
+        'points_per_game': round(t['points'] / total_games, 1) if total_games > 0 else 0,
+        'points_against_per_game': round(t['points_against'] / total_games, 1) if total_games > 0 else 0,
+        'fg_percentage': round(fg_pct, 1),
+        'threes_per_game': round(t['threepm'] / total_games, 1) if total_games > 0 else 0,
+        'ftm_per_game': round(t['ftm'] / total_games, 1) if total_games > 0 else 0,
+        'total_games': total_games
+    }
+
+# Fields each summary reads
+BASKETBALL_SUMMARY_COLUMNS = list(BASKETBALL_TOTALS.values()) + ['W/L']
+SEASON_SUMMARY_COLUMNS = list(SEASON_TOTALS.values()) + ['Result']
+
+def basketball_summary(games: List[Dict]) -> Dict:
+    """Season summary for ncaabGetData games (W/L, FG, 3P, ... keys)"""
+    try:
+        if not games:
+            return {}
+        return _basketball_summary(_basketball_totals(to_columns(games, BASKETBALL_SUMMARY_COLUMNS))[None])
+    except Exception as e:
+        logger.error(f"Error calculating basketball summary stats: {e}")
+        return {}
+
+def season_summary(games: List[Dict]) -> Dict:
+    """Season summary for season store games (Result, FGM, ThreePM, ... keys)"""
+    try:
+        if not games:
+            return {}
+        return _season_summary(_season_totals(to_columns(games, SEASON_SUMMARY_COLUMNS, MISSING))[None])
+    except Exception as e:
+        logger.error(f"Error calculating summary stats: {e}")
+        return {}
+
+def league_season_summaries(games, group_by='team') -> Dict[str, Dict]:
+    """Season summaries for every team in ``games`` (dicts or columns) in one pass"""
+    try:
+        columns = to_columns(games, SEASON_SUMMARY_COLUMNS + [group_by], MISSING)
+        if not columns[group_by]:
+            return {}
+        return {
+            key: _season_summary(totals)
+            for key, totals in _season_totals(columns, columns[group_by]).items()
+        }
+    except Exception as e:
+        logger.error(f"Error calculating league summary stats: {e}")
+        return {}
+
+def league_basketball_summaries(games, group_by='team') -> Dict[str, Dict]:
+    """Basketball summaries for every team in ``games`` (dicts or columns) in one pass"""
+    try:
+        columns = to_columns(games, BASKETBALL_SUMMARY_COLUMNS + [group_by])
+        if not columns[group_by]:
+            return {}
+        return {
+            key: _basketball_summary(totals)
+            for key, totals in _basketball_totals(columns, columns[group_by]).items()
+        }
+    except Exception as e:
+        logger.error(f"Error calculating league basketball summary stats: {e}")
+        return {}
@@ -1,8 +1,9 @@
 import datetime as dt
-import sqlite3
 import pandas as pd
 import os
 
+from ncaabStore import get_season_store, LEGACY_STATS_COLUMNS
+
 dirname = os.path.dirname(__file__)
 
 now = dt.datetime.now()
@@ -34,28 +35,18 @@ class NcaabTeam:
         """Get all stats for a team"""
         self.w = 0
         self.l = 0
-        filename = os.path.join(dirname, f'ncaabDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            print(f"Database file not found: {filename}")
-            return None
-            
-        conn = sqlite3.connect(filename)
-        cur = conn.cursor()
         
         try:
-            cur.execute('SELECT * FROM Stats')
-            rows = cur.fetchall()
-            conn.close()
+            rows = get_season_store().season_rows(team, year)
             
             if not rows:
+                print(f"No stored games for {team} {year}")
                 return None
                 
             return rows
             
         except Exception as e:
             print(f"Error reading stats: {e}")
-            conn.close()
             return None
 
     def last2(self, team, year):
@@ -70,65 +61,42 @@ class NcaabTeam:
         """Get last 8 games stats"""
         return self._get_recent_games(team, year, 8)
 
+    def last_n(self, team, year, num_games):
+        """Get last N games stats"""
+        return self._get_recent_games(team, year, num_games)
+
     def _get_recent_games(self, team, year, num_games):
         """Helper method to get recent games"""
         self.w = 0
         self.l = 0
-        
-        filename = os.path.join(dirname, f'ncaabDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            print(f"Database file not found: {filename}")
-            return False
-            
-        conn = sqlite3.connect(filename)
+        self.form = {}
         
         try:
-            # Read data into pandas DataFrame
-            query = "SELECT * FROM Stats"
-            team_stats = pd.read_sql_query(query, conn)
-            conn.close()
+            store = get_season_store()
+            # Window totals come from the stored running sums, not a season reload
+            form = store.recent_form(team, year, num_games)
             
-            if len(team_stats) < num_games:
-                print(f"Not enough games found. Have {len(team_stats)}, need {num_games}")
+            if form is None:
+                print(f"Not enough games found for {team} {year}, need {num_games}")
                 return False
             
-            # Define column names based on database structure
-            columns = [
-                'Date', 'Opponent', 'Result', 'Tm', 'Opp', 'FGM', 'FGA', 'FG_Pct',
-                'ThreePM', 'ThreePA', 'ThreeP_Pct', 'FTM', 'FTA', 'FT_Pct', 'ORB',
-                'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'Opp_FGM', 'Opp_FGA',
-                'Opp_FG_Pct', 'Opp_ThreePM', 'Opp_ThreePA', 'Opp_ThreeP_Pct'
-            ]
-            
-            team_stats.columns = columns
-            
-            # Get recent games
-            recent_games = team_stats.tail(num_games)
+            recent_games = store.recent_rows(team, year, num_games)
             
             # Set attributes for recent games
-            for col in columns:
-                setattr(self, col.lower(), recent_games[col].tolist())
+            for col, values in zip(LEGACY_STATS_COLUMNS, zip(*recent_games)):
+                setattr(self, col.lower(), list(values))
             
+            self.form = form
             return True
             
         except Exception as e:
             print(f"Error getting recent games: {e}")
-            conn.close()
             return False
 
     def calculate_win_loss(self, team, year):
-        """Calculate win-loss record from database"""
-        filename = os.path.join(dirname, f'ncaabDb/{team}-{year}-stats.db')
-        
-        if not os.path.exists(filename):
-            return 0, 0
-            
-        conn = sqlite3.connect(filename)
-        
+        """Calculate win-loss record from the season store"""
         try:
-            team_stats = pd.read_sql_query("SELECT * FROM Stats", conn)
-            conn.close()
+            team_stats = pd.DataFrame(get_season_store().season_rows(team, year), columns=LEGACY_STATS_COLUMNS)
             
             wins = 0
             losses = 0
@@ -0,0 +1,87 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, 'ncaabFiles'))
+
+# Never scrape at import or start a background refresher under test
+os.environ.setdefault('NCAAB_STARTUP_REFRESH', '0')
+os.environ.setdefault('NCAAB_SCHEDULER', '0')
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test in its own directory so SQLite files never land in the repo"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+class StubServer:
+    """
+    Local keep-alive HTTP server for exercising the shared clients.
+
+    ``responses`` maps a path to a list of status codes served in order
+    (the last one repeats); every other path answers 200 with ``body``.
+    The server counts requests, accepted connections and peak concurrency.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.body = b'{"ok": true}'
+        self.responses = {}
+        self.requests = []
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    statuses = server.responses.get(self.path)
+                    status = statuses.pop(0) if statuses and len(statuses) > 1 else (statuses or [200])[0]
+                try:
+                    if server.delay:
+                        threading.Event().wait(server.delay)
+                    body = server.body
+                    self.send_response(status)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    yield server
+    server.close()
@@ -0,0 +1,28 @@
+from ncaabConsensus import american_odds, game_consensus, implied_probability
+
+def _lines(column, *values):
+    return {f'book{i}': {column: value} for i, value in enumerate(values)}
+
+def test_american_odds_round_trips_implied_probability():
+    for price in (-250, -110, -100, 100, 105, 240):
+        expected = 100 if price == -100 else price
+        assert american_odds(implied_probability(price)) == expected
+
+def test_moneyline_median_crosses_even_money():
+    # A plain median of -105 and +105 would be 0.0, which isn't a price
+    assert game_consensus(_lines('home_ml', -105, 105))['consensus']['home_ml'] == 100
+    assert game_consensus(_lines('away_ml', -110, 120))['consensus']['away_ml'] == 104
+    assert game_consensus(_lines('home_ml', -130, -105, 110))['consensus']['home_ml'] == -105
+
+def test_moneyline_median_ignores_invalid_prices():
+    assert game_consensus(_lines('home_ml', 50, -120))['consensus']['home_ml'] == -120
+    assert game_consensus(_lines('home_ml', 0))['consensus']['home_ml'] is None
+
+def test_spread_and_total_keep_plain_median():
+    consensus = game_consensus({
+        'a': {'home_spread': -3.5, 'away_spread': 3.5, 'over_under': 140.5},
+        'b': {'home_spread': -2.5, 'away_spread': 2.5, 'over_under': 141.5}
+    })['consensus']
+    assert consensus['home_spread'] == -3.0
+    assert consensus['away_spread'] == 3.0
+    assert consensus['over_under'] == 141.0
@@ -0,0 +1,33 @@
+import sqlite3
+import threading
+
+import pytest
+
+from ncaabDatabase import ConnectionPool
+
+def _in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def test_each_thread_gets_one_connection():
+    pool = ConnectionPool('pool.db')
+    conn = pool.get_connection()
+
+    assert pool.get_connection() is conn
+    assert _in_thread(pool.get_connection) is not conn
+
+def test_dead_threads_connections_are_closed():
+    pool = ConnectionPool('pool.db')
+    main = pool.get_connection()
+    dead = [_in_thread(pool.get_connection) for _ in range(3)]
+
+    # The next thread to open a connection closes the ones left behind
+    _in_thread(pool.get_connection)
+    for conn in dead:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+    assert main.execute('SELECT 1').fetchone() == (1,)
+    assert len(pool._connections) == 2
@@ -0,0 +1,30 @@
+import ncaabEvents
+
+def _schedule_page(games):
+    rows = ''.join(
+        f'<tr><td><a class="team-name">Away {i}</a></td><td><a class="team-name">Home {i}</a></td></tr>'
+        for i in range(games)
+    )
+    return f'<html><body><div class="ScheduleTables"><table>{rows}</table></div></body></html>'.encode()
+
+def test_large_windows_reuse_one_non_fork_parse_pool(stub_server, monkeypatch):
+    stub_server.body = _schedule_page(3)
+    monkeypatch.setattr(ncaabEvents, 'SCHEDULE_URL', stub_server.url + '/{date}')
+    monkeypatch.setattr(ncaabEvents, 'SCHEDULE_PARSE_PROCESSES', 2)
+    events = ncaabEvents.NCAABEvents()
+    days = ncaabEvents.SCHEDULE_PROCESS_PARSE_MIN_DAYS
+
+    try:
+        games = events.get_schedule(days)
+        pool = ncaabEvents._parse_pool
+        assert pool is not None
+        assert pool._mp_context.get_start_method() != 'fork'
+
+        assert events.get_schedule(days) == games
+        assert ncaabEvents._parse_pool is pool
+    finally:
+        ncaabEvents.shutdown_parse_pool()
+
+    assert len(games) == days * 3
+    assert [game['game_day'] for game in games] == sorted(game['game_day'] for game in games)
+    assert ncaabEvents._parse_pool is None
@@ -0,0 +1,110 @@
+import datetime as dt
+import json
+import time
+
+import pytest
+
+from ncaabGamelines import ALL_MARKETS_CHANGED, GamelineManager, fetch_all_sources, source_stats
+
+GAME = {
+    'home_team': 'Duke', 'away_team': 'Kansas', 'game_day': '2030-01-10', 'start_time': '7:00 PM',
+    'home_ml': -150, 'away_ml': 130, 'home_spread': -3.5, 'away_spread': 3.5,
+    'home_spread_odds': -110, 'away_spread_odds': -110, 'over_under': 145.5, 'over_odds': -110, 'under_odds': -110
+}
+
+@pytest.fixture
+def manager():
+    return GamelineManager('gamelines.db')
+
+def _consensus(manager):
+    return [json.loads(payload) for payload in manager.read_consensus_json()]
+
+def test_start_time_move_refreshes_consensus_without_a_snapshot(manager):
+    manager.upsert_many('draftkings', [GAME])
+    result = manager.upsert_many('draftkings', [dict(GAME, start_time='8:00 PM')])
+
+    assert result['changed'] == 1
+    assert _consensus(manager)[0]['start_time'] == '8:00 PM'
+    conn = manager.pool.get_connection()
+    assert conn.execute('SELECT changed FROM gameline_snapshots').fetchall() == [(ALL_MARKETS_CHANGED,)]
+
+def test_partial_expiry_drops_the_expired_source_from_consensus(manager):
+    manager.upsert_many('draftkings', [dict(GAME, start_time='13:00', home_ml=-200)])
+    manager.upsert_many('fanduel', [dict(GAME, start_time='21:00', home_ml=-150)])
+    assert _consensus(manager)[0]['books'] == 2
+
+    assert manager.delete_gamelines(now=dt.datetime(2030, 1, 10, 15, 0)) == 1
+    game = _consensus(manager)[0]
+    assert game['sources'] == ['fanduel']
+    assert game['consensus']['home_ml'] == -150
+    assert game['best']['home_ml']['sources'] == ['fanduel']
+
+    assert manager.delete_gamelines(now=dt.datetime(2030, 1, 11)) == 1
+    assert _consensus(manager) == []
+
+def test_consensus_carries_the_primary_source_line(manager):
+    manager.upsert_many('espn_bets', [dict(GAME, home_ml=-140, over_under=146.5)])
+    manager.upsert_many('draftkings', [dict(GAME, home_ml=-160)])
+
+    primary = _consensus(manager)[0]['primary']
+    assert primary['source'] == 'draftkings'
+    assert (primary['home_ml'], primary['over_under'], primary['over_odds']) == (-160, 145.5, -110)
+
+def test_consensus_matches_names_the_way_game_key_does(manager):
+    manager.upsert_many('draftkings', [dict(GAME, home_team='ÉLAN', away_team='Kansas\xa0', home_ml=-200)])
+    manager.upsert_many('espn_bets', [dict(GAME, home_team=' élan', away_team='KANSAS\t', home_ml=-150)])
+    manager.upsert_many('draftkings', [dict(GAME, home_team='ÉLAN', away_team='Kansas\xa0', home_ml=-180)])
+
+    games = _consensus(manager)
+    assert len(games) == 1
+    assert games[0]['books'] == 2
+    assert games[0]['primary']['home_ml'] == -180
+
+def test_deferred_consensus_waits_for_the_drain(manager):
+    manager.upsert_many('draftkings', [GAME], defer_consensus=True)
+    # Reads never write, so the queued game has no consensus yet
+    assert _consensus(manager) == []
+
+    assert manager.refresh_pending_consensus() == 1
+    assert [game['sources'] for game in _consensus(manager)] == [['draftkings']]
+    assert manager.refresh_pending_consensus() == 0
+
+def test_refreshes_only_spend_ids_on_new_games(manager):
+    slate = [dict(GAME, home_team=f'Home {i}') for i in range(100)]
+    assert manager.upsert_many('draftkings', slate)['inserted'] == 100
+
+    conn = manager.pool.get_connection()
+    version = manager.data_version()[0]
+    for _ in range(3):
+        result = manager.upsert_many('draftkings', slate)
+        assert (result['inserted'], result['changed'], result['unchanged']) == (0, 0, 100)
+    assert manager.data_version()[0] == version
+
+    moved = [dict(game, home_ml=-160) if i < 5 else game for i, game in enumerate(slate)]
+    result = manager.upsert_many('draftkings', moved + [dict(GAME, home_team='Home 100')])
+    assert (result['inserted'], result['changed'], result['unchanged']) == (1, 5, 95)
+    assert conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'gamelines'").fetchone() == (101,)
+    assert conn.execute('SELECT MAX(id) FROM gamelines').fetchone() == (101,)
+
+def test_late_source_result_does_not_overwrite_deadline_miss():
+    def slow():
+        time.sleep(0.3)
+        return [GAME]
+
+    books = {'slowbook': {'name': 'Slow', 'type': 'test', 'enabled': True, 'function': slow, 'deadline': 0.05}}
+    source_stats.pop('slowbook', None)
+
+    assert fetch_all_sources(books) == {}
+    time.sleep(0.5)
+    stats = source_stats.pop('slowbook')
+    assert (stats['successes'], stats['failures']) == (0, 1)
+    assert stats['last_error'] == 'deadline exceeded'
+
+def test_repeated_game_in_a_batch_is_written_once(manager):
+    result = manager.upsert_many('draftkings', [GAME, dict(GAME, home_ml=-170)])
+    assert (result['written'], result['inserted'], result['unchanged'], result['duplicates']) == (2, 1, 0, 1)
+
+    result = manager.upsert_many('draftkings', [dict(GAME, home_ml=-170), dict(GAME, home_ml=-170)])
+    assert (result['changed'], result['unchanged'], result['duplicates']) == (0, 1, 1)
+    conn = manager.pool.get_connection()
+    assert conn.execute("SELECT home_ml FROM gamelines WHERE home_team = 'Duke'").fetchall() == [(-170,)]
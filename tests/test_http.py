@@ -0,0 +1,70 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import ncaabHttp
+from ncaabHttp import AsyncHttpClient, HttpClient
+
+def test_keep_alive_reuses_one_connection(stub_server):
+    client = HttpClient()
+    for _ in range(50):
+        assert client.get(stub_server.url + '/').status_code == 200
+
+    assert len(stub_server.requests) == 50
+    assert stub_server.connections == 1
+    assert client.stats()[stub_server.url] == {'requests': 50, 'connections_opened': 1}
+    client.close()
+
+def test_retries_transient_statuses(stub_server):
+    stub_server.responses['/flaky'] = [503, 502, 200]
+    client = HttpClient(backoff_factor=0.01)
+
+    assert client.get(stub_server.url + '/flaky').status_code == 200
+    assert stub_server.requests == ['/flaky'] * 3
+
+def test_gives_up_after_retries(stub_server):
+    stub_server.responses['/down'] = [503]
+    client = HttpClient(retries=2, backoff_factor=0.01)
+
+    assert client.get(stub_server.url + '/down').status_code == 503
+    assert len(stub_server.requests) == 3
+
+def test_backoff_grows_between_retries(stub_server):
+    stub_server.responses['/flaky'] = [503, 503, 503, 200]
+    client = HttpClient(retries=3, backoff_factor=0.1)
+
+    started = time.perf_counter()
+    assert client.get(stub_server.url + '/flaky').status_code == 200
+    # Sleeps of 0.2s and 0.4s after the second and third failures
+    assert time.perf_counter() - started >= 0.55
+
+def test_per_host_concurrency_limit(stub_server, monkeypatch):
+    monkeypatch.setitem(ncaabHttp.HOST_CONCURRENCY, '127.0.0.1', 2)
+    stub_server.delay = 0.05
+    client = HttpClient()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda _: client.get(stub_server.url + '/').status_code, range(16)))
+
+    assert statuses == [200] * 16
+    assert stub_server.max_in_flight == 2
+
+@pytest.mark.skipif(ncaabHttp.httpx is None, reason='httpx not installed')
+def test_async_client_retries_and_reuses_connection(stub_server):
+    stub_server.responses['/flaky'] = [503, 200]
+
+    async def run():
+        client = AsyncHttpClient(backoff_factor=0.01)
+        try:
+            first = await client.get(stub_server.url + '/flaky')
+            rest = [await client.get(stub_server.url + '/') for _ in range(10)]
+        finally:
+            await client.aclose()
+        return [first] + rest
+
+    responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * 11
+    assert len(stub_server.requests) == 12
+    assert stub_server.connections == 1
@@ -0,0 +1,47 @@
+import io
+import json
+
+import pytest
+
+from ncaabGamelines import GamelineManager
+from ncaabImport import import_gamelines_stream
+
+def _game(i, **overrides):
+    return dict({'source': 'draftkings', 'home_team': f'Home {i}', 'away_team': f'Away {i}', 'game_day': '2030-01-10'},
+                **overrides)
+
+@pytest.fixture
+def manager():
+    return GamelineManager('gamelines.db')
+
+def test_ndjson_errors_report_line_numbers(manager):
+    lines = [json.dumps(_game(i)) for i in range(6)]
+    lines[1] = '{not json'
+    lines[4] = json.dumps(_game(4, home_team=None))
+    body = ('\n'.join(lines[:3]) + '\n\n' + '\n'.join(lines[3:]) + '\n').encode()
+
+    progress = import_gamelines_stream(io.BytesIO(body), manager, 'slate.ndjson', batch_size=2)
+
+    assert progress['written'] == 4
+    assert progress['rejected'] == 2
+    # Line 4 is blank, so the fifth gameline sits on line 6
+    assert [error['line'] for error in progress['errors']] == [2, 6]
+
+def test_json_errors_report_array_indexes(manager):
+    games = [_game(i) for i in range(7)]
+    games[2]['away_team'] = ''
+    games[5]['source'] = None
+    body = json.dumps({'gamelines': games}).encode()
+
+    progress = import_gamelines_stream(io.BytesIO(body), manager, 'slate.json', batch_size=3)
+
+    assert progress['written'] == 5
+    assert [error['index'] for error in progress['errors']] == [2, 5]
+
+def test_import_refreshes_consensus_when_it_ends(manager):
+    body = json.dumps({'gamelines': [_game(i, home_ml=-150) for i in range(5)]}).encode()
+
+    import_gamelines_stream(io.BytesIO(body), manager, 'slate.json', batch_size=2)
+
+    assert len(manager.read_consensus_json()) == 5
+    assert manager.refresh_pending_consensus() == 0
@@ -0,0 +1,40 @@
+import pytest
+
+import ncaabGamelines
+import ncaabScheduler
+from ncaabGamelines import GamelineManager, startup_refresh_complete, startup_refresh_state
+from ncaabScheduler import RefreshScheduler
+
+@pytest.fixture
+def schedulers(monkeypatch):
+    monkeypatch.setattr(ncaabGamelines, '_manager', GamelineManager('gamelines.db'))
+    startup_refresh_complete.clear()
+    startup_refresh_state.update(started_at=None, finished_at=None, error=None)
+    yield RefreshScheduler(), RefreshScheduler()
+    startup_refresh_complete.clear()
+
+def test_follower_ready_after_failed_leader_refresh(schedulers, monkeypatch):
+    leader, follower = schedulers
+
+    def fail():
+        raise RuntimeError('all sources down')
+
+    monkeypatch.setattr(ncaabScheduler, 'get_gamelines_with_fallback', fail)
+    leader.jobs = {'gamelines': leader.jobs['gamelines']}
+    leader.tick()
+    assert leader.is_leader
+    assert leader.metrics['gamelines']['failures'] == 1
+
+    # Simulate a follower process that has not seen the leader's outcome yet
+    startup_refresh_complete.clear()
+    follower.tick()
+    assert not follower.is_leader
+    assert startup_refresh_complete.is_set()
+    assert startup_refresh_state['error'] == 'all sources down'
+
+def test_follower_waits_for_leader_refresh(schedulers):
+    leader, follower = schedulers
+    leader._acquire_leadership()
+
+    follower.tick()
+    assert not startup_refresh_complete.is_set()